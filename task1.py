@@ -2,8 +2,14 @@
 Task 1: Data Structures. Sorting. Working with a Singly Linked List
 """
 
+import heapq
+from array import array
+from itertools import islice
+
 class ListNode:
     """A node in a singly linked list."""
+    __slots__ = ("val", "next")
+
     def __init__(self, val=0, next=None):
         self.val = val
         self.next = next
@@ -12,50 +18,358 @@ class ListNode:
         return str(self.val)
 
 class LinkedList:
-    """A simple singly linked list implementation."""
+    """A singly linked list that tracks its tail and length."""
     def __init__(self):
-        self.head = None
+        self._head = None
+        self.tail = None
+        self._length = 0
+
+    @property
+    def head(self):
+        """The first node of the list."""
+        return self._head
+
+    @head.setter
+    def head(self, node):
+        """Replaces the node chain and re-syncs the tail and length."""
+        self._relink(node)
+
+    def _relink(self, head, tail=None, length=None):
+        """
+        Points the list at a new node chain.
+
+        Args:
+            head: First node of the new chain.
+            tail: Last node of the chain, if already known.
+            length: Number of nodes in the chain, if already known.
+        """
+        if tail is None or length is None:
+            tail, length = None, 0
+            current = head
+            while current:
+                tail = current
+                length += 1
+                current = current.next
+        self._head = head
+        self.tail = tail
+        self._length = length
+
+    def __len__(self):
+        return self._length
 
     def append(self, val):
-        """Appends a new value to the end of the list."""
+        """Appends a new value to the end of the list in O(1)."""
         new_node = ListNode(val)
-        if not self.head:
-            self.head = new_node
-            return
-        
-        current = self.head
-        while current.next:
-            current = current.next
-        current.next = new_node
-
-    def display(self):
-        """Returns a string representation of the list."""
-        elements = []
-        current = self.head
-        while current:
-            elements.append(str(current.val))
-            current = current.next
-        return " -> ".join(elements) if elements else "The list is empty"
+        if self.tail is None:
+            self._head = new_node
+        else:
+            self.tail.next = new_node
+        self.tail = new_node
+        self._length += 1
+
+    def extend(self, values):
+        """Appends every value from an iterable to the end of the list."""
+        tail = self.tail
+        count = 0
+        for val in values:
+            new_node = ListNode(val)
+            if tail is None:
+                self._head = new_node
+            else:
+                tail.next = new_node
+            tail = new_node
+            count += 1
+        self.tail = tail
+        self._length += count
+
+    def __iter__(self):
+        return iter_linked_list(self.head)
+
+    @classmethod
+    def from_iterable(cls, values):
+        """Builds a list from any iterable, consuming generators lazily."""
+        linked_list = cls()
+        linked_list.extend(values)
+        return linked_list
+
+    def display(self, limit=None):
+        """
+        Returns a string representation of the list.
+
+        Args:
+            limit: Maximum number of values to show; the rest is summarized.
+        """
+        return format_values(self, len(self), limit)
+
+    def write(self, stream, sep="\n"):
+        """Streams the values to a text stream without building a string."""
+        write_values(self, stream, sep)
 
     def to_list(self):
         """Converts the linked list to a regular Python list."""
-        result = []
-        current = self.head
-        while current:
-            result.append(current.val)
-            current = current.next
-        return result
+        return list(self)
+
+class ArrayLinkedList:
+    """
+    A compact singly linked list stored in typed arrays.
+
+    Node i keeps its value in values[i] and the index of the next node in
+    next_index[i] (NIL marks the end). Released slots are chained into a
+    free list through next_index and reused by later appends.
+    """
+    NIL = -1
+
+    def __init__(self, typecode="q"):
+        self.typecode = typecode
+        self.values = array(typecode)
+        self.next_index = array("q")
+        self.head_index = self.NIL
+        self.tail_index = self.NIL
+        self.free_index = self.NIL
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def _allocate(self, val):
+        """Stores a value in a free slot (or a new one) and returns its index."""
+        index = self.free_index
+        if index != self.NIL:
+            self.free_index = self.next_index[index]
+            self.values[index] = val
+            self.next_index[index] = self.NIL
+        else:
+            index = len(self.values)
+            self.values.append(val)
+            self.next_index.append(self.NIL)
+        return index
+
+    def _load_compact(self, values):
+        """Replaces the contents with values laid out in consecutive slots."""
+        self.values = array(self.typecode, values)
+        length = len(self.values)
+        self.next_index = array("q", range(1, length + 1))
+        if length:
+            self.next_index[-1] = self.NIL
+        self.head_index = 0 if length else self.NIL
+        self.tail_index = length - 1 if length else self.NIL
+        self.free_index = self.NIL
+        self._length = length
+
+    def append(self, val):
+        """Appends a new value to the end of the list in O(1)."""
+        index = self._allocate(val)
+        if self.tail_index == self.NIL:
+            self.head_index = index
+        else:
+            self.next_index[self.tail_index] = index
+        self.tail_index = index
+        self._length += 1
+
+    def extend(self, values):
+        """Appends every value from an iterable to the end of the list."""
+        for val in values:
+            self.append(val)
+
+    def popleft(self):
+        """
+        Removes the first node, releasing its slot for reuse.
+
+        Returns:
+            The value of the removed node.
+
+        Raises:
+            IndexError: If the list is empty.
+        """
+        index = self.head_index
+        if index == self.NIL:
+            raise IndexError("pop from an empty list")
+        val = self.values[index]
+        self.head_index = self.next_index[index]
+        if self.head_index == self.NIL:
+            self.tail_index = self.NIL
+        self.next_index[index] = self.free_index
+        self.free_index = index
+        self._length -= 1
+        return val
+
+    def reverse(self):
+        """Reverses the list in place by relinking next indices."""
+        next_index = self.next_index
+        prev = self.NIL
+        current = self.head_index
+        while current != self.NIL:
+            next_temp = next_index[current]
+            next_index[current] = prev
+            prev = current
+            current = next_temp
+        self.head_index, self.tail_index = self.tail_index, self.head_index
+        return self
+
+    def _keys(self, key):
+        """Sort keys indexed by slot, so each key is computed once."""
+        return self.values if key is None else [key(val) for val in self.values]
+
+    def _merge_chains(self, left, right, keys, reverse):
+        """
+        Merges two sorted chains by relinking next indices. On equal keys,
+        nodes of left come first.
+
+        Args:
+            left: (head, tail) indices of the first chain.
+            right: (head, tail) indices of the second chain.
+
+        Returns:
+            The (head, tail) indices of the merged chain.
+        """
+        next_index = self.next_index
+        (left_head, left_tail), (right_head, right_tail) = left, right
+        if left_head == self.NIL:
+            return right
+        if right_head == self.NIL:
+            return left
+        head = tail = self.NIL
+        while left_head != self.NIL and right_head != self.NIL:
+            if _precedes(keys[right_head], keys[left_head], reverse):
+                node, right_head = right_head, next_index[right_head]
+            else:
+                node, left_head = left_head, next_index[left_head]
+            if tail == self.NIL:
+                head = node
+            else:
+                next_index[tail] = node
+            tail = node
+        # The chain that outlasts the other ends the merged one
+        if left_head != self.NIL:
+            next_index[tail] = left_head
+            return head, left_tail
+        next_index[tail] = right_head
+        return head, right_tail
+
+    def sort(self, key=None, reverse=False):
+        """
+        Sorts the list stably in place with a natural merge sort over the
+        next indices; values stay in their slots.
+
+        Ascending runs are cut from the chain and merged like a binary
+        counter: bins[i] holds a sorted chain of about 2^i runs.
+        """
+        keys = self._keys(key)
+        next_index = self.next_index
+        bins = []
+        current = self.head_index
+        while current != self.NIL:
+            run_head = current
+            following = next_index[current]
+            while following != self.NIL and not _precedes(keys[following], keys[current], reverse):
+                current = following
+                following = next_index[current]
+            next_index[current] = self.NIL
+            carry = (run_head, current)
+            current = following
+
+            # Earlier runs sit in the bins and go first on ties
+            level = 0
+            while level < len(bins) and bins[level] is not None:
+                carry = self._merge_chains(bins[level], carry, keys, reverse)
+                bins[level] = None
+                level += 1
+            if level == len(bins):
+                bins.append(carry)
+            else:
+                bins[level] = carry
+
+        merged = (self.NIL, self.NIL)
+        for chain in bins:
+            if chain is not None:
+                merged = self._merge_chains(chain, merged, keys, reverse)
+        self.head_index, self.tail_index = merged
+        return self
+
+    def merge(self, other, key=None, reverse=False):
+        """
+        Merges another sorted ArrayLinkedList into this one by relinking
+        next indices, leaving other empty. The values of other move into
+        free (or new) slots of this list. On equal keys, values of this list
+        come first.
+        """
+        right_head = right_tail = self.NIL
+        for val in other:
+            index = self._allocate(val)
+            if right_tail == self.NIL:
+                right_head = index
+            else:
+                self.next_index[right_tail] = index
+            right_tail = index
+        self.head_index, self.tail_index = self._merge_chains(
+            (self.head_index, self.tail_index), (right_head, right_tail), self._keys(key), reverse)
+        self._length += len(other)
+        other._load_compact(())
+        return self
+
+    def __iter__(self):
+        values, next_index = self.values, self.next_index
+        current = self.head_index
+        while current != self.NIL:
+            yield values[current]
+            current = next_index[current]
+
+    @classmethod
+    def from_iterable(cls, values, typecode="q"):
+        """Builds a compact list from any iterable, consuming generators lazily."""
+        compact = cls(typecode)
+        compact._load_compact(values)
+        return compact
+
+    def display(self, limit=None):
+        """
+        Returns a string representation of the list.
+
+        Args:
+            limit: Maximum number of values to show; the rest is summarized.
+        """
+        return format_values(self, len(self), limit)
+
+    def write(self, stream, sep="\n"):
+        """Streams the values to a text stream without building a string."""
+        write_values(self, stream, sep)
+
+    def to_list(self):
+        """Converts the list to a regular Python list."""
+        return list(self)
+
+    def to_linked_list(self):
+        """Converts the list to a pointer-based LinkedList."""
+        return LinkedList.from_iterable(self)
+
+    @classmethod
+    def from_linked_list(cls, linked_list, typecode="q"):
+        """
+        Builds a compact list from a LinkedList or a head node.
+
+        Raises:
+            TypeError: If a value does not fit the array typecode.
+        """
+        head = linked_list.head if isinstance(linked_list, LinkedList) else linked_list
+        return cls.from_iterable(iter_linked_list(head), typecode)
 
 def reverse_list(head):
     """
     Reverses a singly linked list in place.
     
     Args:
-        head: The head node of the linked list.
+        head: The head node of the linked list, or a LinkedList.
         
     Returns:
-        The new head of the reversed list.
+        The new head of the reversed list, or the same LinkedList
+        with its head, tail and length kept in sync.
     """
+    if isinstance(head, LinkedList):
+        linked_list = head
+        old_head = linked_list.head
+        linked_list._relink(reverse_list(old_head), old_head, len(linked_list))
+        return linked_list
+
     prev = None
     current = head
 
@@ -71,102 +385,426 @@ def reverse_list(head):
 
     return prev
 
-def sort_linked_list(head):
+# Lists at or below this size are sorted with insertion sort by default
+INSERTION_SORT_THRESHOLD = 16
+
+# Natural runs shorter than this are extended with insertion sort before merging
+MIN_RUN = 32
+
+SORT_ALGORITHMS = ("merge", "insertion")
+
+def _identity(val):
+    """Default sort key."""
+    return val
+
+def _precedes(key_a, key_b, reverse):
+    """Returns True if key_a must come strictly before key_b."""
+    return key_a > key_b if reverse else key_a < key_b
+
+def sort_linked_list(head, key=None, reverse=False, algorithm=None):
     """
-    Sorts a singly linked list using insertion sort.
+    Sorts a singly linked list. The sort is stable.
+
+    Uses a natural bottom-up merge sort, or insertion sort for lists of
+    at most INSERTION_SORT_THRESHOLD nodes unless an algorithm is given.
     
     Args:
-        head: The head node of the list.
+        head: The head node of the list, or a LinkedList.
+        key: Function extracting a comparison key from each value.
+        reverse: Sort in descending order if True.
+        algorithm: "merge", "insertion" or None to choose by size.
         
     Returns:
-        The head node of the sorted list.
+        The head node of the sorted list, or the same LinkedList
+        with its head, tail and length kept in sync.
+
+    Raises:
+        ValueError: If the algorithm name is unknown.
     """
+    if algorithm is not None and algorithm not in SORT_ALGORITHMS:
+        raise ValueError(f"Unknown sort algorithm '{algorithm}', expected one of {SORT_ALGORITHMS}.")
+
+    if isinstance(head, LinkedList):
+        linked_list = head
+        if algorithm is None:
+            algorithm = "insertion" if len(linked_list) <= INSERTION_SORT_THRESHOLD else "merge"
+        if algorithm == "merge":
+            new_head, new_tail = _merge_sort(linked_list.head, key, reverse)
+            linked_list._relink(new_head, new_tail, len(linked_list))
+        else:
+            linked_list._relink(_insertion_sort(linked_list.head, key, reverse))
+        return linked_list
+
     if not head or not head.next:
         return head
 
+    if algorithm is None:
+        algorithm = "insertion" if _count_up_to(head, INSERTION_SORT_THRESHOLD + 1) <= INSERTION_SORT_THRESHOLD else "merge"
+    if algorithm == "merge":
+        return _merge_sort(head, key, reverse)[0]
+    return _insertion_sort(head, key, reverse)
+
+def _count_up_to(head, limit):
+    """Counts the nodes of a list, stopping once limit is reached."""
+    count = 0
+    current = head
+    while current and count < limit:
+        count += 1
+        current = current.next
+    return count
+
+def _insertion_sort(head, key=None, reverse=False):
+    """Sorts a list by inserting each node into a sorted prefix. O(n^2)."""
     sorted_head = None
     current = head
 
     while current:
         next_temp = current.next
-        sorted_head = insert_into_sorted_list(sorted_head, current)
+        sorted_head = insert_into_sorted_list(sorted_head, current, key, reverse)
         current = next_temp
 
     return sorted_head
 
-def insert_into_sorted_list(head, new_node):
+def _merge_sort(head, key=None, reverse=False):
+    """
+    Sorts a list with a natural bottom-up merge sort in O(n log n).
+
+    The list is split into ascending runs (strictly descending runs are
+    reversed in place), and runs are merged with merge_sorted following
+    the TimSort stack invariants, so no recursion is needed and sorted
+    input takes a single linear pass.
+
+    Returns:
+        A (head, tail) tuple of the sorted list.
+    """
+    runs = []
+    current = head
+    while current:
+        run, current = _next_run(current, key, reverse)
+        runs.append(run)
+        _collapse_runs(runs, key, reverse, force=False)
+    _collapse_runs(runs, key, reverse, force=True)
+
+    if not runs:
+        return None, None
+    return runs[0][0], runs[0][1]
+
+def _next_run(current, key, reverse):
+    """
+    Detaches the next natural run starting at current.
+
+    Returns:
+        A ([head, tail, length] run, next node after the run) tuple.
+    """
+    key_of = key or _identity
+    run_head = run_tail = current
+    prev_key = key_of(current.val)
+    current = current.next
+    length = 1
+
+    if current and _precedes(key_of(current.val), prev_key, reverse):
+        # Strictly descending run: reverse it while walking
+        run_tail.next = None
+        while current:
+            current_key = key_of(current.val)
+            if not _precedes(current_key, prev_key, reverse):
+                break
+            next_temp = current.next
+            current.next = run_head
+            run_head = current
+            prev_key = current_key
+            current = next_temp
+            length += 1
+    else:
+        while current:
+            current_key = key_of(current.val)
+            if _precedes(current_key, prev_key, reverse):
+                break
+            run_tail = current
+            prev_key = current_key
+            current = current.next
+            length += 1
+        run_tail.next = None
+
+    # Extend short runs so random input does not produce many tiny merges
+    while current and length < MIN_RUN:
+        node = current
+        current = current.next
+        node.next = None
+        if _precedes(key_of(node.val), key_of(run_tail.val), reverse):
+            run_head = insert_into_sorted_list(run_head, node, key, reverse)
+        else:
+            run_tail.next = node
+            run_tail = node
+        length += 1
+
+    return [run_head, run_tail, length], current
+
+def _collapse_runs(runs, key, reverse, force):
+    """Merges adjacent runs on the stack until the TimSort invariants hold."""
+    while len(runs) > 1:
+        n = len(runs) - 2
+        if force:
+            if n > 0 and runs[n - 1][2] < runs[n + 1][2]:
+                n -= 1
+        elif (n > 0 and runs[n - 1][2] <= runs[n][2] + runs[n + 1][2]) or \
+                (n > 1 and runs[n - 2][2] <= runs[n - 1][2] + runs[n][2]):
+            if runs[n - 1][2] < runs[n + 1][2]:
+                n -= 1
+        elif runs[n][2] > runs[n + 1][2]:
+            break
+        runs[n:n + 2] = [_merge_runs(runs[n], runs[n + 1], key, reverse)]
+
+def _merge_runs(left, right, key, reverse):
+    """Merges two adjacent runs, keeping left before right on ties."""
+    key_of = key or _identity
+    head = merge_sorted(left[0], right[0], key, reverse)
+    # The tail of whichever run outlasts the other ends the merged run
+    if _precedes(key_of(right[1].val), key_of(left[1].val), reverse):
+        tail = left[1]
+    else:
+        tail = right[1]
+    return [head, tail, left[2] + right[2]]
+
+def insert_into_sorted_list(head, new_node, key=None, reverse=False):
     """
     Inserts a node into a sorted linked list at the correct position.
+    The node is placed after any elements with an equal key.
     
     Args:
         head: Head of the sorted list.
         new_node: Node to be inserted.
+        key: Function extracting a comparison key from each value.
+        reverse: The list is sorted in descending order if True.
         
     Returns:
         The head of the updated sorted list.
     """
     new_node.next = None
+    key_of = key or _identity
+    new_key = key_of(new_node.val)
 
-    if not head or head.val >= new_node.val:
+    if not head or _precedes(new_key, key_of(head.val), reverse):
         new_node.next = head
         return new_node
 
     current = head
-    while current.next and current.next.val < new_node.val:
+    while current.next and not _precedes(new_key, key_of(current.next.val), reverse):
         current = current.next
 
     new_node.next = current.next
     current.next = new_node
     return head
 
-def merge_sorted(list1, list2):
+def merge_sorted(list1, list2, key=None, reverse=False):
     """
     Merges two sorted singly linked lists into one sorted list.
+    The merge is stable: on equal keys, nodes of list1 come first.
+
+    When both arguments are LinkedList objects, the nodes of list2 are
+    moved into list1, list2 is left empty and list1 is returned.
     
     Args:
-        list1: Head of the first sorted list.
-        list2: Head of the second sorted list.
+        list1: Head of the first sorted list, or a LinkedList.
+        list2: Head of the second sorted list, or a LinkedList.
+        key: Function extracting a comparison key from each value.
+        reverse: Both lists are sorted in descending order if True.
         
     Returns:
-        Head of the merged sorted list.
+        Head of the merged sorted list, or the merged LinkedList.
     """
+    if isinstance(list1, LinkedList) and isinstance(list2, LinkedList):
+        key_of = key or _identity
+        head1, head2 = list1.head, list2.head
+        tail1, tail2 = list1.tail, list2.tail
+        length = len(list1) + len(list2)
+        # The merged tail is the tail of whichever list outlasts the other
+        if tail1 is None or (tail2 is not None and not _precedes(key_of(tail2.val), key_of(tail1.val), reverse)):
+            tail = tail2
+        else:
+            tail = tail1
+        list1._relink(merge_sorted(head1, head2, key, reverse), tail, length)
+        list2._relink(None, None, 0)
+        return list1
+
     dummy = ListNode(0)
     current = dummy
 
+    if key is None and not reverse:
+        while list1 and list2:
+            if list1.val <= list2.val:
+                current.next = list1
+                list1 = list1.next
+            else:
+                current.next = list2
+                list2 = list2.next
+            current = current.next
+
+        current.next = list1 or list2
+        return dummy.next
+
+    key_of = key or _identity
+    key1 = key_of(list1.val) if list1 else None
+    key2 = key_of(list2.val) if list2 else None
+
     while list1 and list2:
-        if list1.val <= list2.val:
-            current.next = list1
-            list1 = list1.next
-        else:
+        if _precedes(key2, key1, reverse):
             current.next = list2
             list2 = list2.next
+            if list2:
+                key2 = key_of(list2.val)
+        else:
+            current.next = list1
+            list1 = list1.next
+            if list1:
+                key1 = key_of(list1.val)
         current = current.next
 
     current.next = list1 or list2
     return dummy.next
 
-def create_linked_list_from_array(arr):
-    """Creates a linked list from a Python list."""
-    if not arr:
-        return None
+class _ReversedKey:
+    """Wraps a key so that a min-heap pops the largest key first."""
+    __slots__ = ("key",)
 
-    head = ListNode(arr[0])
-    current = head
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+def _iter_k_way(sources, key=None, reverse=False):
+    """
+    Yields nodes from k sorted sources in merged order using a heap.
+
+    Nodes of ListNode and LinkedList sources are yielded as they are,
+    values of any other iterable are wrapped into new ListNode objects.
+    Ties are broken by source position, so the merge is stable.
+    """
+    key_of = key or _identity
+    wrap = _ReversedKey if reverse else None
+    heap = []
+
+    for index, source in enumerate(sources):
+        if isinstance(source, LinkedList):
+            node = source.head
+            # The nodes are moved into the merged list
+            source._relink(None, None, 0)
+            cursor = None
+        elif source is None or isinstance(source, ListNode):
+            node, cursor = source, None
+        else:
+            cursor = iter(source)
+            node = _next_wrapped(cursor)
+        if node is not None:
+            node_key = key_of(node.val)
+            heap.append([wrap(node_key) if wrap else node_key, index, node, cursor])
+
+    heapq.heapify(heap)
+    while heap:
+        entry = heap[0]
+        node, cursor = entry[2], entry[3]
+        successor = node.next if cursor is None else _next_wrapped(cursor)
+        if successor is None:
+            heapq.heappop(heap)
+        else:
+            successor_key = key_of(successor.val)
+            entry[0] = wrap(successor_key) if wrap else successor_key
+            entry[2] = successor
+            heapq.heapreplace(heap, entry)
+        yield node
+
+def _next_wrapped(iterator):
+    """Wraps the next value of an iterator into a ListNode, or returns None."""
+    for val in iterator:
+        return ListNode(val)
+    return None
+
+def merge_k_sorted(heads_or_iterables, key=None, reverse=False):
+    """
+    Merges k sorted sources into one sorted singly linked list in O(n log k).
 
-    for val in arr[1:]:
+    Existing nodes are relinked without allocating new ones. Sources may
+    also be lazy iterables of values (e.g. generators or open files),
+    which are consumed one value at a time. The merge is stable: equal
+    keys keep the order in which their sources were given.
+
+    Args:
+        heads_or_iterables: Iterable of head nodes, LinkedList objects
+                            (left empty afterwards) or sorted iterables.
+        key: Function extracting a comparison key from each value.
+        reverse: All sources are sorted in descending order if True.
+
+    Returns:
+        Head of the merged sorted list.
+    """
+    dummy = ListNode(0)
+    tail = dummy
+    for node in _iter_k_way(heads_or_iterables, key, reverse):
+        tail.next = node
+        tail = node
+    tail.next = None
+    return dummy.next
+
+def create_linked_list_from_array(arr):
+    """Creates a linked list from a Python list or any other iterable."""
+    values = iter(arr)
+    dummy = ListNode(0)
+    current = dummy
+
+    for val in values:
         current.next = ListNode(val)
         current = current.next
 
-    return head
+    return dummy.next
 
-def linked_list_to_array(head):
-    """Converts a linked list to a Python list."""
-    result = []
+def iter_linked_list(head):
+    """Yields the values of a linked list one by one."""
     current = head
     while current:
-        result.append(current.val)
+        yield current.val
         current = current.next
-    return result
+
+def linked_list_to_array(head):
+    """Converts a linked list to a Python list."""
+    return list(iter_linked_list(head))
+
+def format_values(values, length, limit=None, sep=" -> "):
+    """
+    Formats at most limit values of a list for display.
+
+    Args:
+        values: Iterable of list values.
+        length: Total number of values.
+        limit: Maximum number of values to show, or None for all.
+        sep: Separator between values.
+
+    Returns:
+        The formatted string, ending with a count of the hidden values.
+    """
+    if length == 0:
+        return "The list is empty"
+    shown = [str(val) for val in islice(values, limit)]
+    text = sep.join(shown)
+    if len(shown) < length:
+        # With nothing shown there is no value to separate the marker from
+        text += f"{sep if shown else ''}... ({length - len(shown)} more)"
+    return text
+
+def write_values(values, stream, sep="\n"):
+    """Writes values to a text stream one at a time."""
+    for val in values:
+        stream.write(str(val))
+        stream.write(sep)
+
+def read_numbers(stream):
+    """Lazily yields the numbers from a text stream, one per whitespace-separated token."""
+    for line in stream:
+        for token in line.split():
+            yield float(token) if "." in token or "e" in token.lower() else int(token)
 
 # Demonstration of usage
 def main():
@@ -176,26 +814,24 @@ def main():
     print("1. Reversing a singly linked list:")
 
     reversed_list = LinkedList()
-    for val in [10, 20, 30, 40, 50]:
-        reversed_list.append(val)
+    reversed_list.extend([10, 20, 30, 40, 50])
 
     print(f"Original list: {reversed_list.display()}")
 
     # Apply reversal function
-    reversed_list.head = reverse_list(reversed_list.head)
+    reverse_list(reversed_list)
     print(f"Reversed list: {reversed_list.display()}\n")
 
-    # Demonstration — Insertion sort on a singly linked list
-    print("2. Sorting a singly linked list using insertion sort:")
+    # Demonstration — Sorting a singly linked list
+    print("2. Sorting a singly linked list:")
 
     unsorted_list = LinkedList()
-    for val in [45, 12, 78, 3, 29, 18, 56]:
-        unsorted_list.append(val)
+    unsorted_list.extend([45, 12, 78, 3, 29, 18, 56])
 
     print(f"Unsorted list: {unsorted_list.display()}")
 
-    # Apply insertion sort
-    unsorted_list.head = sort_linked_list(unsorted_list.head)
+    # Apply insertion sort (chosen automatically for short lists)
+    sort_linked_list(unsorted_list)
     print(f"Sorted list: {unsorted_list.display()}\n")
 
     # Demonstration — Merging two sorted linked lists
@@ -220,7 +856,43 @@ def main():
     print(f"Big List 2: {linked_list_to_array(big_list2)}")
 
     merged_big = merge_sorted(big_list1, big_list2)
-    print(f"Merged Big List: {linked_list_to_array(merged_big)}")
+    print(f"Merged Big List: {linked_list_to_array(merged_big)}\n")
+
+    # Merging many sorted sources at once
+    print("5. Merging k sorted sources (lists and lazy iterators):")
+
+    shards = [
+        create_linked_list_from_array([4, 12, 19]),
+        create_linked_list_from_array([1, 7, 25]),
+        iter(range(3, 30, 8)),
+    ]
+    merged_shards = merge_k_sorted(shards)
+    print(f"Merged shards: {linked_list_to_array(merged_shards)}\n")
+
+    # Array-backed list checked against the pointer-based one
+    print("6. Array-backed linked list:")
+
+    values = [45, 12, 78, 3, 29, 18, 56]
+    pointer_list = LinkedList()
+    pointer_list.extend(values)
+    compact_list = ArrayLinkedList.from_linked_list(pointer_list)
+
+    sort_linked_list(pointer_list)
+    compact_list.sort()
+    print(f"Sorted compact list: {compact_list.to_list()}")
+    print(f"Matches LinkedList: {compact_list.to_list() == pointer_list.to_list()}")
+
+    reverse_list(pointer_list)
+    compact_list.reverse()
+    print(f"Reversed compact list: {compact_list.to_list()}")
+    print(f"Matches LinkedList: {compact_list.to_list() == pointer_list.to_list()}\n")
+
+    # Streaming a large list without materializing it
+    print("7. Streaming construction and bounded display:")
+
+    big_list = LinkedList.from_iterable(val * 7919 % 100_003 for val in range(100_000))
+    sort_linked_list(big_list)
+    print(f"Sorted {len(big_list)} values: {big_list.display(limit=8)}")
     print()
 
 # Usage
@@ -1,17 +1,40 @@
 import turtle
 import math
+import argparse
+from pathlib import Path
+
+import numpy as np
 
 """
 Task 2: Recursion. Drawing the Pythagoras Tree Fractal
 """
 
+# Level limits for the live turtle window and for headless export
+TURTLE_MIN_LEVEL = 3
+TURTLE_MAX_LEVEL = 14
+EXPORT_MAX_LEVEL = 22
+INSTANCED_SVG_MAX_LEVEL = 40
+STREAM_MAX_LEVEL = 32
+
+# Depth of the explicitly computed subtree reused by instancing
+INSTANCE_BASE_LEVEL = 6
+
+# Streaming: segments per yielded chunk and depth of vectorized subtrees
+STREAM_CHUNK_SIZE = 65536
+STREAM_SUBTREE_LEVEL = 12
+
+# Default turtle canvas and starting point of the trunk
+CANVAS_SIZE = (1000, 800)
+TREE_ORIGIN = (0.0, -300.0)
+TREE_HEADING = 90.0
+
 def setup_turtle():
     """Sets up turtle screen and turtle object."""
     screen = turtle.Screen()
     screen.bgcolor("white")
     screen.title("Pythagoras Tree - Fractal")
-    screen.setup(width=1000, height=800)
-    
+    screen.setup(width=CANVAS_SIZE[0], height=CANVAS_SIZE[1])
+
     t = turtle.Turtle()
     t.speed(0)
     # Uniform color
@@ -19,12 +42,485 @@ def setup_turtle():
     # Thin lines
     t.pensize(2)
     t.hideturtle()
-    
+
     return screen, t
 
+def initial_branch_length(level):
+    """Returns the trunk length used for a given recursion level."""
+    return max(80, 150 - level * 5)
+
+def compute_pythagoras_segments(branch_length, level, angle=45, origin=TREE_ORIGIN, heading=TREE_HEADING):
+    """
+    Computes every branch of a Pythagoras tree without drawing it.
+
+    Branches are generated level by level with NumPy: each level is a
+    batch of start points, unit directions and lengths, and its children
+    are obtained by rotating all directions by ±angle at once, so no trig
+    call or recursion happens per branch.
+
+    Args:
+        branch_length: Length of the trunk.
+        level: Recursion depth (number of branch generations).
+        angle: Branch angle in degrees (default 45°).
+        origin: (x, y) start point of the trunk.
+        heading: Direction of the trunk in degrees (90 points up).
+
+    Returns:
+        A (2**level - 1, 4) float array of segments [x0, y0, x1, y1],
+        ordered level by level, left branch before right branch.
+    """
+    if level <= 0:
+        return np.empty((0, 4))
+
+    theta = math.radians(angle)
+    cos_a, sin_a = math.cos(theta), math.sin(theta)
+
+    segments = np.empty((2 ** level - 1, 4))
+    x = np.array([float(origin[0])])
+    y = np.array([float(origin[1])])
+    dx = np.array([math.cos(math.radians(heading))])
+    dy = np.array([math.sin(math.radians(heading))])
+    length = np.array([float(branch_length)])
+
+    offset = 0
+    for depth in range(level):
+        end_x = x + length * dx
+        end_y = y + length * dy
+
+        count = x.size
+        block = segments[offset:offset + count]
+        block[:, 0], block[:, 1] = x, y
+        block[:, 2], block[:, 3] = end_x, end_y
+        offset += count
+
+        if depth == level - 1:
+            break
+
+        # Children start where the parent ends; interleave left, right
+        x = np.repeat(end_x, 2)
+        y = np.repeat(end_y, 2)
+        # Rotate by +angle (left) and -angle (right)
+        dx, dy = (
+            np.column_stack((dx * cos_a - dy * sin_a, dx * cos_a + dy * sin_a)).ravel(),
+            np.column_stack((dx * sin_a + dy * cos_a, -dx * sin_a + dy * cos_a)).ravel(),
+        )
+        length = np.column_stack((length * cos_a, length * sin_a)).ravel()
+
+    return segments
+
+def _instance_transforms(angle):
+    """
+    Returns the (rotation-scale matrix, offset) pairs that map a unit
+    tree onto the left and right subtrees of a unit trunk.
+
+    The unit trunk runs from (0, 0) to (1, 0); a subtree is the parent
+    tree one level shallower, rotated by ±angle, scaled by cos/sin of the
+    angle and moved to the end of the trunk.
+    """
+    theta = math.radians(angle)
+    cos_a, sin_a = math.cos(theta), math.sin(theta)
+    left = cos_a * np.array([[cos_a, -sin_a], [sin_a, cos_a]])
+    right = sin_a * np.array([[cos_a, sin_a], [-sin_a, cos_a]])
+    offset = np.array([1.0, 0.0])
+    return (left, offset), (right, offset)
+
+def compute_pythagoras_segments_instanced(branch_length, level, angle=45, origin=TREE_ORIGIN,
+                                          heading=TREE_HEADING, base_level=INSTANCE_BASE_LEVEL):
+    """
+    Computes the same branches as compute_pythagoras_segments by reusing
+    self-similar subtrees.
+
+    A unit tree of depth base_level is computed once; every deeper level
+    is the trunk plus two affine copies of the previous level, so the
+    work is one vectorized transform per level instead of per-branch
+    trig, and the whole tree is moved into place with a single final
+    transform.
+
+    Args:
+        branch_length: Length of the trunk.
+        level: Recursion depth.
+        angle: Branch angle in degrees (default 45°).
+        origin: (x, y) start point of the trunk.
+        heading: Direction of the trunk in degrees.
+        base_level: Depth of the explicitly computed subtree.
+
+    Returns:
+        A (2**level - 1, 4) float array of segments [x0, y0, x1, y1],
+        ordered trunk first, then the left and the right subtree.
+    """
+    if level <= 0:
+        return np.empty((0, 4))
+
+    tree = compute_pythagoras_segments(1.0, min(base_level, level), angle, origin=(0.0, 0.0), heading=0.0)
+    trunk = np.array([[0.0, 0.0, 1.0, 0.0]])
+    (left, offset), (right, _) = _instance_transforms(angle)
+
+    for _ in range(base_level, level):
+        points = tree.reshape(-1, 2)
+        left_copy = (points @ left.T + offset).reshape(-1, 4)
+        right_copy = (points @ right.T + offset).reshape(-1, 4)
+        tree = np.concatenate((trunk, left_copy, right_copy))
+
+    phi = math.radians(heading)
+    placement = branch_length * np.array([[math.cos(phi), -math.sin(phi)], [math.sin(phi), math.cos(phi)]])
+    points = tree.reshape(-1, 2) @ placement.T + np.asarray(origin, dtype=float)
+    return points.reshape(-1, 4)
+
+def export_instanced_svg(path, level, angle=45, branch_length=None, origin=TREE_ORIGIN,
+                         heading=TREE_HEADING, color="brown", line_width=2, margin=10):
+    """
+    Writes a Pythagoras tree as an SVG file built from <use> instances.
+
+    Each level is defined once as the trunk plus two transformed
+    references to the previous level, so the file size grows linearly
+    with the level instead of with the number of branches.
+
+    Args:
+        path: Output file path.
+        level: Recursion depth.
+        angle: Branch angle in degrees (default 45°).
+        branch_length: Length of the trunk (defaults by level).
+        origin: (x, y) start point of the trunk.
+        heading: Direction of the trunk in degrees.
+        color: Stroke color.
+        line_width: Stroke width, kept constant under scaling.
+        margin: Blank border around the drawing.
+    """
+    if branch_length is None:
+        branch_length = initial_branch_length(level)
+    theta = math.radians(angle)
+    cos_a, sin_a = math.cos(theta), math.sin(theta)
+
+    # Deep levels only add tiny twigs, so a shallower tree gives the bounds
+    preview = compute_pythagoras_segments_instanced(branch_length, min(level, 14), angle, origin, heading)
+    xmin, ymin, xmax, ymax = segments_bounds(preview, margin)
+
+    with open(path, "w", encoding="utf-8") as svg:
+        svg.write(
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'viewBox="{xmin:.2f} {-ymax:.2f} {xmax - xmin:.2f} {ymax - ymin:.2f}">\n<defs>\n'
+            '<path id="t1" d="M0 0L1 0" vector-effect="non-scaling-stroke"/>\n'
+        )
+        for depth in range(2, level + 1):
+            svg.write(
+                f'<g id="t{depth}"><use href="#t1"/>'
+                f'<use href="#t{depth - 1}" transform="translate(1 0) rotate({angle}) scale({cos_a!r})"/>'
+                f'<use href="#t{depth - 1}" transform="translate(1 0) rotate({-angle}) scale({sin_a!r})"/></g>\n'
+            )
+        # Flip y so that the definitions use the usual math orientation
+        svg.write(
+            f'</defs>\n<g fill="none" stroke="{color}" stroke-width="{line_width}" stroke-linecap="round">'
+            f'<use href="#t{level}" transform="translate({origin[0]} {-origin[1]}) scale(1 -1) '
+            f'rotate({heading}) scale({branch_length})"/></g>\n</svg>\n'
+        )
+
+def segments_bounds(segments, margin=0.0):
+    """Returns (xmin, ymin, xmax, ymax) of a segment array with a margin."""
+    if len(segments) == 0:
+        return (-margin, -margin, margin, margin)
+    xs = segments[:, [0, 2]]
+    ys = segments[:, [1, 3]]
+    return (xs.min() - margin, ys.min() - margin, xs.max() + margin, ys.max() + margin)
+
+def export_svg(segments, path, color="brown", line_width=2, margin=10):
+    """
+    Writes segments to an SVG file as a single path element.
+
+    Args:
+        segments: (N, 4) array of [x0, y0, x1, y1] segments.
+        path: Output file path.
+        color: Stroke color.
+        line_width: Stroke width in user units.
+        margin: Blank border around the drawing.
+    """
+    xmin, ymin, xmax, ymax = segments_bounds(segments, margin)
+    # SVG's y axis points down
+    flipped = segments.copy()
+    flipped[:, [1, 3]] *= -1
+
+    with open(path, "w", encoding="utf-8") as svg:
+        svg.write(
+            '<svg xmlns="http://www.w3.org/2000/svg" '
+            f'viewBox="{xmin:.2f} {-ymax:.2f} {xmax - xmin:.2f} {ymax - ymin:.2f}">\n'
+            f'<path fill="none" stroke="{color}" stroke-width="{line_width}" '
+            'stroke-linecap="round" d="\n'
+        )
+        np.savetxt(svg, flipped, fmt="M%.2f %.2fL%.2f %.2f")
+        svg.write('"/>\n</svg>\n')
+
+def export_png(segments, path, size=CANVAS_SIZE, color="brown", line_width=1.0, dpi=100):
+    """
+    Renders segments to a PNG file with matplotlib's Agg backend (no GUI).
+
+    Args:
+        segments: (N, 4) array of [x0, y0, x1, y1] segments.
+        path: Output file path.
+        size: Image size in pixels (width, height).
+        color: Line color.
+        line_width: Line width in points.
+        dpi: Image resolution.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.collections import LineCollection
+
+    figure = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.add_axes((0, 0, 1, 1))
+    axes.add_collection(LineCollection(segments.reshape(-1, 2, 2), colors=color, linewidths=line_width))
+    xmin, ymin, xmax, ymax = segments_bounds(segments, margin=10)
+    axes.set_xlim(xmin, xmax)
+    axes.set_ylim(ymin, ymax)
+    axes.set_aspect("equal")
+    axes.axis("off")
+    figure.savefig(path, facecolor="white")
+
+def export_pythagoras_tree(path, level, angle=45, branch_length=None, instanced=False):
+    """
+    Computes a Pythagoras tree and writes it to an SVG or PNG file.
+
+    With instanced=True, an SVG is written with export_instanced_svg and
+    a PNG is rasterized from compute_pythagoras_segments_instanced.
+
+    Returns:
+        The number of branches in the tree.
+
+    Raises:
+        ValueError: If the file extension is neither .svg nor .png.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in (".svg", ".png"):
+        raise ValueError(f"Unsupported output format '{suffix}', expected .svg or .png.")
+
+    if branch_length is None:
+        branch_length = initial_branch_length(level)
+    if instanced and suffix == ".svg":
+        export_instanced_svg(path, level, angle, branch_length)
+        return 2 ** level - 1
+
+    compute = compute_pythagoras_segments_instanced if instanced else compute_pythagoras_segments
+    segments = compute(branch_length, level, angle)
+    if suffix == ".svg":
+        export_svg(segments, path)
+    else:
+        export_png(segments, path)
+    return len(segments)
+
+def iter_pythagoras_segments(branch_length, level, angle=45, origin=TREE_ORIGIN, heading=TREE_HEADING,
+                             chunk_size=STREAM_CHUNK_SIZE, subtree_level=STREAM_SUBTREE_LEVEL):
+    """
+    Lazily yields the branches of a Pythagoras tree in fixed-size chunks.
+
+    The top of the tree is walked depth-first with an explicit stack, so
+    the depth is not bound by Python's recursion limit; subtrees of at
+    most subtree_level levels are expanded with compute_pythagoras_segments.
+    Peak memory is one chunk, one subtree and a stack of about level
+    entries, however many branches are produced.
+
+    Args:
+        branch_length: Length of the trunk.
+        level: Recursion depth.
+        angle: Branch angle in degrees (default 45°).
+        origin: (x, y) start point of the trunk.
+        heading: Direction of the trunk in degrees.
+        chunk_size: Maximum number of segments per chunk.
+        subtree_level: Depth of the subtrees expanded at once.
+
+    Yields:
+        (N, 4) float arrays of segments [x0, y0, x1, y1], N <= chunk_size.
+    """
+    chunk = np.empty((chunk_size, 4))
+    filled = 0
+    stack = [(float(origin[0]), float(origin[1]), float(heading), float(branch_length), level)]
+
+    while stack:
+        x, y, direction, length, remaining = stack.pop()
+        if remaining <= 0:
+            continue
+
+        if remaining <= subtree_level:
+            block = compute_pythagoras_segments(length, remaining, angle, origin=(x, y), heading=direction)
+        else:
+            end_x = x + length * math.cos(math.radians(direction))
+            end_y = y + length * math.sin(math.radians(direction))
+            block = np.array([[x, y, end_x, end_y]])
+            # Push the right branch first so the left one is expanded first
+            stack.append((end_x, end_y, direction - angle, length * math.sin(math.radians(angle)), remaining - 1))
+            stack.append((end_x, end_y, direction + angle, length * math.cos(math.radians(angle)), remaining - 1))
+
+        start = 0
+        while start < len(block):
+            taken = min(chunk_size - filled, len(block) - start)
+            chunk[filled:filled + taken] = block[start:start + taken]
+            filled += taken
+            start += taken
+            if filled == chunk_size:
+                yield chunk
+                chunk = np.empty((chunk_size, 4))
+                filled = 0
+
+    if filled:
+        yield chunk[:filled]
+
+class SegmentCounter:
+    """Sink that only counts segments and tracks their bounding box."""
+    def __init__(self):
+        self.count = 0
+        self.bounds = None
+
+    def write(self, segments):
+        self.count += len(segments)
+        xmin, ymin, xmax, ymax = segments_bounds(segments)
+        if self.bounds is not None:
+            xmin, ymin = min(xmin, self.bounds[0]), min(ymin, self.bounds[1])
+            xmax, ymax = max(xmax, self.bounds[2]), max(ymax, self.bounds[3])
+        self.bounds = (float(xmin), float(ymin), float(xmax), float(ymax))
+
+    def close(self):
+        pass
+
+class SegmentFileWriter:
+    """
+    Sink that appends segments to a file.
+
+    Files ending in .txt get one "x0 y0 x1 y1" line per segment; any other
+    file gets raw little-endian float32 quadruples.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.text = Path(path).suffix.lower() == ".txt"
+        self.file = open(path, "w" if self.text else "wb")
+        self.count = 0
+
+    def write(self, segments):
+        if self.text:
+            np.savetxt(self.file, segments, fmt="%.4f")
+        else:
+            self.file.write(segments.astype("<f4").tobytes())
+        self.count += len(segments)
+
+    def close(self):
+        self.file.close()
+
+class RasterSink:
+    """
+    Sink that rasterizes segments into a fixed-size pixel buffer.
+
+    Each segment is sampled about once per pixel of its length and the
+    hits are accumulated per pixel, so memory stays width * height
+    counters regardless of the number of segments.
+    """
+    def __init__(self, width=CANVAS_SIZE[0], height=CANVAS_SIZE[1], extent=None):
+        """
+        Args:
+            width, height: Image size in pixels.
+            extent: (xmin, ymin, xmax, ymax) world area mapped onto the
+                    image; defaults to the turtle canvas.
+        """
+        if extent is None:
+            extent = (-width / 2, -height / 2, width / 2, height / 2)
+        self.width = width
+        self.height = height
+        self.extent = extent
+        self.hits = np.zeros(width * height, dtype=np.uint32)
+        self.count = 0
+
+    def write(self, segments):
+        xmin, ymin, xmax, ymax = self.extent
+        scale_x = (self.width - 1) / (xmax - xmin)
+        scale_y = (self.height - 1) / (ymax - ymin)
+        # Pixel coordinates with the image row 0 at the top
+        px0 = (segments[:, 0] - xmin) * scale_x
+        px1 = (segments[:, 2] - xmin) * scale_x
+        py0 = (ymax - segments[:, 1]) * scale_y
+        py1 = (ymax - segments[:, 3]) * scale_y
+
+        samples = np.ceil(np.maximum(np.abs(px1 - px0), np.abs(py1 - py0))).astype(np.int64) + 1
+        owner = np.repeat(np.arange(len(segments)), samples)
+        first = np.cumsum(samples) - samples
+        step = np.arange(owner.size) - np.repeat(first, samples)
+        t = step / np.maximum(samples - 1, 1)[owner]
+
+        cols = np.rint(px0[owner] + (px1 - px0)[owner] * t).astype(np.int64)
+        rows = np.rint(py0[owner] + (py1 - py0)[owner] * t).astype(np.int64)
+        inside = (cols >= 0) & (cols < self.width) & (rows >= 0) & (rows < self.height)
+        self.hits += np.bincount(rows[inside] * self.width + cols[inside],
+                                 minlength=self.hits.size).astype(np.uint32)
+        self.count += len(segments)
+
+    def close(self):
+        pass
+
+    def to_image(self, color=(165, 42, 42)):
+        """Returns an RGB uint8 image with every hit pixel in the given color."""
+        image = np.full((self.height * self.width, 3), 255, dtype=np.uint8)
+        image[self.hits > 0] = color
+        return image.reshape(self.height, self.width, 3)
+
+    def save(self, path):
+        """Writes the raster to an image file without a GUI."""
+        import matplotlib.image
+        matplotlib.image.imsave(path, self.to_image())
+
+def stream_pythagoras_tree(sink, branch_length, level, angle=45, origin=TREE_ORIGIN, heading=TREE_HEADING,
+                           chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Feeds every branch of a Pythagoras tree into a sink chunk by chunk.
+
+    Args:
+        sink: Object with write(segments) and close() methods, such as
+              SegmentCounter, SegmentFileWriter or RasterSink.
+        branch_length: Length of the trunk.
+        level: Recursion depth.
+        angle: Branch angle in degrees (default 45°).
+        origin: (x, y) start point of the trunk.
+        heading: Direction of the trunk in degrees.
+        chunk_size: Maximum number of segments per chunk.
+
+    Returns:
+        The sink, after it has been closed.
+    """
+    try:
+        for chunk in iter_pythagoras_segments(branch_length, level, angle, origin, heading, chunk_size):
+            sink.write(chunk)
+    finally:
+        sink.close()
+    return sink
+
+def render_with_turtle(t, segments, batch_size=500):
+    """
+    Replays precomputed segments with a turtle.
+
+    Screen updates are switched off and flushed once per batch of
+    segments instead of after every move.
+
+    Args:
+        t: Turtle object
+        segments: (N, 4) array of [x0, y0, x1, y1] segments.
+        batch_size: Number of segments drawn between screen updates.
+    """
+    screen = t.getscreen()
+    previous_tracer = screen.tracer()
+    screen.tracer(0)
+
+    for index, (x0, y0, x1, y1) in enumerate(segments.tolist(), start=1):
+        t.penup()
+        t.goto(x0, y0)
+        t.pendown()
+        t.goto(x1, y1)
+        if index % batch_size == 0:
+            screen.update()
+
+    screen.update()
+    screen.tracer(previous_tracer)
+
 def draw_pythagoras_tree(t, branch_length, level, angle=45):
     """
-    Recursively draws a classic Pythagoras tree.
+    Draws a classic Pythagoras tree from the turtle's current position
+    and heading.
+
+    The branches are computed by compute_pythagoras_segments and then
+    replayed with render_with_turtle; the turtle is left where it started.
 
     Args:
         t: Turtle object
@@ -32,62 +528,91 @@ def draw_pythagoras_tree(t, branch_length, level, angle=45):
         level: Recursion depth
         angle: Branch angle (default 45°)
     """
-    if level == 0:
-        return
-
-    # Draw the current branch
-    t.forward(branch_length)
-    
-    # Save current state
     position = t.pos()
     heading = t.heading()
-    
-    # Left branch
-    t.left(angle)
-    left_length = branch_length * math.cos(math.radians(angle))
-    draw_pythagoras_tree(t, left_length, level - 1, angle)
-    
-    # Restore position and heading
-    t.setpos(position)
-    t.setheading(heading)
-    
-    # Right branch
-    t.right(angle)
-    right_length = branch_length * math.sin(math.radians(angle))
-    draw_pythagoras_tree(t, right_length, level - 1, angle)
 
-    # Restore again
+    segments = compute_pythagoras_segments(branch_length, level, angle, origin=position, heading=heading)
+    render_with_turtle(t, segments)
+
+    # Restore position and heading
+    t.penup()
     t.setpos(position)
     t.setheading(heading)
+    t.pendown()
 
-def main():
-    """Main program."""
-    # Ask user for recursion level (must be 3–10)
+def read_level(min_level, max_level):
+    """Asks the user for a recursion level within the given range."""
     level = 0
-    while not (3 <= level <= 10):
+    while not (min_level <= level <= max_level):
         try:
-            user_input = input("Enter recursion level (3-10): ")
+            user_input = input(f"Enter recursion level ({min_level}-{max_level}): ")
             level = int(user_input)
-            if not (3 <= level <= 10):
-                print("Level must be between 3 and 10.")
+            if not (min_level <= level <= max_level):
+                print(f"Level must be between {min_level} and {max_level}.")
         except ValueError:
-            print("Please enter a valid integer between 3 and 10.")
+            print(f"Please enter a valid integer between {min_level} and {max_level}.")
+    return level
+
+def parse_args():
+    """Parses command line options."""
+    parser = argparse.ArgumentParser(description="Draw the Pythagoras tree fractal.")
+    parser.add_argument("--level", type=int, help="recursion level")
+    parser.add_argument("--angle", type=float, default=45, help="branch angle in degrees")
+    parser.add_argument("--output", help="write an .svg or .png file instead of opening a window")
+    parser.add_argument("--instanced", action="store_true",
+                        help="reuse self-similar subtrees (SVG output uses <use> instances)")
+    parser.add_argument("--stream", action="store_true",
+                        help="stream branches in chunks: .png is rasterized, .txt/.bin get raw segments")
+    return parser.parse_args()
+
+def main():
+    """Main program."""
+    args = parse_args()
+
+    if args.stream:
+        if not args.output:
+            print("Streaming mode needs --output.")
+            return
+        level = args.level if args.level is not None else read_level(1, STREAM_MAX_LEVEL)
+        if not (1 <= level <= STREAM_MAX_LEVEL):
+            print(f"Level must be between 1 and {STREAM_MAX_LEVEL}.")
+            return
+        raster = args.output.lower().endswith(".png")
+        sink = RasterSink() if raster else SegmentFileWriter(args.output)
+        stream_pythagoras_tree(sink, initial_branch_length(level), level, args.angle)
+        if raster:
+            sink.save(args.output)
+        print(f"Streamed {sink.count} branches to {args.output}.")
+        return
+
+    if args.output:
+        instanced_svg = args.instanced and args.output.lower().endswith(".svg")
+        max_level = INSTANCED_SVG_MAX_LEVEL if instanced_svg else EXPORT_MAX_LEVEL
+        level = args.level if args.level is not None else read_level(1, max_level)
+        if not (1 <= level <= max_level):
+            print(f"Level must be between 1 and {max_level}.")
+            return
+        count = export_pythagoras_tree(args.output, level, args.angle, instanced=args.instanced)
+        print(f"Wrote {count} branches to {args.output}.")
+        return
+
+    # Ask user for recursion level unless given on the command line
+    level = args.level
+    if level is None or not (TURTLE_MIN_LEVEL <= level <= TURTLE_MAX_LEVEL):
+        level = read_level(TURTLE_MIN_LEVEL, TURTLE_MAX_LEVEL)
 
     # Setup turtle
     screen, t = setup_turtle()
-    
+
     # Initial positioning
     t.penup()
-    t.goto(0, -300)
-    t.setheading(90)
+    t.goto(*TREE_ORIGIN)
+    t.setheading(TREE_HEADING)
     t.pendown()
-    
-    # Initial branch length
-    initial_length = max(80, 150 - level * 5)
-    
+
     print(f"Drawing Pythagoras Tree at recursion level {level}...")
-    draw_pythagoras_tree(t, initial_length, level)
-    
+    draw_pythagoras_tree(t, initial_branch_length(level), level, args.angle)
+
     # Exit on click
     screen.exitonclick()
     print("Done.")
@@ -1,11 +1,527 @@
+import os
+import sys
 import heapq
-from typing import Dict, List, Tuple, Any
+import json
+import math
+import random
+import time
+import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from types import MappingProxyType
+from typing import Callable, Dict, List, Tuple, Any, Iterable, Iterator, Mapping, NamedTuple, Optional
+
+import numpy as np
 
 """
 Task 3: Trees and Dijkstra's Algorithm
 """
 
-def find_shortest_paths(graph: Dict[Any, List[Tuple[Any, float]]], source: Any) -> Dict[Any, float]:
+
+class CSRGraph:
+    """
+    Weighted directed graph in compressed sparse row (CSR) form.
+
+    Vertices are integer ids 0..n-1 with labels[id] as their external
+    names. The out-edges of vertex u are targets[offsets[u]:offsets[u + 1]]
+    with the matching weights, all stored in typed NumPy arrays.
+
+    The graph also reads like the adjacency-list dict used elsewhere in
+    this module: graph[label] returns a list of (neighbor, weight) tuples.
+
+    Without explicit labels the vertices are labelled by their ids, and the
+    labels list and ids dict are only built when first used; graphs mapped
+    from shared memory by worker processes never pay for them.
+    """
+
+    MAGIC = b"CSRGRPH1"
+    HEADER_SIZE = 32
+
+    def __init__(self, offsets: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+                 labels: Optional[List[Any]] = None):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self._labels: Optional[List[Any]] = list(labels) if labels is not None else None
+        self._ids: Optional[Dict[Any, int]] = None
+
+    @property
+    def labels(self) -> List[Any]:
+        """External vertex names indexed by vertex id."""
+        if self._labels is None:
+            self._labels = list(range(self.num_vertices))
+        return self._labels
+
+    @property
+    def ids(self) -> Dict[Any, int]:
+        """Vertex id of each label."""
+        if self._ids is None:
+            self._ids = {label: vertex_id for vertex_id, label in enumerate(self.labels)}
+        return self._ids
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[Any, Any, float]], labels: Optional[Iterable[Any]] = None,
+                   directed: bool = True) -> "CSRGraph":
+        """
+        Builds a CSR graph from (source, target, weight) triples.
+
+        Parameters:
+            edges (Iterable): Edge triples with vertex labels.
+            labels (Iterable): Optional vertex labels fixing the id order;
+                               unseen labels get the next free ids.
+            directed (bool): If False, every edge is added in both directions.
+
+        Returns:
+            CSRGraph: The graph; edges of a vertex keep their input order.
+        """
+        ids: Dict[Any, int] = {}
+        vertex_labels: List[Any] = []
+
+        def vertex_id(label):
+            if label not in ids:
+                ids[label] = len(vertex_labels)
+                vertex_labels.append(label)
+            return ids[label]
+
+        for label in labels or ():
+            vertex_id(label)
+
+        sources: List[int] = []
+        targets: List[int] = []
+        weights: List[float] = []
+        for source, target, weight in edges:
+            u, v = vertex_id(source), vertex_id(target)
+            sources.append(u)
+            targets.append(v)
+            weights.append(weight)
+            if not directed:
+                sources.append(v)
+                targets.append(u)
+                weights.append(weight)
+
+        return cls.from_arrays(len(vertex_labels), np.asarray(sources, dtype=np.int64),
+                               np.asarray(targets, dtype=np.int64), np.asarray(weights, dtype=np.float64),
+                               vertex_labels)
+
+    @classmethod
+    def from_arrays(cls, num_vertices: int, sources: np.ndarray, targets: np.ndarray, weights: np.ndarray,
+                    labels: Optional[List[Any]] = None) -> "CSRGraph":
+        """Builds a CSR graph from parallel arrays of integer edge endpoints."""
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_vertices), out=offsets[1:])
+        return cls(offsets, np.ascontiguousarray(targets[order], dtype=np.int32),
+                   np.ascontiguousarray(weights[order], dtype=np.float64), labels)
+
+    @classmethod
+    def from_adjacency(cls, graph: Dict[Any, List[Tuple[Any, float]]]) -> "CSRGraph":
+        """Converts an adjacency-list dict into a CSR graph, keeping vertex order."""
+        edges = ((vertex, neighbor, weight) for vertex, neighbors in graph.items() for neighbor, weight in neighbors)
+        return cls.from_edges(edges, labels=graph.keys())
+
+    def to_adjacency(self) -> Dict[Any, List[Tuple[Any, float]]]:
+        """Converts the graph back into an adjacency-list dict."""
+        return {label: self[label] for label in self.labels}
+
+    def reverse(self) -> "CSRGraph":
+        """Returns the transposed graph, with every edge pointing the other way."""
+        sources = np.repeat(np.arange(self.num_vertices, dtype=np.int64), np.diff(self.offsets))
+        return CSRGraph.from_arrays(self.num_vertices, np.asarray(self.targets, dtype=np.int64), sources,
+                                    np.asarray(self.weights), self.labels)
+
+    def neighbors(self, vertex_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (targets, weights) array slices of a vertex's out-edges."""
+        start, end = self.offsets[vertex_id], self.offsets[vertex_id + 1]
+        return self.targets[start:end], self.weights[start:end]
+
+    def __getitem__(self, label: Any) -> List[Tuple[Any, float]]:
+        targets, weights = self.neighbors(self.ids[label])
+        labels = self.labels
+        return [(labels[target], weight) for target, weight in zip(targets.tolist(), weights.tolist())]
+
+    def __contains__(self, label: Any) -> bool:
+        return label in self.ids
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self) -> int:
+        return self.num_vertices
+
+    def distances_to_dict(self, distances: np.ndarray) -> Dict[Any, float]:
+        """Maps a distance array indexed by vertex id to a dict keyed by label."""
+        return dict(zip(self.labels, distances.tolist()))
+
+    def save(self, path: str) -> None:
+        """
+        Writes the graph to a binary file that load() can memory-map.
+
+        Layout: a 32-byte header (magic, vertex count, edge count, label
+        block size), int64 offsets, int32 targets padded to 8 bytes,
+        float64 weights and finally the labels as JSON.
+        """
+        default_labels = self._labels is None or self._labels == list(range(self.num_vertices))
+        label_block = b"" if default_labels else json.dumps(self.labels).encode("utf-8")
+        with open(path, "wb") as file:
+            file.write(self.MAGIC)
+            file.write(np.array([self.num_vertices, self.num_edges, len(label_block)], dtype="<i8").tobytes())
+            file.write(np.asarray(self.offsets, dtype="<i8").tobytes())
+            file.write(np.asarray(self.targets, dtype="<i4").tobytes())
+            if self.num_edges % 2:
+                file.write(b"\0" * 4)
+            file.write(np.asarray(self.weights, dtype="<f8").tobytes())
+            file.write(label_block)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CSRGraph":
+        """
+        Reads a graph written by save().
+
+        Parameters:
+            path (str): File to read.
+            mmap (bool): Map the arrays from the file instead of reading them,
+                         so startup cost does not depend on the graph size.
+
+        Raises:
+            ValueError: If the file is not a saved CSR graph.
+        """
+        with open(path, "rb") as file:
+            header = file.read(cls.HEADER_SIZE)
+        if header[:8] != cls.MAGIC:
+            raise ValueError(f"'{path}' is not a CSR graph file.")
+        num_vertices, num_edges, label_size = np.frombuffer(header[8:], dtype="<i8").tolist()
+
+        offsets_at = cls.HEADER_SIZE
+        targets_at = offsets_at + 8 * (num_vertices + 1)
+        weights_at = targets_at + 4 * (num_edges + num_edges % 2)
+        labels_at = weights_at + 8 * num_edges
+
+        def array(dtype, offset, count):
+            if mmap:
+                if count == 0:
+                    return np.empty(0, dtype=dtype)
+                return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+            return np.fromfile(path, dtype=dtype, count=count, offset=offset)
+
+        labels = None
+        if label_size:
+            with open(path, "rb") as file:
+                file.seek(labels_at)
+                labels = [tuple(label) if isinstance(label, list) else label
+                          for label in json.loads(file.read(label_size).decode("utf-8"))]
+
+        return cls(array("<i8", offsets_at, num_vertices + 1), array("<i4", targets_at, num_edges),
+                   array("<f8", weights_at, num_edges), labels)
+
+
+class LazyHeapQueue:
+    """
+    Binary heap (heapq) with lazy deletion.
+
+    Lowering the priority of a queued item pushes a second entry; the old
+    one stays in the heap and is skipped by the caller when popped.
+    """
+
+    def __init__(self):
+        self.heap: List[Tuple[float, Any]] = []
+        self.pushes = 0
+        self.pops = 0
+        self.peak_size = 0
+
+    def push(self, item: Any, priority: float) -> None:
+        """Inserts an item or lowers its priority."""
+        heapq.heappush(self.heap, (priority, item))
+        self.pushes += 1
+        self.peak_size = max(self.peak_size, len(self.heap))
+
+    def pop(self) -> Tuple[float, Any]:
+        """Removes and returns the (priority, item) entry with the lowest priority."""
+        self.pops += 1
+        return heapq.heappop(self.heap)
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns push, pop and peak size counters."""
+        return {"pushes": self.pushes, "pops": self.pops, "peak_size": self.peak_size}
+
+
+class IndexedDaryHeap(LazyHeapQueue):
+    """
+    Indexed d-ary heap with a real decrease-key.
+
+    A position map finds an item already in the heap, so lowering its
+    priority moves the existing entry up instead of adding a stale one;
+    the heap never holds more than one entry per item.
+    """
+
+    def __init__(self, arity: int = 4):
+        super().__init__()
+        self.arity = arity
+        self.priorities: List[float] = []
+        self.positions: Dict[Any, int] = {}
+        self.decrease_keys = 0
+
+    def push(self, item: Any, priority: float) -> None:
+        """Inserts an item or lowers its priority (higher priorities are ignored)."""
+        position = self.positions.get(item)
+        if position is None:
+            position = len(self.heap)
+            self.heap.append(item)
+            self.priorities.append(priority)
+            self.positions[item] = position
+            self.pushes += 1
+            self.peak_size = max(self.peak_size, len(self.heap))
+        elif priority < self.priorities[position]:
+            self.priorities[position] = priority
+            self.decrease_keys += 1
+        else:
+            return
+        self._sift_up(position)
+
+    def pop(self) -> Tuple[float, Any]:
+        """Removes and returns the (priority, item) entry with the lowest priority."""
+        self.pops += 1
+        item, priority = self.heap[0], self.priorities[0]
+        del self.positions[item]
+        last_item, last_priority = self.heap.pop(), self.priorities.pop()
+        if self.heap:
+            self.heap[0], self.priorities[0] = last_item, last_priority
+            self.positions[last_item] = 0
+            self._sift_down(0)
+        return priority, item
+
+    def _move(self, item: Any, priority: float, position: int) -> None:
+        self.heap[position] = item
+        self.priorities[position] = priority
+        self.positions[item] = position
+
+    def _sift_up(self, position: int) -> None:
+        item, priority = self.heap[position], self.priorities[position]
+        while position > 0:
+            parent = (position - 1) // self.arity
+            if self.priorities[parent] <= priority:
+                break
+            self._move(self.heap[parent], self.priorities[parent], position)
+            position = parent
+        self._move(item, priority, position)
+
+    def _sift_down(self, position: int) -> None:
+        item, priority = self.heap[position], self.priorities[position]
+        size = len(self.heap)
+        while True:
+            first_child = self.arity * position + 1
+            if first_child >= size:
+                break
+            children = range(first_child, min(first_child + self.arity, size))
+            child = min(children, key=self.priorities.__getitem__)
+            if self.priorities[child] >= priority:
+                break
+            self._move(self.heap[child], self.priorities[child], position)
+            position = child
+        self._move(item, priority, position)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns push, decrease-key, pop and peak size counters."""
+        return {**super().stats(), "decrease_keys": self.decrease_keys}
+
+
+class DialBucketQueue(LazyHeapQueue):
+    """
+    Dial's bucket queue for small non-negative integer edge weights.
+
+    Tentative distances always lie within max_weight of the last popped
+    one, so max_weight + 1 circular buckets indexed by priority are enough
+    and both push and pop are O(1) amortized. Stale entries are left in
+    their buckets, as with LazyHeapQueue.
+    """
+
+    def __init__(self, max_weight: int):
+        super().__init__()
+        self.buckets: List[List[Tuple[int, Any]]] = [[] for _ in range(int(max_weight) + 1)]
+        self.cursor = 0
+        self.size = 0
+
+    def push(self, item: Any, priority: int) -> None:
+        """Inserts an item or lowers its priority."""
+        if priority != int(priority) or priority < self.cursor:
+            raise ValueError(f"Dial's queue needs non-decreasing integer priorities, got {priority}.")
+        self.buckets[int(priority) % len(self.buckets)].append((priority, item))
+        self.size += 1
+        self.pushes += 1
+        self.peak_size = max(self.peak_size, self.size)
+
+    def pop(self) -> Tuple[float, Any]:
+        """Removes and returns the (priority, item) entry with the lowest priority."""
+        if not self.size:
+            raise IndexError("pop from an empty queue")
+        while not self.buckets[self.cursor % len(self.buckets)]:
+            self.cursor += 1
+        self.size -= 1
+        self.pops += 1
+        return self.buckets[self.cursor % len(self.buckets)].pop()
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class RadixHeap(LazyHeapQueue):
+    """
+    Radix heap for non-negative integer priorities popped in non-decreasing
+    order, as in Dijkstra's algorithm.
+
+    An entry lives in the bucket given by the highest bit in which its
+    priority differs from the last popped one; only the first non-empty
+    bucket is ever redistributed, so each entry moves at most once per bit.
+    Stale entries are left in place, as with LazyHeapQueue.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.buckets: List[List[Tuple[int, Any]]] = [[] for _ in range(65)]
+        self.last = 0
+        self.size = 0
+
+    def push(self, item: Any, priority: int) -> None:
+        """Inserts an item or lowers its priority."""
+        if priority != int(priority) or priority < self.last:
+            raise ValueError(f"Radix heap needs non-decreasing integer priorities, got {priority}.")
+        self.buckets[(int(priority) ^ self.last).bit_length()].append((priority, item))
+        self.size += 1
+        self.pushes += 1
+        self.peak_size = max(self.peak_size, self.size)
+
+    def pop(self) -> Tuple[float, Any]:
+        """Removes and returns the (priority, item) entry with the lowest priority."""
+        if not self.size:
+            raise IndexError("pop from an empty queue")
+        if not self.buckets[0]:
+            index = next(i for i, bucket in enumerate(self.buckets) if bucket)
+            entries, self.buckets[index] = self.buckets[index], []
+            self.last = int(min(priority for priority, _ in entries))
+            for entry in entries:
+                self.buckets[(int(entry[0]) ^ self.last).bit_length()].append(entry)
+        self.size -= 1
+        self.pops += 1
+        return self.buckets[0].pop()
+
+    def __len__(self) -> int:
+        return self.size
+
+
+PRIORITY_QUEUES = ("heapq", "dary", "dial", "radix")
+
+
+def make_priority_queue(kind: str, max_weight: Optional[float] = None) -> LazyHeapQueue:
+    """
+    Creates a priority queue for Dijkstra's algorithm by name.
+
+    Parameters:
+        kind (str): "heapq" (lazy binary heap), "dary" (indexed 4-ary heap),
+                    "dial" (bucket queue) or "radix" (radix heap).
+        max_weight (float): Largest edge weight; required by "dial".
+
+    Raises:
+        ValueError: If the kind is unknown or Dial's queue has no max weight.
+    """
+    if kind == "heapq":
+        return LazyHeapQueue()
+    if kind == "dary":
+        return IndexedDaryHeap()
+    if kind == "radix":
+        return RadixHeap()
+    if kind == "dial":
+        if max_weight is None:
+            raise ValueError("Dial's bucket queue needs the maximum edge weight.")
+        return DialBucketQueue(int(max_weight))
+    raise ValueError(f"Unknown priority queue '{kind}', expected one of {PRIORITY_QUEUES}.")
+
+
+def _resolve_queue(queue: Any, graph: Any) -> LazyHeapQueue:
+    """Turns a queue name into a queue instance sized for the graph."""
+    if not isinstance(queue, str):
+        return queue
+    max_weight = None
+    if queue == "dial":
+        if isinstance(graph, CSRGraph):
+            max_weight = float(graph.weights.max()) if graph.num_edges else 0
+        else:
+            max_weight = max((weight for neighbors in graph.values() for _, weight in neighbors), default=0)
+    return make_priority_queue(queue, max_weight)
+
+
+def find_shortest_paths_csr(graph: CSRGraph, source_id: int, queue: Any = "heapq") -> np.ndarray:
+    """
+    Dijkstra's algorithm on a CSRGraph using integer vertex ids.
+
+    Parameters:
+        graph (CSRGraph): The graph.
+        source_id (int): Id of the starting vertex.
+        queue: Priority queue name or instance, as in find_shortest_paths.
+
+    Returns:
+        np.ndarray: Shortest distance from the source to each vertex id
+                    (inf for unreachable vertices).
+
+    Raises:
+        IndexError: If the source id is out of range.
+    """
+    num_vertices = graph.num_vertices
+    if not 0 <= source_id < num_vertices:
+        raise IndexError(f"Source vertex id {source_id} is out of range.")
+
+    # Memoryviews index and slice much faster than NumPy arrays in a Python loop
+    offsets, targets, weights = (memoryview(array).cast("B").cast(array.dtype.char)
+                                 for array in (graph.offsets, graph.targets, graph.weights))
+    shortest_distances = [float('inf')] * num_vertices
+    shortest_distances[source_id] = 0.0
+
+    if queue != "heapq":
+        priority_queue = _resolve_queue(queue, graph)
+        priority_queue.push(source_id, 0.0)
+        while priority_queue:
+            current_distance, current_vertex = priority_queue.pop()
+            if current_distance > shortest_distances[current_vertex]:
+                continue
+
+            start, end = offsets[current_vertex], offsets[current_vertex + 1]
+            for neighbor, weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+                new_distance = current_distance + weight
+                if new_distance < shortest_distances[neighbor]:
+                    shortest_distances[neighbor] = new_distance
+                    priority_queue.push(neighbor, new_distance)
+        return np.array(shortest_distances)
+
+    # Default queue: bare heapq calls, without the strategy's method calls and stats
+    min_heap: List[Tuple[float, int]] = [(0.0, source_id)]
+
+    while min_heap:
+        current_distance, current_vertex = heapq.heappop(min_heap)
+        if current_distance > shortest_distances[current_vertex]:
+            continue
+
+        start, end = offsets[current_vertex], offsets[current_vertex + 1]
+        for neighbor, weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            new_distance = current_distance + weight
+            if new_distance < shortest_distances[neighbor]:
+                shortest_distances[neighbor] = new_distance
+                heapq.heappush(min_heap, (new_distance, neighbor))
+
+    return np.array(shortest_distances)
+
+
+def find_shortest_paths(graph: Dict[Any, List[Tuple[Any, float]]], source: Any, queue: Any = "heapq") -> Dict[Any, float]:
     """
     Implements Dijkstra's algorithm using a binary heap (min-priority queue)
     to find the shortest paths from the source vertex to all other vertices
@@ -14,7 +530,12 @@ def find_shortest_paths(graph: Dict[Any, List[Tuple[Any, float]]], source: Any)
     Parameters:
         graph (Dict): Adjacency list representation of the graph.
                       Each key is a vertex, and the value is a list of tuples (neighbor, weight).
+                      A CSRGraph is also accepted and searched on its arrays directly.
         source (Any): The starting vertex.
+        queue: Priority queue strategy: a name accepted by make_priority_queue
+               ("heapq", "dary", "dial", "radix"), or a queue instance whose
+               stats() can be read afterwards. The default "heapq" runs an
+               inline heapq loop that keeps no stats.
 
     Returns:
         Dict: A dictionary mapping each vertex to its shortest distance from the source.
@@ -25,10 +546,27 @@ def find_shortest_paths(graph: Dict[Any, List[Tuple[Any, float]]], source: Any)
     if source not in graph:
         raise KeyError(f"Source vertex '{source}' not found in the graph.")
 
+    if isinstance(graph, CSRGraph):
+        return graph.distances_to_dict(find_shortest_paths_csr(graph, graph.ids[source], queue))
+
     # Initialize all distances to infinity, except the source
     shortest_distances: Dict[Any, float] = {vertex: float('inf') for vertex in graph}
     shortest_distances[source] = 0
 
+    if queue != "heapq":
+        priority_queue = _resolve_queue(queue, graph)
+        priority_queue.push(source, 0)
+        while priority_queue:
+            current_distance, current_vertex = priority_queue.pop()
+            if current_distance > shortest_distances[current_vertex]:
+                continue
+            for neighbor, weight in graph[current_vertex]:
+                new_distance = current_distance + weight
+                if new_distance < shortest_distances[neighbor]:
+                    shortest_distances[neighbor] = new_distance
+                    priority_queue.push(neighbor, new_distance)
+        return shortest_distances
+
     # Min-priority queue to select vertex with smallest known distance
     min_heap: List[Tuple[float, Any]] = [(0, source)]
 
@@ -51,26 +589,1838 @@ def find_shortest_paths(graph: Dict[Any, List[Tuple[Any, float]]], source: Any)
     return shortest_distances
 
 
-# Usage
-if __name__ == "__main__":
-    # Graph Example
-    weighted_graph = {
-        'S': [('A', 7), ('B', 2)],
-        'A': [('S', 7), ('B', 3), ('C', 4)],
-        'B': [('S', 2), ('A', 3), ('D', 5)],
-        'C': [('A', 4), ('D', 1), ('E', 7)],
-        'D': [('B', 5), ('C', 1), ('E', 2)],
-        'E': [('C', 7), ('D', 2)]
+class PathResult(NamedTuple):
+    """Result of a point-to-point shortest path query."""
+    distance: float
+    path: List[Any]
+    settled: int
+
+
+def reverse_graph(graph: Dict[Any, List[Tuple[Any, float]]]) -> Dict[Any, List[Tuple[Any, float]]]:
+    """
+    Builds the reverse adjacency list, where each edge (u, v, w) becomes (v, u, w).
+
+    Parameters:
+        graph (Dict): Adjacency list representation of the graph, or a CSRGraph.
+
+    Returns:
+        Dict: The reversed graph (a CSRGraph for CSRGraph input).
+    """
+    if isinstance(graph, CSRGraph):
+        return graph.reverse()
+
+    reversed_graph: Dict[Any, List[Tuple[Any, float]]] = {vertex: [] for vertex in graph}
+    for vertex, neighbors in graph.items():
+        for neighbor, weight in neighbors:
+            reversed_graph.setdefault(neighbor, []).append((vertex, weight))
+    return reversed_graph
+
+
+def _reconstruct_path(predecessors: Dict[Any, Any], target: Any) -> List[Any]:
+    """Follows predecessor links back from the target and returns the path."""
+    path = [target]
+    while predecessors.get(path[-1]) is not None:
+        path.append(predecessors[path[-1]])
+    path.reverse()
+    return path
+
+
+def _out_edges(graph: Dict[Any, List[Tuple[Any, float]]], vertex: Any) -> List[Tuple[Any, float]]:
+    """Returns the out-edges of a vertex, treating vertices without an entry as sinks."""
+    return graph[vertex] if vertex in graph else []
+
+
+def shortest_path(graph: Dict[Any, List[Tuple[Any, float]]], source: Any, target: Any,
+                  bidirectional: bool = False,
+                  reversed_graph: Optional[Dict[Any, List[Tuple[Any, float]]]] = None) -> PathResult:
+    """
+    Finds a shortest path between two vertices with Dijkstra's algorithm.
+
+    The search stops as soon as the target is settled, and only the
+    vertices it touches are stored. The bidirectional variant searches
+    forward from the source and backward from the target at the same
+    time, which usually settles far fewer vertices.
+
+    Parameters:
+        graph (Dict): Adjacency list representation of the graph (or a CSRGraph).
+        source (Any): The starting vertex.
+        target (Any): The destination vertex.
+        bidirectional (bool): Use bidirectional Dijkstra.
+        reversed_graph (Dict): Reverse adjacency for the backward search; built
+                               with reverse_graph() when omitted. Pass the graph
+                               itself for undirected graphs, and reuse one
+                               reversed graph across repeated queries.
+
+    Returns:
+        PathResult: The distance (inf if unreachable), the list of vertices
+                    from source to target (empty if unreachable) and the
+                    number of settled vertices.
+
+    Raises:
+        KeyError: If the source or target vertex is not in the graph.
+    """
+    for vertex in (source, target):
+        if vertex not in graph:
+            raise KeyError(f"Vertex '{vertex}' not found in the graph.")
+
+    if bidirectional:
+        if reversed_graph is None:
+            reversed_graph = reverse_graph(graph)
+        return _bidirectional_shortest_path(graph, reversed_graph, source, target)
+
+    distances: Dict[Any, float] = {source: 0}
+    predecessors: Dict[Any, Any] = {source: None}
+    settled = 0
+    min_heap: List[Tuple[float, Any]] = [(0, source)]
+
+    while min_heap:
+        current_distance, current_vertex = heapq.heappop(min_heap)
+        if current_distance > distances[current_vertex]:
+            continue
+        settled += 1
+
+        # The target is settled: its distance is final
+        if current_vertex == target:
+            return PathResult(current_distance, _reconstruct_path(predecessors, target), settled)
+
+        for neighbor, weight in _out_edges(graph, current_vertex):
+            new_distance = current_distance + weight
+            if new_distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = current_vertex
+                heapq.heappush(min_heap, (new_distance, neighbor))
+
+    return PathResult(float('inf'), [], settled)
+
+
+def _bidirectional_shortest_path(graph: Dict[Any, List[Tuple[Any, float]]],
+                                 reversed_graph: Dict[Any, List[Tuple[Any, float]]],
+                                 source: Any, target: Any) -> PathResult:
+    """
+    Bidirectional Dijkstra: alternates between a forward search on the graph
+    and a backward search on the reversed graph, and stops once the two
+    queue minima together reach the best source-target distance found.
+    """
+    if source == target:
+        return PathResult(0, [source], 1)
+
+    graphs = (graph, reversed_graph)
+    distances: Tuple[Dict[Any, float], Dict[Any, float]] = ({source: 0}, {target: 0})
+    predecessors: Tuple[Dict[Any, Any], Dict[Any, Any]] = ({source: None}, {target: None})
+    heaps: Tuple[List[Tuple[float, Any]], List[Tuple[float, Any]]] = ([(0, source)], [(0, target)])
+    best_distance = float('inf')
+    meeting_vertex = None
+    settled = 0
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best_distance:
+            break
+
+        # Expand the side with the smaller queue
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        current_distance, current_vertex = heapq.heappop(heaps[side])
+        if current_distance > distances[side][current_vertex]:
+            continue
+        settled += 1
+
+        own_distances, other_distances = distances[side], distances[1 - side]
+        for neighbor, weight in _out_edges(graphs[side], current_vertex):
+            new_distance = current_distance + weight
+            if new_distance < own_distances.get(neighbor, float('inf')):
+                own_distances[neighbor] = new_distance
+                predecessors[side][neighbor] = current_vertex
+                heapq.heappush(heaps[side], (new_distance, neighbor))
+            # A path through this edge joins the two search trees
+            if neighbor in other_distances:
+                candidate = own_distances[neighbor] + other_distances[neighbor]
+                if candidate < best_distance:
+                    best_distance = candidate
+                    meeting_vertex = neighbor
+
+    if meeting_vertex is None:
+        return PathResult(float('inf'), [], settled)
+
+    forward_path = _reconstruct_path(predecessors[0], meeting_vertex)
+    backward_path = _reconstruct_path(predecessors[1], meeting_vertex)
+    backward_path.reverse()
+    return PathResult(best_distance, forward_path + backward_path[1:], settled)
+
+
+def astar_shortest_path(graph: Dict[Any, List[Tuple[Any, float]]], source: Any, target: Any,
+                        heuristic: Callable[[Any], float]) -> PathResult:
+    """
+    Finds a shortest path with A*: Dijkstra ordered by distance plus a
+    lower bound on the remaining distance to the target.
+
+    Parameters:
+        graph (Dict): Adjacency list representation of the graph (or a CSRGraph).
+        source (Any): The starting vertex.
+        target (Any): The destination vertex.
+        heuristic (Callable): Returns a lower bound on the distance from a
+                              vertex to the target. It must never overestimate;
+                              a heuristic returning 0 gives plain Dijkstra.
+
+    Returns:
+        PathResult: Distance, path and number of settled vertices.
+
+    Raises:
+        KeyError: If the source or target vertex is not in the graph.
+    """
+    for vertex in (source, target):
+        if vertex not in graph:
+            raise KeyError(f"Vertex '{vertex}' not found in the graph.")
+
+    distances: Dict[Any, float] = {source: 0}
+    predecessors: Dict[Any, Any] = {source: None}
+    settled = 0
+    min_heap: List[Tuple[float, float, Any]] = [(heuristic(source), 0, source)]
+
+    while min_heap:
+        _, current_distance, current_vertex = heapq.heappop(min_heap)
+        if current_distance > distances[current_vertex]:
+            continue
+        settled += 1
+
+        if current_vertex == target:
+            return PathResult(current_distance, _reconstruct_path(predecessors, target), settled)
+
+        for neighbor, weight in _out_edges(graph, current_vertex):
+            new_distance = current_distance + weight
+            if new_distance < distances.get(neighbor, float('inf')):
+                estimate = heuristic(neighbor)
+                # The target cannot be reached from this neighbor
+                if estimate == float('inf'):
+                    continue
+                distances[neighbor] = new_distance
+                predecessors[neighbor] = current_vertex
+                heapq.heappush(min_heap, (new_distance + estimate, new_distance, neighbor))
+
+    return PathResult(float('inf'), [], settled)
+
+
+def euclidean_heuristic(coordinates: Dict[Any, Tuple[float, float]], target: Any,
+                        scale: float = 1.0) -> Callable[[Any], float]:
+    """
+    Builds an A* heuristic from vertex coordinates.
+
+    Parameters:
+        coordinates (Dict): (x, y) position of each vertex.
+        target (Any): The destination vertex.
+        scale (float): Minimum edge weight per unit of straight-line length;
+                       the heuristic is admissible only if no edge is cheaper.
+
+    Returns:
+        Callable: Function mapping a vertex to scale times its straight-line
+                  distance to the target.
+    """
+    target_x, target_y = coordinates[target]
+
+    def heuristic(vertex: Any) -> float:
+        x, y = coordinates[vertex]
+        return scale * math.hypot(x - target_x, y - target_y)
+
+    return heuristic
+
+
+class LandmarkIndex:
+    """
+    ALT (A*, landmarks, triangle inequality) preprocessing.
+
+    For a few landmark vertices L, distances d(L, v) and d(v, L) to every
+    vertex are stored in two (landmarks x vertices) float arrays. The
+    triangle inequality then gives admissible lower bounds
+
+        d(v, t) >= d(L, t) - d(L, v)    and    d(v, t) >= d(v, L) - d(t, L)
+
+    without any vertex coordinates.
+    """
+
+    def __init__(self, labels: List[Any], landmarks: List[Any], forward: np.ndarray, backward: np.ndarray):
+        self.labels = labels
+        self.ids: Dict[Any, int] = {label: vertex_id for vertex_id, label in enumerate(labels)}
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self._rows: Optional[List[List[float]]] = None
+
+    @classmethod
+    def build(cls, graph: Dict[Any, List[Tuple[Any, float]]], num_landmarks: int = 8,
+              reversed_graph: Optional[Dict[Any, List[Tuple[Any, float]]]] = None,
+              seed: Optional[int] = None) -> "LandmarkIndex":
+        """
+        Picks landmarks and precomputes their distance tables.
+
+        Landmarks are chosen by farthest selection: each new landmark is the
+        vertex farthest from all landmarks chosen so far (vertices that no
+        landmark reaches come first), which spreads them over the graph.
+
+        Parameters:
+            graph (Dict): Adjacency list representation of the graph.
+            num_landmarks (int): Number of landmarks to pick.
+            reversed_graph (Dict): Reverse adjacency; built when omitted.
+                                   Pass the graph itself for undirected graphs.
+            seed (int): Seed for choosing the first landmark.
+
+        Returns:
+            LandmarkIndex: The index.
+        """
+        if reversed_graph is None:
+            reversed_graph = reverse_graph(graph)
+        labels = list(graph)
+        num_landmarks = min(num_landmarks, len(labels))
+
+        forward = np.empty((num_landmarks, len(labels)))
+        backward = np.empty((num_landmarks, len(labels)))
+        landmarks: List[Any] = []
+        closest = np.full(len(labels), np.inf)
+        candidate = random.Random(seed).randrange(len(labels)) if labels else 0
+
+        for k in range(num_landmarks):
+            landmark = labels[candidate]
+            landmarks.append(landmark)
+            from_landmark = find_shortest_paths(graph, landmark)
+            to_landmark = find_shortest_paths(reversed_graph, landmark)
+            forward[k] = [from_landmark.get(label, np.inf) for label in labels]
+            backward[k] = [to_landmark.get(label, np.inf) for label in labels]
+
+            closest = np.minimum(closest, forward[k])
+            candidate = int(np.argmax(closest))
+
+        return cls(labels, landmarks, forward, backward)
+
+    def heuristic(self, target: Any) -> Callable[[Any], float]:
+        """Returns the ALT lower bound on the distance from a vertex to the target."""
+        if self._rows is None:
+            # Per-vertex rows [-d(L, v)..., d(v, L)...] as Python floats for fast scalar access
+            self._rows = np.concatenate((-self.forward, self.backward)).T.tolist()
+        target_id = self.ids[target]
+        target_row = np.concatenate((self.forward[:, target_id], -self.backward[:, target_id])).tolist()
+        rows, ids = self._rows, self.ids
+
+        def bound(vertex: Any) -> float:
+            best = 0.0
+            for target_term, vertex_term in zip(target_row, rows[ids[vertex]]):
+                value = target_term + vertex_term
+                # inf - inf (NaN) means the landmark gives no bound
+                if value > best:
+                    best = value
+            return best
+
+        return bound
+
+    def shortest_path(self, graph: Dict[Any, List[Tuple[Any, float]]], source: Any, target: Any) -> PathResult:
+        """Runs A* guided by the landmark bounds."""
+        return astar_shortest_path(graph, source, target, self.heuristic(target))
+
+    def save(self, path: str) -> None:
+        """Writes the index to a compressed .npz file."""
+        np.savez_compressed(path, forward=self.forward, backward=self.backward,
+                            labels=np.array(json.dumps(self.labels)),
+                            landmarks=np.array(json.dumps(self.landmarks)))
+
+    @classmethod
+    def load(cls, path: str) -> "LandmarkIndex":
+        """Reads an index written by save()."""
+        def decode(text):
+            return [tuple(label) if isinstance(label, list) else label for label in json.loads(str(text))]
+
+        with np.load(path) as data:
+            return cls(decode(data["labels"]), decode(data["landmarks"]), data["forward"], data["backward"])
+
+
+def make_grid_graph(rows: int, cols: int, max_weight: int = 10,
+                    seed: Optional[int] = None) -> Tuple[Dict[Any, List[Tuple[Any, float]]], Dict[Any, Tuple[float, float]]]:
+    """
+    Generates an undirected grid road network for benchmarks.
+
+    Each edge weighs its length (1) plus a random delay, so the straight-line
+    distance is an admissible heuristic.
+
+    Returns:
+        Tuple: The adjacency list graph and the (x, y) coordinates of its vertices.
+    """
+    rng = random.Random(seed)
+    graph: Dict[Any, List[Tuple[Any, float]]] = {(row, col): [] for row in range(rows) for col in range(cols)}
+    for row in range(rows):
+        for col in range(cols):
+            for neighbor in ((row + 1, col), (row, col + 1)):
+                if neighbor in graph:
+                    weight = 1 + rng.randint(0, max_weight - 1)
+                    graph[(row, col)].append((neighbor, weight))
+                    graph[neighbor].append(((row, col), weight))
+    coordinates = {vertex: (float(vertex[1]), float(vertex[0])) for vertex in graph}
+    return graph, coordinates
+
+
+def benchmark_goal_directed(graph: Dict[Any, List[Tuple[Any, float]]],
+                            coordinates: Optional[Dict[Any, Tuple[float, float]]] = None,
+                            num_queries: int = 50, num_landmarks: int = 8,
+                            seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Compares settled vertices and query time of Dijkstra, bidirectional
+    Dijkstra, A* with Euclidean distances (if coordinates are given) and ALT
+    on random queries, checking that all methods agree on the distances.
+
+    Returns:
+        List[Dict]: One row per method with average settled vertices and milliseconds.
+    """
+    rng = random.Random(seed)
+    vertices = list(graph)
+    queries = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(num_queries)]
+    reversed_graph = reverse_graph(graph)
+
+    started = time.perf_counter()
+    index = LandmarkIndex.build(graph, num_landmarks, reversed_graph, seed=seed)
+    print(f"ALT preprocessing: {len(index.landmarks)} landmarks in {time.perf_counter() - started:.2f} s")
+
+    methods: Dict[str, Callable[[Any, Any], PathResult]] = {
+        "Dijkstra": lambda s, t: shortest_path(graph, s, t),
+        "Bidirectional": lambda s, t: shortest_path(graph, s, t, True, reversed_graph),
     }
+    if coordinates is not None:
+        methods["A* (Euclidean)"] = lambda s, t: astar_shortest_path(graph, s, t, euclidean_heuristic(coordinates, t))
+    methods["ALT"] = lambda s, t: index.shortest_path(graph, s, t)
 
-    # Define the source node for Dijkstra's algorithm
-    # All shortest paths will be computed from this node
-    source_node = 'S'
+    reference = [shortest_path(graph, s, t).distance for s, t in queries]
+    rows = []
+    for name, query in methods.items():
+        settled = 0
+        started = time.perf_counter()
+        for (s, t), expected in zip(queries, reference):
+            result = query(s, t)
+            if not math.isclose(result.distance, expected):
+                raise AssertionError(f"{name} returned {result.distance} instead of {expected} for {s} -> {t}")
+            settled += result.settled
+        elapsed = time.perf_counter() - started
+        rows.append({"method": name, "settled": settled / len(queries), "ms": 1000 * elapsed / len(queries)})
 
-    try:
-        shortest_paths = find_shortest_paths(weighted_graph, source_node)
-        print(f"Shortest paths from '{source_node}':")
-        for vertex, distance in shortest_paths.items():
-            print(f"  to {vertex}: {distance}")
-    except KeyError as e:
-        print(f"Error: {e}")
+    print(f"{'Method':<16}{'avg settled':>14}{'avg ms':>10}")
+    for row in rows:
+        print(f"{row['method']:<16}{row['settled']:>14.1f}{row['ms']:>10.2f}")
+    return rows
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchies (CH) index for fast repeated shortest path queries.
+
+    Vertices are contracted one by one in order of importance; when a
+    vertex v is removed, a shortcut u -> w (remembering v as its middle
+    vertex) replaces every path u -> v -> w that has no equally short
+    witness path avoiding v. A query then only runs two small Dijkstra
+    searches that move upward in the contraction order: forward from the
+    source and backward from the target.
+    """
+
+    def __init__(self, labels: List[Any], rank: List[int],
+                 upward: List[List[Tuple[int, float, int]]], downward: List[List[Tuple[int, float, int]]]):
+        """
+        Parameters:
+            labels (List): Vertex label of each vertex id.
+            rank (List): Contraction order of each vertex id.
+            upward (List): upward[u] lists (v, weight, middle) for edges u -> v with rank[v] > rank[u].
+            downward (List): downward[v] lists (u, weight, middle) for edges u -> v with rank[u] > rank[v].
+                             middle is the contracted vertex of a shortcut, or -1.
+        """
+        self.labels = labels
+        self.ids: Dict[Any, int] = {label: vertex_id for vertex_id, label in enumerate(labels)}
+        self.rank = rank
+        self.upward = upward
+        self.downward = downward
+
+    @property
+    def num_shortcuts(self) -> int:
+        return sum(1 for edges in (self.upward, self.downward) for adjacent in edges
+                   for _, _, middle in adjacent if middle >= 0)
+
+    @classmethod
+    def build(cls, graph: Dict[Any, List[Tuple[Any, float]]],
+              witness_settle_limit: int = 64) -> "ContractionHierarchy":
+        """
+        Orders the vertices and adds the shortcut edges.
+
+        The next vertex to contract is the one with the lowest edge difference
+        (shortcuts added minus edges removed) plus the number of already
+        contracted neighbors, with priorities refreshed lazily on each pop.
+
+        Parameters:
+            graph (Dict): Adjacency list representation of the graph (or a CSRGraph).
+            witness_settle_limit (int): Settled vertices after which a witness
+                                        search gives up (a shortcut is then added,
+                                        which is never wrong, only redundant).
+
+        Returns:
+            ContractionHierarchy: The index.
+        """
+        labels = list(graph)
+        ids = {label: vertex_id for vertex_id, label in enumerate(labels)}
+        for neighbors in list(graph.values()) if isinstance(graph, dict) else (graph[label] for label in labels):
+            for neighbor, _ in neighbors:
+                if neighbor not in ids:
+                    ids[neighbor] = len(labels)
+                    labels.append(neighbor)
+        num_vertices = len(labels)
+
+        # out_edges[u][v] = in_edges[v][u] = (weight, middle) of the best edge u -> v
+        out_edges: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(num_vertices)]
+        in_edges: List[Dict[int, Tuple[float, int]]] = [{} for _ in range(num_vertices)]
+        for label in graph:
+            u = ids[label]
+            for neighbor, weight in graph[label]:
+                v = ids[neighbor]
+                if u != v and (v not in out_edges[u] or weight < out_edges[u][v][0]):
+                    out_edges[u][v] = in_edges[v][u] = (weight, -1)
+
+        contracted = [False] * num_vertices
+        deleted_neighbors = [0] * num_vertices
+
+        def witness_distances(source: int, excluded: int, max_distance: float) -> Dict[int, float]:
+            distances = {source: 0}
+            local_heap = [(0, source)]
+            settled = 0
+            while local_heap:
+                current_distance, current_vertex = heapq.heappop(local_heap)
+                if current_distance > distances[current_vertex]:
+                    continue
+                if current_distance > max_distance or settled >= witness_settle_limit:
+                    break
+                settled += 1
+                for neighbor, (weight, _) in out_edges[current_vertex].items():
+                    if neighbor == excluded or contracted[neighbor]:
+                        continue
+                    new_distance = current_distance + weight
+                    if new_distance < distances.get(neighbor, float('inf')):
+                        distances[neighbor] = new_distance
+                        heapq.heappush(local_heap, (new_distance, neighbor))
+            return distances
+
+        def needed_shortcuts(vertex: int) -> List[Tuple[int, int, float]]:
+            outgoing = [(w, weight) for w, (weight, _) in out_edges[vertex].items() if not contracted[w]]
+            if not outgoing:
+                return []
+            max_outgoing = max(weight for _, weight in outgoing)
+            shortcuts = []
+            for u, (weight_in, _) in in_edges[vertex].items():
+                if contracted[u]:
+                    continue
+                witnesses = witness_distances(u, vertex, weight_in + max_outgoing)
+                for w, weight_out in outgoing:
+                    if w != u and witnesses.get(w, float('inf')) > weight_in + weight_out:
+                        shortcuts.append((u, w, weight_in + weight_out))
+            return shortcuts
+
+        def priority(vertex: int) -> Tuple[int, List[Tuple[int, int, float]]]:
+            shortcuts = needed_shortcuts(vertex)
+            degree = sum(1 for w in out_edges[vertex] if not contracted[w]) + \
+                     sum(1 for u in in_edges[vertex] if not contracted[u])
+            return len(shortcuts) - degree + deleted_neighbors[vertex], shortcuts
+
+        queue = [(priority(vertex)[0], vertex) for vertex in range(num_vertices)]
+        heapq.heapify(queue)
+        rank = [0] * num_vertices
+        order = 0
+
+        while queue:
+            _, vertex = heapq.heappop(queue)
+            # Lazy update: contract only if the vertex is still the cheapest
+            current_priority, shortcuts = priority(vertex)
+            if queue and current_priority > queue[0][0]:
+                heapq.heappush(queue, (current_priority, vertex))
+                continue
+
+            for u, w, weight in shortcuts:
+                existing = out_edges[u].get(w)
+                if existing is None or weight < existing[0]:
+                    out_edges[u][w] = in_edges[w][u] = (weight, vertex)
+
+            contracted[vertex] = True
+            rank[vertex] = order
+            order += 1
+            for neighbor in list(out_edges[vertex]) + list(in_edges[vertex]):
+                if not contracted[neighbor]:
+                    deleted_neighbors[neighbor] += 1
+
+        upward: List[List[Tuple[int, float, int]]] = [[] for _ in range(num_vertices)]
+        downward: List[List[Tuple[int, float, int]]] = [[] for _ in range(num_vertices)]
+        for u in range(num_vertices):
+            for v, (weight, middle) in out_edges[u].items():
+                if rank[v] > rank[u]:
+                    upward[u].append((v, weight, middle))
+                else:
+                    downward[v].append((u, weight, middle))
+
+        return cls(labels, rank, upward, downward)
+
+    def shortest_path(self, source: Any, target: Any) -> PathResult:
+        """
+        Answers a query with a bidirectional upward search.
+
+        Parameters:
+            source (Any): The starting vertex.
+            target (Any): The destination vertex.
+
+        Returns:
+            PathResult: Distance, the unpacked path in original edges and the
+                        number of settled vertices.
+
+        Raises:
+            KeyError: If the source or target vertex is not in the graph.
+        """
+        for vertex in (source, target):
+            if vertex not in self.ids:
+                raise KeyError(f"Vertex '{vertex}' not found in the graph.")
+        source_id, target_id = self.ids[source], self.ids[target]
+
+        edges = (self.upward, self.downward)
+        distances: Tuple[Dict[int, float], Dict[int, float]] = ({source_id: 0}, {target_id: 0})
+        predecessors: Tuple[Dict[int, Any], Dict[int, Any]] = ({source_id: None}, {target_id: None})
+        heaps: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0, source_id)], [(0, target_id)])
+        best_distance = float('inf')
+        meeting_vertex = None
+        settled = 0
+
+        while heaps[0] or heaps[1]:
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            current_distance, current_vertex = heapq.heappop(heaps[side])
+            if current_distance > distances[side][current_vertex]:
+                continue
+            # Nothing left on this side can improve the answer
+            if current_distance >= best_distance:
+                heaps[side].clear()
+                continue
+            settled += 1
+
+            other_distance = distances[1 - side].get(current_vertex)
+            if other_distance is not None and current_distance + other_distance < best_distance:
+                best_distance = current_distance + other_distance
+                meeting_vertex = current_vertex
+
+            for neighbor, weight, _ in edges[side][current_vertex]:
+                new_distance = current_distance + weight
+                if new_distance < distances[side].get(neighbor, float('inf')):
+                    distances[side][neighbor] = new_distance
+                    predecessors[side][neighbor] = current_vertex
+                    heapq.heappush(heaps[side], (new_distance, neighbor))
+
+        if meeting_vertex is None:
+            return PathResult(float('inf'), [], settled)
+
+        path = _reconstruct_path(predecessors[0], meeting_vertex)
+        backward_path = _reconstruct_path(predecessors[1], meeting_vertex)
+        backward_path.reverse()
+        path += backward_path[1:]
+        return PathResult(best_distance, [self.labels[vertex] for vertex in self._unpack(path)], settled)
+
+    def _edge(self, u: int, v: int) -> Tuple[float, int]:
+        """Returns (weight, middle) of the hierarchy edge u -> v."""
+        if self.rank[v] > self.rank[u]:
+            candidates, wanted = self.upward[u], v
+        else:
+            candidates, wanted = self.downward[v], u
+        for neighbor, weight, middle in candidates:
+            if neighbor == wanted:
+                return weight, middle
+        raise KeyError(f"No hierarchy edge {u} -> {v}.")
+
+    def _unpack(self, path: List[int]) -> List[int]:
+        """Replaces every shortcut on a path by the original edges it stands for."""
+        unpacked = path[:1]
+        for u, v in zip(path, path[1:]):
+            stack = [(u, v)]
+            while stack:
+                a, b = stack.pop()
+                _, middle = self._edge(a, b)
+                if middle < 0:
+                    unpacked.append(b)
+                else:
+                    stack.append((middle, b))
+                    stack.append((a, middle))
+        return unpacked
+
+    def save(self, path: str) -> None:
+        """Writes the hierarchy to a compressed .npz file of CSR-style arrays."""
+        arrays: Dict[str, np.ndarray] = {"rank": np.asarray(self.rank, dtype=np.int64),
+                                         "labels": np.array(json.dumps(self.labels))}
+        for name, adjacency in (("upward", self.upward), ("downward", self.downward)):
+            arrays[f"{name}_offsets"] = np.concatenate(([0], np.cumsum([len(edges) for edges in adjacency]))).astype(np.int64)
+            flat = [edge for edges in adjacency for edge in edges]
+            arrays[f"{name}_targets"] = np.array([edge[0] for edge in flat], dtype=np.int64)
+            arrays[f"{name}_weights"] = np.array([edge[1] for edge in flat], dtype=np.float64)
+            arrays[f"{name}_middles"] = np.array([edge[2] for edge in flat], dtype=np.int64)
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        """Reads a hierarchy written by save()."""
+        with np.load(path) as data:
+            labels = [tuple(label) if isinstance(label, list) else label for label in json.loads(str(data["labels"]))]
+            adjacency = {}
+            for name in ("upward", "downward"):
+                offsets = data[f"{name}_offsets"].tolist()
+                flat = list(zip(data[f"{name}_targets"].tolist(), data[f"{name}_weights"].tolist(),
+                                data[f"{name}_middles"].tolist()))
+                adjacency[name] = [flat[start:end] for start, end in zip(offsets, offsets[1:])]
+            return cls(labels, data["rank"].tolist(), adjacency["upward"], adjacency["downward"])
+
+
+def path_length(graph: Dict[Any, List[Tuple[Any, float]]], path: List[Any]) -> float:
+    """
+    Sums the cheapest edge weights along a path.
+
+    Raises:
+        KeyError: If two consecutive vertices are not joined by an edge.
+    """
+    total = 0
+    for u, v in zip(path, path[1:]):
+        weights = [weight for neighbor, weight in graph[u] if neighbor == v]
+        if not weights:
+            raise KeyError(f"No edge '{u}' -> '{v}' in the graph.")
+        total += min(weights)
+    return total
+
+
+def benchmark_contraction_hierarchy(graph: Dict[Any, List[Tuple[Any, float]]], num_queries: int = 200,
+                                   seed: Optional[int] = None, index_path: str = "ch_index.npz") -> Dict[str, float]:
+    """
+    Builds a contraction hierarchy and reports preprocessing time, index
+    size and query latency against plain Dijkstra with early exit, checking
+    every distance and unpacked path against Dijkstra.
+
+    Returns:
+        Dict: The measured figures.
+    """
+    started = time.perf_counter()
+    hierarchy = ContractionHierarchy.build(graph)
+    preprocessing = time.perf_counter() - started
+    hierarchy.save(index_path)
+    index_size = os.path.getsize(index_path)
+
+    rng = random.Random(seed)
+    vertices = list(graph)
+    queries = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(num_queries)]
+
+    started = time.perf_counter()
+    expected = [shortest_path(graph, s, t) for s, t in queries]
+    dijkstra_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    results = [hierarchy.shortest_path(s, t) for s, t in queries]
+    ch_time = time.perf_counter() - started
+
+    for (s, t), reference, result in zip(queries, expected, results):
+        if not math.isclose(result.distance, reference.distance):
+            raise AssertionError(f"CH returned {result.distance} instead of {reference.distance} for {s} -> {t}")
+        if result.path and not math.isclose(path_length(graph, result.path), reference.distance):
+            raise AssertionError(f"CH path for {s} -> {t} does not have the shortest length")
+
+    report = {
+        "vertices": len(vertices),
+        "shortcuts": hierarchy.num_shortcuts,
+        "preprocessing_s": preprocessing,
+        "index_bytes": index_size,
+        "dijkstra_query_us": 1e6 * dijkstra_time / num_queries,
+        "ch_query_us": 1e6 * ch_time / num_queries,
+    }
+    print(f"Vertices: {report['vertices']}, shortcuts: {report['shortcuts']}")
+    print(f"Preprocessing: {preprocessing:.2f} s, index size: {index_size / 1024:.1f} KiB ({index_path})")
+    print(f"Average query: Dijkstra {report['dijkstra_query_us']:.0f} us, CH {report['ch_query_us']:.0f} us")
+    return report
+
+
+def compare_priority_queues(graph: Dict[Any, List[Tuple[Any, float]]], source: Any,
+                            kinds: Iterable[str] = PRIORITY_QUEUES) -> List[Dict[str, Any]]:
+    """
+    Runs find_shortest_paths from one source with each priority queue and
+    reports time, pops and peak queue size, checking that the distances agree.
+
+    Queues that cannot handle the graph (Dial's and radix heaps need
+    integer weights) are reported as skipped.
+
+    Returns:
+        List[Dict]: One row per queue with its stats() and the time in milliseconds.
+    """
+    reference = find_shortest_paths(graph, source)
+    rows = []
+    for kind in kinds:
+        queue = _resolve_queue(kind, graph)
+        started = time.perf_counter()
+        try:
+            distances = find_shortest_paths(graph, source, queue)
+        except ValueError as e:
+            print(f"{kind:<8} skipped: {e}")
+            continue
+        elapsed = time.perf_counter() - started
+        if distances != reference:
+            raise AssertionError(f"Queue '{kind}' returned different distances.")
+        rows.append({"queue": kind, "ms": 1000 * elapsed, **queue.stats()})
+
+    print(f"{'Queue':<8}{'ms':>10}{'pushes':>10}{'pops':>10}{'peak size':>12}")
+    for row in rows:
+        print(f"{row['queue']:<8}{row['ms']:>10.1f}{row['pushes']:>10}{row['pops']:>10}{row['peak_size']:>12}")
+    return rows
+
+
+class SharedCSRGraph:
+    """
+    Copies the arrays of a CSRGraph into shared memory blocks so that
+    worker processes can map the same graph read-only instead of receiving
+    a pickled copy per task.
+
+    Labels stay in the parent process: workers address vertices by id, so
+    attaching costs O(1) regardless of the graph size.
+
+    Use as a context manager; the blocks are released on exit.
+    """
+
+    ARRAYS = ("offsets", "targets", "weights")
+
+    def __init__(self, graph: CSRGraph):
+        self.blocks: List[shared_memory.SharedMemory] = []
+        spec = []
+        for name in self.ARRAYS:
+            array = np.ascontiguousarray(getattr(graph, name))
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            self.blocks.append(block)
+            spec.append((block.name, array.shape, array.dtype.str))
+        # Picklable description handed to the workers
+        self.spec: Tuple[Tuple[str, Tuple[int, ...], str], ...] = tuple(spec)
+
+    @staticmethod
+    def attach(spec: Tuple[Tuple[str, Tuple[int, ...], str], ...]) -> Tuple[CSRGraph, List[shared_memory.SharedMemory]]:
+        """
+        Maps the shared arrays described by spec into a CSRGraph labelled by vertex id.
+
+        Returns:
+            Tuple: The graph and the attached blocks, which must stay referenced
+                   while the graph is used.
+        """
+        blocks = []
+        arrays = []
+        for name, shape, dtype in spec:
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            arrays.append(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+        return CSRGraph(*arrays), blocks
+
+    def close(self) -> None:
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    def __enter__(self) -> "SharedCSRGraph":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Graph mapped by each worker process of the multi-source pool
+_worker_graph: Optional[CSRGraph] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _attach_worker(spec: Tuple[Tuple[str, Tuple[int, ...], str], ...]) -> None:
+    """Pool initializer: maps the shared graph once per worker process."""
+    global _worker_graph, _worker_blocks
+    _worker_graph, _worker_blocks = SharedCSRGraph.attach(spec)
+
+
+def _distance_row(source_id: int) -> np.ndarray:
+    """Pool task: distances from one source as a float64 row."""
+    return find_shortest_paths_csr(_worker_graph, source_id)
+
+
+def _write_distance_row(task: Tuple[int, int, str]) -> int:
+    """Pool task: computes one row and writes it straight into the .npy matrix file."""
+    row, source_id, path = task
+    matrix = np.load(path, mmap_mode="r+")
+    matrix[row] = find_shortest_paths_csr(_worker_graph, source_id)
+    matrix.flush()
+    return row
+
+
+def _source_ids(graph: CSRGraph, sources: Iterable[Any]) -> List[int]:
+    ids = []
+    for source in sources:
+        if source not in graph:
+            raise KeyError(f"Source vertex '{source}' not found in the graph.")
+        ids.append(graph.ids[source])
+    return ids
+
+
+def iter_multi_source_distances(graph: Dict[Any, List[Tuple[Any, float]]], sources: Iterable[Any],
+                                processes: Optional[int] = None,
+                                chunksize: int = 1) -> Iterator[Tuple[Any, np.ndarray]]:
+    """
+    Computes shortest distances from many sources on a process pool.
+
+    The graph is converted to CSR form once and shared with the workers
+    through shared memory; each worker runs find_shortest_paths_csr for
+    its sources and sends back one compact float64 row.
+
+    Parameters:
+        graph (Dict): Adjacency list representation of the graph (or a CSRGraph).
+        sources (Iterable): Source vertices.
+        processes (int): Number of worker processes (default: CPU count).
+        chunksize (int): Sources handed to a worker at a time.
+
+    Yields:
+        Tuple: (source, row) in the order of sources, where row[i] is the
+               distance to the vertex labelled csr.labels[i] of the CSR form
+               (the adjacency dict's key order for dict input).
+
+    Raises:
+        KeyError: If a source vertex is not in the graph.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+    sources = list(sources)
+    source_ids = _source_ids(csr, sources)
+
+    with SharedCSRGraph(csr) as shared, \
+            ProcessPoolExecutor(processes, initializer=_attach_worker, initargs=(shared.spec,)) as pool:
+        yield from zip(sources, pool.map(_distance_row, source_ids, chunksize=chunksize))
+
+
+def distance_matrix_to_memmap(graph: Dict[Any, List[Tuple[Any, float]]], sources: Iterable[Any], path: str,
+                              processes: Optional[int] = None) -> np.memmap:
+    """
+    Computes a sources x vertices distance matrix into a memory-mapped .npy file.
+
+    Workers write their rows directly into the file, so neither the rows
+    nor the matrix pass through the parent process.
+
+    Parameters:
+        graph (Dict): Adjacency list representation of the graph (or a CSRGraph).
+        sources (Iterable): Source vertices, one matrix row each.
+        path (str): Output .npy file; columns follow the CSR vertex order.
+        processes (int): Number of worker processes (default: CPU count).
+
+    Returns:
+        np.memmap: The matrix, opened read-only.
+
+    Raises:
+        KeyError: If a source vertex is not in the graph.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+    source_ids = _source_ids(csr, sources)
+
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(len(source_ids), csr.num_vertices))
+    del matrix
+
+    with SharedCSRGraph(csr) as shared, \
+            ProcessPoolExecutor(processes, initializer=_attach_worker, initargs=(shared.spec,)) as pool:
+        tasks = [(row, source_id, path) for row, source_id in enumerate(source_ids)]
+        for _ in pool.map(_write_distance_row, tasks):
+            pass
+
+    return np.load(path, mmap_mode="r")
+
+
+def benchmark_multi_source(graph: Dict[Any, List[Tuple[Any, float]]], num_sources: int = 64,
+                           process_counts: Iterable[int] = (1, 2, 4), seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    Measures multi-source throughput for several pool sizes against a plain
+    loop over find_shortest_paths_csr, checking that the rows agree.
+
+    Returns:
+        List[Dict]: Sources per second for each number of processes (0 is the serial loop).
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+    rng = random.Random(seed)
+    sources = [rng.choice(csr.labels) for _ in range(num_sources)]
+
+    started = time.perf_counter()
+    expected = [find_shortest_paths_csr(csr, csr.ids[source]) for source in sources]
+    rows = [{"processes": 0, "sources_per_s": num_sources / (time.perf_counter() - started)}]
+
+    for processes in process_counts:
+        started = time.perf_counter()
+        for (_, row), reference in zip(iter_multi_source_distances(csr, sources, processes), expected):
+            if not np.array_equal(row, reference):
+                raise AssertionError("Parallel distances differ from the serial ones.")
+        rows.append({"processes": processes, "sources_per_s": num_sources / (time.perf_counter() - started)})
+
+    print(f"CPU cores available: {os.cpu_count()}")
+    print(f"{'Processes':<12}{'sources/s':>12}")
+    for row in rows:
+        label = "serial" if row["processes"] == 0 else str(row["processes"])
+        print(f"{label:<12}{row['sources_per_s']:>12.1f}")
+    return rows
+
+
+def _relaxation_requests(graph: CSRGraph, distances: np.ndarray, frontier: np.ndarray, delta: float,
+                         light: bool) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gathers the light (weight <= delta) or heavy out-edges of a frontier
+    from the CSR slices in one vectorized pass.
+
+    Returns:
+        Tuple: (targets, candidates) with one entry per target - the best
+               tentative distance - restricted to improvements.
+    """
+    starts = graph.offsets[frontier]
+    lengths = graph.offsets[frontier + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    # Edge positions of all frontier vertices, concatenated
+    positions = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    weights = graph.weights[positions]
+    mask = weights <= delta if light else weights > delta
+    targets = graph.targets[positions][mask]
+    candidates = np.repeat(distances[frontier], lengths)[mask] + weights[mask]
+
+    improving = candidates < distances[targets]
+    targets, candidates = targets[improving], candidates[improving]
+    # Keep the smallest candidate per target
+    order = np.lexsort((candidates, targets))
+    targets, candidates = targets[order], candidates[order]
+    first = np.ones(targets.size, dtype=bool)
+    first[1:] = targets[1:] != targets[:-1]
+    return targets[first], candidates[first]
+
+
+# Tentative distances shared with the delta-stepping pool
+_worker_distances: Optional[np.ndarray] = None
+_worker_distance_block: Optional[shared_memory.SharedMemory] = None
+
+
+def _attach_delta_worker(spec: Tuple[Tuple[str, Tuple[int, ...], str], ...], distance_block: str) -> None:
+    """Pool initializer: maps the shared graph and the shared distance array."""
+    global _worker_distances, _worker_distance_block
+    _attach_worker(spec)
+    _worker_distance_block = shared_memory.SharedMemory(name=distance_block)
+    _worker_distances = np.ndarray(_worker_graph.num_vertices, dtype=np.float64, buffer=_worker_distance_block.buf)
+
+
+def _delta_requests(task: Tuple[np.ndarray, float, bool]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pool task: relaxation requests for one slice of the frontier."""
+    frontier, delta, light = task
+    return _relaxation_requests(_worker_graph, _worker_distances, frontier, delta, light)
+
+
+def default_delta(graph: CSRGraph) -> float:
+    """Bucket width heuristic: the largest edge weight over the average out-degree."""
+    if graph.num_edges == 0:
+        return 1.0
+    average_degree = graph.num_edges / max(graph.num_vertices, 1)
+    return float(graph.weights.max()) / average_degree or 1.0
+
+
+def delta_stepping_csr(graph: CSRGraph, source_id: int, delta: Optional[float] = None, processes: int = 0,
+                       parallel_threshold: int = 65536) -> np.ndarray:
+    """
+    Delta-stepping single-source shortest paths on a CSRGraph.
+
+    Vertices are grouped into buckets of width delta by tentative
+    distance. The lowest non-empty bucket is emptied by relaxing the light
+    edges of all its vertices at once, repeating while relaxations put
+    vertices back into it; the heavy edges of everything removed from the
+    bucket are then relaxed in one batch. Each batch is a vectorized NumPy
+    pass over the CSR slices of the frontier. Improved vertices are filed
+    into their buckets as they change, so a round only touches its own
+    bucket instead of scanning every vertex.
+
+    Parameters:
+        graph (CSRGraph): The graph.
+        source_id (int): Vertex id of the source.
+        delta (float): Bucket width (default: default_delta(graph)). Small
+                       values approach Dijkstra's order, large ones
+                       Bellman-Ford's.
+        processes (int): Worker processes splitting large frontiers (0: none).
+        parallel_threshold (int): Frontier out-edge count from which a
+                                  batch is handed to the workers.
+
+    Returns:
+        np.ndarray: Distances indexed by vertex id (inf when unreachable).
+
+    Raises:
+        ValueError: If delta is not positive.
+    """
+    if delta is None:
+        delta = default_delta(graph)
+    if delta <= 0:
+        raise ValueError(f"delta must be positive, got {delta}.")
+
+    if processes <= 0:
+        distances = np.full(graph.num_vertices, float('inf'))
+        return _delta_stepping(graph, source_id, delta, distances, None, parallel_threshold, 0)
+
+    with SharedCSRGraph(graph) as shared:
+        block = shared_memory.SharedMemory(create=True, size=max(graph.num_vertices * 8, 1))
+        try:
+            distances = np.ndarray(graph.num_vertices, dtype=np.float64, buffer=block.buf)
+            distances[:] = float('inf')
+            with ProcessPoolExecutor(processes, initializer=_attach_delta_worker,
+                                     initargs=(shared.spec, block.name)) as pool:
+                result = _delta_stepping(graph, source_id, delta, distances, pool, parallel_threshold, processes).copy()
+        finally:
+            # The view must go before the block can be closed
+            distances = None
+            block.close()
+            block.unlink()
+    return result
+
+
+def _delta_stepping(graph: CSRGraph, source_id: int, delta: float, distances: np.ndarray,
+                    pool: Optional[ProcessPoolExecutor], parallel_threshold: int, processes: int) -> np.ndarray:
+    offsets = graph.offsets
+    done = np.zeros(graph.num_vertices, dtype=bool)
+    distances[source_id] = 0.0
+    # Bucket index -> batches of vertices filed there; an entry goes stale
+    # when its vertex is settled or moves to a lower bucket
+    buckets: Dict[int, List[np.ndarray]] = {0: [np.array([source_id], dtype=np.int64)]}
+    bucket_queue = [0]
+
+    def bucket_of(vertices: np.ndarray) -> np.ndarray:
+        return np.floor(distances[vertices] / delta).astype(np.int64)
+
+    def relax(frontier: np.ndarray, light: bool) -> np.ndarray:
+        """Applies one batch of relaxations and returns the improved vertices."""
+        if pool is not None and int((offsets[frontier + 1] - offsets[frontier]).sum()) >= parallel_threshold:
+            parts = list(pool.map(_delta_requests, [(chunk, delta, light) for chunk in
+                                                    np.array_split(frontier, processes)]))
+            targets = np.concatenate([part[0] for part in parts])
+            candidates = np.concatenate([part[1] for part in parts])
+        else:
+            targets, candidates = _relaxation_requests(graph, distances, frontier, delta, light)
+        np.minimum.at(distances, targets, candidates)
+        return np.unique(targets)
+
+    def file(vertices: np.ndarray) -> None:
+        """Adds vertices to the buckets of their new tentative distances."""
+        if vertices.size == 0:
+            return
+        keys = bucket_of(vertices)
+        order = np.argsort(keys, kind="stable")
+        keys, vertices = keys[order], vertices[order]
+        unique_keys, starts = np.unique(keys, return_index=True)
+        for key, batch in zip(unique_keys.tolist(), np.split(vertices, starts[1:])):
+            if key not in buckets:
+                buckets[key] = []
+                heapq.heappush(bucket_queue, key)
+            buckets[key].append(batch)
+
+    while bucket_queue:
+        index = heapq.heappop(bucket_queue)
+        entries = np.unique(np.concatenate(buckets.pop(index)))
+        frontier = entries[~done[entries] & (bucket_of(entries) == index)]
+        removed = []
+        while frontier.size:
+            done[frontier] = True
+            removed.append(frontier)
+            improved = relax(frontier, light=True)
+            done[improved] = False
+            # Light edges may refill the current bucket, even with vertices already removed from it
+            refill = bucket_of(improved) == index
+            frontier = improved[refill]
+            file(improved[~refill])
+        if removed:
+            emptied = np.unique(np.concatenate(removed))
+            done[emptied] = True
+            file(relax(emptied, light=False))
+
+    return distances
+
+
+def delta_stepping(graph: Dict[Any, List[Tuple[Any, float]]], source: Any, delta: Optional[float] = None,
+                   processes: int = 0) -> Dict[Any, float]:
+    """
+    Delta-stepping counterpart of find_shortest_paths for one large query.
+
+    Parameters:
+        graph (Dict): Adjacency list representation of the graph (or a CSRGraph).
+        source: The starting vertex.
+        delta (float): Bucket width (default: default_delta of the graph).
+        processes (int): Worker processes splitting large frontiers (0: none).
+
+    Returns:
+        Dict: Shortest distances from the source to every vertex.
+
+    Raises:
+        KeyError: If the source vertex is not in the graph.
+        ValueError: If delta is not positive.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+    if source not in csr:
+        raise KeyError(f"Source vertex '{source}' not found in the graph.")
+    return csr.distances_to_dict(delta_stepping_csr(csr, csr.ids[source], delta, processes))
+
+
+def benchmark_delta_stepping(graph: Dict[Any, List[Tuple[Any, float]]], deltas: Iterable[float],
+                             processes: int = 0, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """
+    Sweeps delta for one source, timing delta-stepping against
+    find_shortest_paths_csr and checking that the distances agree.
+
+    Returns:
+        List[Dict]: Seconds and bucket width per run (delta 0 is the Dijkstra baseline).
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+    source_id = random.Random(seed).randrange(csr.num_vertices)
+
+    started = time.perf_counter()
+    expected = find_shortest_paths_csr(csr, source_id)
+    rows = [{"delta": 0.0, "seconds": time.perf_counter() - started}]
+
+    for delta in deltas:
+        started = time.perf_counter()
+        distances = delta_stepping_csr(csr, source_id, delta, processes)
+        rows.append({"delta": delta, "seconds": time.perf_counter() - started})
+        # Different relaxation orders may round float sums differently
+        if not np.allclose(distances, expected, rtol=1e-12, atol=0.0, equal_nan=False):
+            raise AssertionError(f"Delta-stepping distances differ from Dijkstra's for delta={delta}.")
+
+    print(f"{csr.num_vertices} vertices, {csr.num_edges} edges, default delta {default_delta(csr):.3g}, "
+          f"processes {processes}")
+    print(f"{'Delta':<12}{'Time (ms)':>12}")
+    for row in rows:
+        label = "dijkstra" if row["delta"] == 0 else f"{row['delta']:g}"
+        print(f"{label:<12}{1000 * row['seconds']:>12.1f}")
+    return rows
+
+
+class ShortestPathIndex:
+    """
+    LRU cache of shortest path trees for hot sources, kept correct under
+    edge updates by repairing only the affected part of each tree.
+
+    Parallel edges between two vertices are collapsed to the cheapest one.
+    A cached tree holds distances, parents and children of every vertex
+    reachable from its source; its memory is estimated as
+    TREE_BYTES_PER_VERTEX per reached vertex, and the least recently used
+    trees are evicted once the estimate exceeds the memory budget.
+    """
+
+    TREE_BYTES_PER_VERTEX = 400
+
+    def __init__(self, graph: Dict[Any, List[Tuple[Any, float]]], memory_budget: int = 64 * 2 ** 20):
+        """
+        Parameters:
+            graph (Dict): Adjacency list representation of the graph (or a CSRGraph).
+                          The index keeps its own copy, which update_edge() changes.
+            memory_budget (int): Approximate bytes available for cached trees.
+        """
+        self.out_edges: Dict[Any, Dict[Any, float]] = {}
+        self.in_edges: Dict[Any, Dict[Any, float]] = {}
+        for vertex in graph:
+            self._add_vertex(vertex)
+            for neighbor, weight in graph[vertex]:
+                self._add_vertex(neighbor)
+                if weight < self.out_edges[vertex].get(neighbor, float('inf')):
+                    self.out_edges[vertex][neighbor] = self.in_edges[neighbor][vertex] = weight
+
+        self.memory_budget = memory_budget
+        self.memory_used = 0
+        # source -> (distances, parents, children)
+        self.trees: "OrderedDict[Any, Tuple[Dict[Any, float], Dict[Any, Any], Dict[Any, set]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.repairs = 0
+        self.repaired_vertices = 0
+
+    def _add_vertex(self, vertex: Any) -> None:
+        self.out_edges.setdefault(vertex, {})
+        self.in_edges.setdefault(vertex, {})
+
+    def _tree(self, source: Any) -> Tuple[Dict[Any, float], Dict[Any, Any], Dict[Any, set]]:
+        """Returns the cached tree of a source, computing and caching it on a miss."""
+        tree = self.trees.get(source)
+        if tree is not None:
+            self.hits += 1
+            self.trees.move_to_end(source)
+            return tree
+
+        if source not in self.out_edges:
+            raise KeyError(f"Source vertex '{source}' not found in the graph.")
+        self.misses += 1
+        distances: Dict[Any, float] = {source: 0}
+        parents: Dict[Any, Any] = {source: None}
+        children: Dict[Any, set] = {source: set()}
+        self._propagate(distances, parents, children, [(0, source)])
+
+        tree = (distances, parents, children)
+        self.trees[source] = tree
+        self.memory_used += self._tree_bytes(tree)
+        while self.memory_used > self.memory_budget and len(self.trees) > 1:
+            _, evicted = self.trees.popitem(last=False)
+            self.memory_used -= self._tree_bytes(evicted)
+            self.evictions += 1
+        return tree
+
+    def _tree_bytes(self, tree: Tuple[Dict[Any, float], Dict[Any, Any], Dict[Any, set]]) -> int:
+        return len(tree[0]) * self.TREE_BYTES_PER_VERTEX
+
+    def _propagate(self, distances: Dict[Any, float], parents: Dict[Any, Any], children: Dict[Any, set],
+                   min_heap: List[Tuple[float, Any]]) -> int:
+        """
+        Runs Dijkstra from the queued vertices, improving distances and moving
+        vertices under their new parents. Returns the number of improved vertices.
+        """
+        heapq.heapify(min_heap)
+        improved = 0
+        while min_heap:
+            current_distance, current_vertex = heapq.heappop(min_heap)
+            if current_distance > distances.get(current_vertex, float('inf')):
+                continue
+            for neighbor, weight in self.out_edges[current_vertex].items():
+                new_distance = current_distance + weight
+                if new_distance < distances.get(neighbor, float('inf')):
+                    self._set_parent(parents, children, neighbor, current_vertex)
+                    distances[neighbor] = new_distance
+                    heapq.heappush(min_heap, (new_distance, neighbor))
+                    improved += 1
+        return improved
+
+    @staticmethod
+    def _set_parent(parents: Dict[Any, Any], children: Dict[Any, set], vertex: Any, parent: Any) -> None:
+        old_parent = parents.get(vertex)
+        if old_parent is not None:
+            children[old_parent].discard(vertex)
+        parents[vertex] = parent
+        if parent is not None:
+            children.setdefault(parent, set()).add(vertex)
+        children.setdefault(vertex, set())
+
+    def distances(self, source: Any) -> Mapping[Any, float]:
+        """
+        Returns the read-only distances of all vertices reachable from the source.
+
+        Raises:
+            KeyError: If the source vertex is not in the graph.
+        """
+        return MappingProxyType(self._tree(source)[0])
+
+    def distance(self, source: Any, target: Any) -> float:
+        """Returns the shortest distance from source to target (inf if unreachable)."""
+        return self._tree(source)[0].get(target, float('inf'))
+
+    def path(self, source: Any, target: Any) -> List[Any]:
+        """Returns a shortest path from source to target (empty if unreachable)."""
+        distances, parents, _ = self._tree(source)
+        if target not in distances:
+            return []
+        return _reconstruct_path(parents, target)
+
+    def add_edge(self, u: Any, v: Any, weight: float) -> None:
+        """Adds the edge u -> v (new vertices are created), or replaces its weight."""
+        self._add_vertex(u)
+        self._add_vertex(v)
+        self._change_edge(u, v, weight)
+
+    def update_edge(self, u: Any, v: Any, weight: float) -> None:
+        """
+        Changes the weight of an existing edge u -> v.
+
+        Raises:
+            KeyError: If the edge is not in the graph.
+        """
+        if v not in self.out_edges.get(u, {}):
+            raise KeyError(f"Edge '{u}' -> '{v}' not found in the graph.")
+        self._change_edge(u, v, weight)
+
+    def remove_edge(self, u: Any, v: Any) -> None:
+        """
+        Removes the edge u -> v.
+
+        Raises:
+            KeyError: If the edge is not in the graph.
+        """
+        if v not in self.out_edges.get(u, {}):
+            raise KeyError(f"Edge '{u}' -> '{v}' not found in the graph.")
+        self._change_edge(u, v, None)
+
+    def _change_edge(self, u: Any, v: Any, weight: Optional[float]) -> None:
+        """Applies a new weight (None removes the edge) and repairs every cached tree."""
+        old_weight = self.out_edges[u].get(v)
+        if weight is None:
+            del self.out_edges[u][v]
+            del self.in_edges[v][u]
+        else:
+            self.out_edges[u][v] = self.in_edges[v][u] = weight
+
+        for tree in self.trees.values():
+            if weight is not None and (old_weight is None or weight < old_weight):
+                self._repair_decrease(tree, u, v, weight)
+            elif weight is None or weight > old_weight:
+                self._repair_increase(tree, u, v)
+
+    def _repair_decrease(self, tree: Tuple[Dict[Any, float], Dict[Any, Any], Dict[Any, set]],
+                         u: Any, v: Any, weight: float) -> None:
+        """A cheaper edge can only shorten paths through it: propagate from v."""
+        distances, parents, children = tree
+        new_distance = distances.get(u, float('inf')) + weight
+        if new_distance >= distances.get(v, float('inf')):
+            return
+        self.repairs += 1
+        old_size = len(distances)
+        self._set_parent(parents, children, v, u)
+        distances[v] = new_distance
+        self.repaired_vertices += 1 + self._propagate(distances, parents, children, [(new_distance, v)])
+        self.memory_used += (len(distances) - old_size) * self.TREE_BYTES_PER_VERTEX
+
+    def _repair_increase(self, tree: Tuple[Dict[Any, float], Dict[Any, Any], Dict[Any, set]],
+                         u: Any, v: Any) -> None:
+        """
+        A dearer or removed edge only matters if it is a tree edge; then only
+        the subtree below it can change. Its vertices are detached and
+        re-attached from their cheapest unaffected in-neighbors, and Dijkstra
+        runs inside the subtree.
+        """
+        distances, parents, children = tree
+        if parents.get(v) != u:
+            return
+        self.repairs += 1
+        old_size = len(distances)
+
+        affected = []
+        stack = [v]
+        while stack:
+            vertex = stack.pop()
+            affected.append(vertex)
+            stack.extend(children.get(vertex, ()))
+        affected_set = set(affected)
+        self.repaired_vertices += len(affected)
+
+        for vertex in affected:
+            self._set_parent(parents, children, vertex, None)
+            del parents[vertex]
+            del distances[vertex]
+
+        min_heap = []
+        for vertex in affected:
+            best_distance, best_parent = float('inf'), None
+            for neighbor, weight in self.in_edges[vertex].items():
+                if neighbor not in affected_set and neighbor in distances:
+                    candidate = distances[neighbor] + weight
+                    if candidate < best_distance:
+                        best_distance, best_parent = candidate, neighbor
+            if best_parent is not None:
+                self._set_parent(parents, children, vertex, best_parent)
+                distances[vertex] = best_distance
+                min_heap.append((best_distance, vertex))
+
+        self._propagate(distances, parents, children, min_heap)
+        # Vertices that stayed unreachable are dropped from the tree
+        for vertex in affected:
+            if vertex not in distances:
+                children.pop(vertex, None)
+        self.memory_used += (len(distances) - old_size) * self.TREE_BYTES_PER_VERTEX
+
+    def stats(self) -> Dict[str, int]:
+        """Returns cache and repair counters."""
+        return {
+            "cached_sources": len(self.trees),
+            "memory_used": self.memory_used,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "repairs": self.repairs,
+            "repaired_vertices": self.repaired_vertices,
+        }
+
+
+def shortest_path_tree_csr(graph: CSRGraph, source_id: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dijkstra's algorithm on a CSRGraph that also records the shortest path tree.
+
+    Returns:
+        Tuple: (distances, predecessors) arrays indexed by vertex id; the
+               predecessor of the source and of unreachable vertices is -1.
+    """
+    offsets, targets, weights = (memoryview(array).cast("B").cast(array.dtype.char)
+                                 for array in (graph.offsets, graph.targets, graph.weights))
+    shortest_distances = [float('inf')] * graph.num_vertices
+    predecessors = [-1] * graph.num_vertices
+    shortest_distances[source_id] = 0.0
+    min_heap: List[Tuple[float, int]] = [(0.0, source_id)]
+
+    while min_heap:
+        current_distance, current_vertex = heapq.heappop(min_heap)
+        if current_distance > shortest_distances[current_vertex]:
+            continue
+        start, end = offsets[current_vertex], offsets[current_vertex + 1]
+        for neighbor, weight in zip(targets[start:end].tolist(), weights[start:end].tolist()):
+            new_distance = current_distance + weight
+            if new_distance < shortest_distances[neighbor]:
+                shortest_distances[neighbor] = new_distance
+                predecessors[neighbor] = current_vertex
+                heapq.heappush(min_heap, (new_distance, neighbor))
+
+    return np.array(shortest_distances), np.array(predecessors, dtype=np.int64)
+
+
+def _tree_rows(source_id: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Pool task: shortest path tree of one source on the shared worker graph."""
+    return shortest_path_tree_csr(_worker_graph, source_id)
+
+
+class RoutingServer:
+    """
+    Asyncio routing service speaking a JSON-lines protocol.
+
+    Each request line is {"id": ..., "source": ..., "target": ...}; the
+    response line carries the same id with "distance" and "path", or with
+    "distances" when no target is given, or an "error". Responses may
+    arrive out of order.
+
+    Concurrent requests for the same source share one Dijkstra run, which
+    executes in a worker process pool that maps the graph from shared
+    memory. At most max_pending requests are in flight; beyond that the
+    server stops reading from clients until a slot frees up.
+    """
+
+    def __init__(self, graph: Dict[Any, List[Tuple[Any, float]]], workers: Optional[int] = None,
+                 max_pending: int = 256):
+        self.graph = graph if isinstance(graph, CSRGraph) else CSRGraph.from_adjacency(graph)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.shared: Optional[SharedCSRGraph] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.running: Dict[int, "asyncio.Future[Tuple[np.ndarray, np.ndarray]]"] = {}
+        self.requests = 0
+        self.computations = 0
+
+    async def __aenter__(self) -> "RoutingServer":
+        self.shared = SharedCSRGraph(self.graph)
+        self.executor = ProcessPoolExecutor(self.workers, initializer=_attach_worker, initargs=(self.shared.spec,))
+        self.slots = asyncio.Semaphore(self.max_pending)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.executor.shutdown()
+        self.shared.close()
+
+    def _vertex_id(self, label: Any) -> int:
+        # JSON has no tuples: list labels stand for tuple labels
+        label = tuple(label) if isinstance(label, list) else label
+        try:
+            known = label in self.graph
+        except TypeError:
+            raise ValueError(f"Vertex label must be a scalar or a list of scalars, got {json.dumps(label)}.") from None
+        if not known:
+            raise KeyError(f"Vertex '{label}' not found in the graph.")
+        return self.graph.ids[label]
+
+    async def _tree(self, source_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the shortest path tree of a source, joining a run already in progress."""
+        future = self.running.get(source_id)
+        if future is None:
+            self.computations += 1
+            future = asyncio.get_running_loop().run_in_executor(self.executor, _tree_rows, source_id)
+            self.running[source_id] = future
+            future.add_done_callback(lambda _: self.running.pop(source_id, None))
+        return await future
+
+    async def query(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answers one decoded request."""
+        response: Dict[str, Any] = {"id": request.get("id")}
+        try:
+            if "source" not in request:
+                raise KeyError("Request has no 'source'.")
+            source_id = self._vertex_id(request["source"])
+            target = request.get("target")
+            target_id = None if target is None else self._vertex_id(target)
+        except (KeyError, ValueError) as e:
+            response["error"] = e.args[0]
+            return response
+
+        self.requests += 1
+        distances, predecessors = await self._tree(source_id)
+        labels = self.graph.labels
+        if target_id is None:
+            response["distances"] = {str(labels[vertex]): distance for vertex, distance in
+                                     enumerate(distances.tolist()) if distance != float('inf')}
+            return response
+
+        distance = float(distances[target_id])
+        path = []
+        if distance != float('inf'):
+            vertex = target_id
+            while vertex != -1:
+                path.append(labels[vertex])
+                vertex = int(predecessors[vertex])
+            path.reverse()
+        response["distance"] = distance if distance != float('inf') else None
+        response["path"] = path
+        return response
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+            except ValueError as e:
+                response: Dict[str, Any] = {"id": None, "error": f"Invalid request: {e}"}
+            else:
+                try:
+                    response = await self.query(request)
+                except Exception as e:
+                    # Every request gets a reply, or pipelined clients would wait for its id forever
+                    response = {"id": request.get("id"), "error": f"Internal error: {type(e).__name__}: {e}"}
+            async with write_lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            self.slots.release()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one client until it closes its side of the stream."""
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                # Backpressure: do not read more requests than there are free slots
+                await self.slots.acquire()
+                line = await reader.readline()
+                if not line:
+                    self.slots.release()
+                    break
+                if not line.strip():
+                    self.slots.release()
+                    continue
+                task = asyncio.create_task(self._answer(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve_unix(self, path: str) -> None:
+        """Serves clients on a Unix domain socket until cancelled."""
+        server = await asyncio.start_unix_server(self.handle_connection, path=path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """Serves clients on a local TCP port until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self) -> None:
+        """Serves a single client over stdin/stdout."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        await self.handle_connection(reader, writer)
+
+
+async def run_load_generator(sources: List[Any], targets: List[Any], num_requests: int = 1000,
+                             concurrency: int = 64, socket_path: Optional[str] = None,
+                             host: str = "127.0.0.1", port: int = 8765,
+                             seed: Optional[int] = None) -> Dict[str, float]:
+    """
+    Sends point-to-point queries to a RoutingServer and reports latency.
+
+    Requests are pipelined on one connection with at most concurrency
+    outstanding; sources are drawn from the given list, so a short list
+    exercises the server's coalescing of shared sources.
+
+    Returns:
+        Dict: Requests per second and p50/p99 latency in milliseconds.
+    """
+    if socket_path:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    rng = random.Random(seed)
+    waiting: Dict[int, "asyncio.Future[Dict[str, Any]]"] = {}
+    outstanding = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def receive() -> None:
+        while waiting or not sending_done.is_set():
+            line = await reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            waiting.pop(response["id"]).set_result(response)
+
+    async def send_one(request_id: int) -> None:
+        nonlocal errors
+        request = {"id": request_id, "source": rng.choice(sources), "target": rng.choice(targets)}
+        future = asyncio.get_running_loop().create_future()
+        waiting[request_id] = future
+        started = time.perf_counter()
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+        response = await future
+        latencies.append(time.perf_counter() - started)
+        errors += "error" in response
+        outstanding.release()
+
+    sending_done = asyncio.Event()
+    receiver = asyncio.create_task(receive())
+    started = time.perf_counter()
+    senders = []
+    for request_id in range(num_requests):
+        await outstanding.acquire()
+        senders.append(asyncio.create_task(send_one(request_id)))
+    sending_done.set()
+    await asyncio.gather(*senders)
+    elapsed = time.perf_counter() - started
+    receiver.cancel()
+    writer.close()
+
+    latencies.sort()
+    report = {
+        "requests_per_s": num_requests / elapsed,
+        "p50_ms": 1000 * latencies[len(latencies) // 2],
+        "p99_ms": 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "errors": errors,
+    }
+    print(f"{num_requests} requests, concurrency {concurrency}: {report['requests_per_s']:.0f} req/s, "
+          f"p50 {report['p50_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms, errors {errors}")
+    return report
+
+
+def demo() -> None:
+    """Runs the examples on a small sample graph."""
+    # Graph Example
+    weighted_graph = {
+        'S': [('A', 7), ('B', 2)],
+        'A': [('S', 7), ('B', 3), ('C', 4)],
+        'B': [('S', 2), ('A', 3), ('D', 5)],
+        'C': [('A', 4), ('D', 1), ('E', 7)],
+        'D': [('B', 5), ('C', 1), ('E', 2)],
+        'E': [('C', 7), ('D', 2)]
+    }
+
+    # Define the source node for Dijkstra's algorithm
+    # All shortest paths will be computed from this node
+    source_node = 'S'
+
+    try:
+        shortest_paths = find_shortest_paths(weighted_graph, source_node)
+        print(f"Shortest paths from '{source_node}':")
+        for vertex, distance in shortest_paths.items():
+            print(f"  to {vertex}: {distance}")
+    except KeyError as e:
+        print(f"Error: {e}")
+
+    # The same search on the compressed sparse row representation
+    csr_graph = CSRGraph.from_adjacency(weighted_graph)
+    csr_paths = find_shortest_paths(csr_graph, source_node)
+    print(f"CSR backend matches: {csr_paths == shortest_paths}")
+
+    # Point-to-point route with early exit and path reconstruction
+    route = shortest_path(weighted_graph, 'S', 'E', bidirectional=True, reversed_graph=weighted_graph)
+    print(f"Route S -> E: {' -> '.join(route.path)} (distance {route.distance}, {route.settled} vertices settled)")
+
+    # Cached shortest path tree repaired after a traffic update
+    index = ShortestPathIndex(weighted_graph)
+    print(f"Cached S -> E: {index.distance('S', 'E')} via {index.path('S', 'E')}")
+    index.update_edge('D', 'E', 10)
+    print(f"After D -> E becomes 10: {index.distance('S', 'E')} via {index.path('S', 'E')}")
+    print(f"Index stats: {index.stats()}")
+
+
+async def _serve(graph: CSRGraph, args: argparse.Namespace) -> None:
+    async with RoutingServer(graph, args.workers, args.max_pending) as server:
+        if args.stdio:
+            await server.serve_stdio()
+        elif args.socket:
+            await server.serve_unix(args.socket)
+        else:
+            await server.serve_tcp(port=args.port)
+
+
+def main() -> None:
+    """Runs the demo, a benchmark, or the routing server."""
+    parser = argparse.ArgumentParser(description="Dijkstra's algorithm and shortest path tools.")
+    commands = parser.add_subparsers(dest="command")
+
+    bench_alt = commands.add_parser("bench-alt", help="compare Dijkstra, A* and ALT on a grid graph")
+    bench_alt.add_argument("--size", type=int, default=100, help="grid side length")
+    bench_alt.add_argument("--queries", type=int, default=50)
+    bench_alt.add_argument("--landmarks", type=int, default=8)
+    bench_alt.add_argument("--seed", type=int, default=1)
+
+    bench_ch = commands.add_parser("bench-ch", help="build and time a contraction hierarchy on a grid graph")
+    bench_ch.add_argument("--size", type=int, default=60, help="grid side length")
+    bench_ch.add_argument("--queries", type=int, default=200)
+    bench_ch.add_argument("--index", default="ch_index.npz", help="where to write the index")
+    bench_ch.add_argument("--seed", type=int, default=1)
+
+    bench_queues = commands.add_parser("bench-queues", help="compare priority queues on a random dense graph")
+    bench_queues.add_argument("--vertices", type=int, default=2000)
+    bench_queues.add_argument("--degree", type=int, default=50, help="out-edges per vertex")
+    bench_queues.add_argument("--max-weight", type=int, default=100)
+    bench_queues.add_argument("--seed", type=int, default=1)
+
+    bench_parallel = commands.add_parser("bench-parallel", help="multi-source throughput on a process pool")
+    bench_parallel.add_argument("--size", type=int, default=100, help="grid side length")
+    bench_parallel.add_argument("--sources", type=int, default=64)
+    bench_parallel.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    bench_parallel.add_argument("--seed", type=int, default=1)
+
+    bench_delta = commands.add_parser("bench-delta", help="sweep delta-stepping bucket widths on one source")
+    bench_delta.add_argument("--size", type=int, default=300, help="grid side length")
+    bench_delta.add_argument("--deltas", type=float, nargs="+", default=[1, 2, 5, 10, 20, 50])
+    bench_delta.add_argument("--processes", type=int, default=0, help="worker processes for large frontiers")
+    bench_delta.add_argument("--seed", type=int, default=1)
+
+    for name, help_text in (("serve", "run the asyncio routing server"),
+                            ("loadgen", "send load to a running server and report latency")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--graph", help="CSR graph file written by CSRGraph.save (default: a grid graph)")
+        command.add_argument("--size", type=int, default=100, help="grid side length when no --graph is given")
+        command.add_argument("--socket", help="Unix socket path (default: TCP)")
+        command.add_argument("--port", type=int, default=8765, help="local TCP port")
+        if name == "serve":
+            command.add_argument("--stdio", action="store_true", help="speak JSON lines on stdin/stdout")
+            command.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+            command.add_argument("--max-pending", type=int, default=256, help="requests in flight before backpressure")
+        else:
+            command.add_argument("--requests", type=int, default=1000)
+            command.add_argument("--concurrency", type=int, default=64)
+            command.add_argument("--hot-sources", type=int, default=16, help="distinct sources to query")
+            command.add_argument("--seed", type=int, default=1)
+
+    args = parser.parse_args()
+    if args.command in ("serve", "loadgen"):
+        graph = CSRGraph.load(args.graph) if args.graph else CSRGraph.from_adjacency(make_grid_graph(args.size, args.size, seed=1)[0])
+        if args.command == "serve":
+            asyncio.run(_serve(graph, args))
+        else:
+            rng = random.Random(args.seed)
+            # JSON turns tuple labels into lists
+            labels = [list(label) if isinstance(label, tuple) else label for label in graph.labels]
+            asyncio.run(run_load_generator(rng.sample(labels, min(args.hot_sources, len(labels))), labels,
+                                           args.requests, args.concurrency, args.socket, port=args.port,
+                                           seed=args.seed))
+    elif args.command == "bench-parallel":
+        graph, _ = make_grid_graph(args.size, args.size, seed=args.seed)
+        benchmark_multi_source(graph, args.sources, args.processes, seed=args.seed)
+    elif args.command == "bench-delta":
+        graph, _ = make_grid_graph(args.size, args.size, seed=args.seed)
+        benchmark_delta_stepping(graph, args.deltas, args.processes, seed=args.seed)
+    elif args.command == "bench-queues":
+        rng = random.Random(args.seed)
+        graph = {vertex: [(rng.randrange(args.vertices), rng.randint(0, args.max_weight))
+                          for _ in range(args.degree)] for vertex in range(args.vertices)}
+        compare_priority_queues(graph, 0)
+    elif args.command == "bench-alt":
+        graph, coordinates = make_grid_graph(args.size, args.size, seed=args.seed)
+        benchmark_goal_directed(graph, coordinates, args.queries, args.landmarks, seed=args.seed)
+    elif args.command == "bench-ch":
+        graph, _ = make_grid_graph(args.size, args.size, seed=args.seed)
+        benchmark_contraction_hierarchy(graph, args.queries, seed=args.seed, index_path=args.index)
+    else:
+        demo()
+
+
+# Usage
+if __name__ == "__main__":
+    main()
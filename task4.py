@@ -1,100 +1,838 @@
-import uuid
 import heapq
+import random
+import shutil
+import argparse
+import itertools
+import subprocess
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
-from typing import List, Optional, Dict, Any, Tuple
+from pathlib import Path
+from functools import lru_cache
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.transforms import Bbox
+from matplotlib.colors import to_rgba_array
+from typing import List, Optional, Dict, Any, Tuple, Sequence, Iterable, Iterator, NamedTuple
 
 """
 Task 4: Binary Heap Visualization
 """
 
+# Cheap unique ids for drawing linked trees
+_node_ids = itertools.count()
+
 class Node:
     """Class representing a node in a binary tree."""
+    __slots__ = ("left", "right", "val", "color", "id")
+
     def __init__(self, key, color="skyblue"):
         self.left: Optional[Node] = None
         self.right: Optional[Node] = None
         self.val = key
         self.color = color
-        self.id = str(uuid.uuid4())
+        self.id = next(_node_ids)
+
+@lru_cache(maxsize=16)
+def heap_layout(size: int) -> np.ndarray:
+    """
+    Computes the tree layout of a heap with the given number of elements.
+
+    The position of a node in a complete binary tree depends only on its
+    array index i: at depth d = floor(log2(i + 1)) and offset p = i + 1 - 2^d
+    within its level it sits at x = (2p + 1) / 2^d - 1, y = -d. This is the
+    same picture add_edges draws, computed for all indices at once and
+    cached by size.
+
+    Args:
+        size: Number of elements in the heap.
+
+    Returns:
+        Read-only (size, 2) array of (x, y) positions indexed like the heap array.
+    """
+    index = np.arange(1, size + 1, dtype=np.int64)
+    # frexp gives index = m * 2^e with 0.5 <= m < 1, exactly for indices below 2^53
+    depth = np.frexp(index)[1].astype(np.int64) - 1
+    level_start = np.left_shift(1, depth)
+    positions = np.empty((size, 2))
+    positions[:, 0] = (2 * (index - level_start) + 1) / level_start - 1
+    positions[:, 1] = -depth
+    positions.flags.writeable = False
+    return positions
+
+@lru_cache(maxsize=16)
+def heap_edges(size: int) -> np.ndarray:
+    """
+    Lists the parent-child edges of a heap with the given number of elements.
+
+    Args:
+        size: Number of elements in the heap.
+
+    Returns:
+        Read-only (size - 1, 2) array of (parent, child) index pairs.
+    """
+    children = np.arange(1, max(size, 1), dtype=np.int64)
+    edges = np.column_stack(((children - 1) // 2, children))
+    edges.flags.writeable = False
+    return edges
+
+def heap_to_graph(heap_array: Sequence[Any], colors: Optional[Sequence[str]] = None,
+                  default_color: str = "skyblue") -> Tuple[nx.DiGraph, Dict[int, Tuple[float, float]]]:
+    """
+    Builds a networkx graph straight from a heap array, keyed by array index.
 
-def add_edges(graph: nx.DiGraph, node: Optional[Node], pos: Dict[str, Tuple[float, float]], x: float = 0, y: float = 0, layer: int = 1) -> None:
+    Args:
+        heap_array: List representation of the heap.
+        colors: Optional color per index.
+        default_color: Color used when colors is not given.
+
+    Returns:
+        The graph and its positions for plotting.
+    """
+    size = len(heap_array)
+    graph = nx.DiGraph()
+    if colors is None:
+        colors = [default_color] * size
+    graph.add_nodes_from((i, {"color": color, "label": value})
+                         for i, (value, color) in enumerate(zip(heap_array, colors)))
+    graph.add_edges_from(heap_edges(size).tolist())
+    pos = dict(enumerate(map(tuple, heap_layout(size).tolist())))
+    return graph, pos
+
+def add_edges(graph: nx.DiGraph, node: Optional[Node], pos: Dict[Any, Tuple[float, float]], x: float = 0, y: float = 0, layer: int = 1) -> None:
     """
-    Recursively adds nodes and edges to a networkx graph based on the binary tree structure.
+    Adds nodes and edges to a networkx graph based on the binary tree structure.
+
+    Walks the tree with an explicit stack, so deep trees do not hit the
+    recursion limit.
 
     Args:
         graph: The directed graph to populate.
-        node: The current node being processed.
+        node: The root of the (sub)tree being processed.
         pos: A dictionary storing positions for each node (used in plotting).
         x, y: The position coordinates of the current node.
         layer: The current depth level in the tree.
     """
-    if node is not None:
+    stack = [(node, x, y, layer)] if node is not None else []
+    while stack:
+        node, x, y, layer = stack.pop()
         graph.add_node(node.id, color=node.color, label=node.val)
-        if node.left:
-            graph.add_edge(node.id, node.left.id)
-            left_x = x - 1 / 2 ** layer
-            pos[node.left.id] = (left_x, y - 1)
-            add_edges(graph, node.left, pos, x=left_x, y=y - 1, layer=layer + 1)
-        if node.right:
-            graph.add_edge(node.id, node.right.id)
-            right_x = x + 1 / 2 ** layer
-            pos[node.right.id] = (right_x, y - 1)
-            add_edges(graph, node.right, pos, x=right_x, y=y - 1, layer=layer + 1)
+        for child, child_x in ((node.right, x + 1 / 2 ** layer), (node.left, x - 1 / 2 ** layer)):
+            if child:
+                graph.add_edge(node.id, child.id)
+                pos[child.id] = (child_x, y - 1)
+                stack.append((child, child_x, y - 1, layer + 1))
+
+# Level of detail: levels whose nodes would be closer than this are collapsed
+MIN_NODE_SPACING_PX = 4
+# Labels are drawn for at most this many visible nodes, spaced at least this far apart
+LABEL_MAX_NODES = 200
+LABEL_MIN_SPACING_PX = 24
+LABEL_CHAR_WIDTH_PX = 9
+# Largest node marker in points^2, the node_size nx.draw was given
+MAX_NODE_SIZE = 2500
+
+class TreeRenderer:
+    """
+    Draws a binary tree with one LineCollection for the edges and one
+    scatter for the nodes instead of an artist per node.
+
+    Positions follow add_edges: depth d sits at y = -d and the nodes of
+    level d are 2 / 2^d apart on x. The drawing is refreshed whenever the
+    x-limits change: levels whose nodes would be closer than
+    MIN_NODE_SPACING_PX are collapsed into one stub per subtree, nodes
+    outside the view are skipped, and labels are only drawn when they fit.
+    Without axes, the renderer draws on its own Agg figure, for batch
+    export without a display.
+    """
+
+    def __init__(self, x: Sequence[float], depth: Sequence[int], parent: Sequence[int], labels: Sequence[Any],
+                 colors: Sequence[str], axes=None, size: Tuple[int, int] = (1200, 700), dpi: int = 100,
+                 title: str = "", levels: Optional[int] = None):
+        """
+        Args:
+            x: Horizontal position of every node.
+            depth: Depth of every node (the root is 0).
+            parent: Index of every node's parent, -1 for the root.
+            labels: Label of every node.
+            colors: Color of every node.
+            axes: Matplotlib axes to draw on (default: a new headless figure).
+            size: Figure size in pixels when axes is not given.
+            dpi: Figure resolution when axes is not given.
+            title: Plot title.
+            levels: Number of levels to make room for (default: the depth of the tree plus one).
+        """
+        self.x = np.asarray(x, dtype=float)
+        self.depth = np.asarray(depth, dtype=np.int64)
+        self.parent = np.asarray(parent, dtype=np.int64)
+        self.labels = list(labels)
+        # An (N, 3) or (N, 4) RGB(A) array is kept as is and indexed directly
+        self.colors = colors if isinstance(colors, np.ndarray) else list(colors)
+        self.max_depth = int(self.depth.max()) if self.depth.size else 0
+        if levels is not None:
+            self.max_depth = max(self.max_depth, levels - 1)
+        self.has_children = np.zeros(self.x.size, dtype=bool)
+        self.has_children[self.parent[self.parent >= 0]] = True
+
+        if axes is None:
+            figure = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi)
+            FigureCanvasAgg(figure)
+            axes = figure.add_axes((0.02, 0.02, 0.96, 0.9))
+        self.axes = axes
+        self.figure = axes.figure
+        axes.set_title(title)
+        axes.axis("off")
+        axes.set_xlim(-1, 1)
+        axes.set_ylim(-self.max_depth - 0.5, 0.5)
+
+        self.edges = LineCollection([], colors="gray", linewidths=1.0, zorder=1)
+        self.stubs = LineCollection([], colors="lightgray", linewidths=3.0, zorder=1)
+        axes.add_collection(self.edges)
+        axes.add_collection(self.stubs)
+        self.nodes = axes.scatter([], [], zorder=2)
+        self.texts: List[Any] = []
+        self.visible = np.empty(0, dtype=np.int64)
+        self.update_view()
+        axes.callbacks.connect("xlim_changed", lambda _: self.update_view())
+
+    @classmethod
+    def from_heap(cls, heap_array: Sequence[Any], colors: Optional[Sequence[str]] = None,
+                  default_color: str = "skyblue", **kwargs) -> "TreeRenderer":
+        """Renderer for a heap array, laid out with heap_layout."""
+        size = len(heap_array)
+        layout = heap_layout(size)
+        # (0 - 1) // 2 == -1 marks the root
+        parent = (np.arange(size) - 1) // 2
+        if colors is None:
+            colors = [default_color] * size
+        return cls(layout[:, 0], -layout[:, 1], parent, heap_array, colors, **kwargs)
+
+    @classmethod
+    def from_tree(cls, root: Optional[Node], **kwargs) -> "TreeRenderer":
+        """Renderer for a linked tree, with the positions add_edges assigns."""
+        x, depth, parent, labels, colors = [], [], [], [], []
+        level = [(root, 0.0, -1)] if root is not None else []
+        while level:
+            next_level = []
+            for node, node_x, parent_index in level:
+                index = len(x)
+                layer = (depth[parent_index] + 1) if parent_index >= 0 else 0
+                x.append(node_x)
+                depth.append(layer)
+                parent.append(parent_index)
+                labels.append(node.val)
+                colors.append(node.color)
+                offset = 1 / 2 ** (layer + 1)
+                if node.left:
+                    next_level.append((node.left, node_x - offset, index))
+                if node.right:
+                    next_level.append((node.right, node_x + offset, index))
+            level = next_level
+        return cls(x, depth, parent, labels, colors, **kwargs)
+
+    def update_view(self) -> None:
+        """Redraws the part of the tree inside the current x-limits at a fitting level of detail."""
+        xmin, xmax = self.axes.get_xlim()
+        box = self.axes.get_window_extent()
+        px_per_unit = box.width / (xmax - xmin)
+        # Nodes of level d are 2 / 2^d apart; keep the levels where that is enough pixels
+        cutoff = int(np.floor(np.log2(max(2 * px_per_unit / MIN_NODE_SPACING_PX, 1))))
+        cutoff = min(cutoff, self.max_depth)
+        spacing_px = 2 * px_per_unit / 2 ** cutoff
+        margin = 2 / 2 ** cutoff
+
+        shown = self.depth <= cutoff
+        visible = np.flatnonzero(shown & (self.x >= xmin - margin) & (self.x <= xmax + margin))
+
+        children = np.flatnonzero(shown & (self.parent >= 0))
+        parent_x = self.x[self.parent[children]]
+        child_x = self.x[children]
+        overlapping = (np.maximum(parent_x, child_x) >= xmin) & (np.minimum(parent_x, child_x) <= xmax)
+        children = children[overlapping]
+        segments = np.empty((children.size, 2, 2))
+        segments[:, 0, 0] = parent_x[overlapping]
+        segments[:, 0, 1] = 1 - self.depth[children]
+        segments[:, 1, 0] = child_x[overlapping]
+        segments[:, 1, 1] = -self.depth[children]
+        self.edges.set_segments(segments)
+
+        collapsed = visible[(self.depth[visible] == cutoff) & self.has_children[visible]]
+        stubs = np.empty((collapsed.size, 2, 2))
+        stubs[:, :, 0] = self.x[collapsed, None]
+        stubs[:, 0, 1] = -cutoff
+        stubs[:, 1, 1] = -self.max_depth
+        self.stubs.set_segments(stubs)
+
+        self.nodes.set_offsets(np.column_stack((self.x[visible], -self.depth[visible])))
+        if isinstance(self.colors, np.ndarray):
+            self.nodes.set_facecolors(self.colors[visible])
+        else:
+            self.nodes.set_facecolors([self.colors[i] for i in visible.tolist()])
+        level_height_px = box.height / (self.max_depth + 1)
+        diameter = 0.8 * min(spacing_px, level_height_px) * 72 / self.figure.dpi
+        self.nodes.set_sizes([min(diameter ** 2, MAX_NODE_SIZE)])
+
+        self.spacing_px = spacing_px
+        self.level_height_px = level_height_px
+        self.visible = visible
+        self.cutoff = cutoff
+
+        for text in self.texts:
+            text.remove()
+        self.texts = []
+        texts = [str(self.labels[i]) for i in visible.tolist()] if visible.size <= LABEL_MAX_NODES else []
+        if self.labels_fit(visible.size, texts):
+            self.texts = [self.axes.text(self.x[i], -self.depth[i], text, ha="center", va="center", zorder=3)
+                          for i, text in zip(visible.tolist(), texts)]
+
+    def labels_fit(self, count: int, texts: Iterable[str]) -> bool:
+        """
+        Tells whether count labels, as wide as the widest of texts, fit at
+        the current level of detail.
+        """
+        if count > LABEL_MAX_NODES or min(self.spacing_px, self.level_height_px) < LABEL_MIN_SPACING_PX:
+            return False
+        return self.spacing_px >= LABEL_CHAR_WIDTH_PX * max(map(len, texts), default=0)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the figure to a PNG or SVG file.
+
+        Raises:
+            ValueError: If the file extension is neither .svg nor .png.
+        """
+        suffix = Path(path).suffix.lower()
+        if suffix not in (".svg", ".png"):
+            raise ValueError(f"Unsupported output format '{suffix}', expected .svg or .png.")
+        self.figure.savefig(path, facecolor="white")
+
+def export_heap(heap_array: Sequence[Any], path: str, colors: Optional[Sequence[str]] = None,
+                title: str = "Binary Heap Tree Visualization", size: Tuple[int, int] = (1200, 700)) -> None:
+    """
+    Renders a heap array to a PNG or SVG file without a display.
+
+    Args:
+        heap_array: List representation of the heap.
+        path: Output file path (.png or .svg).
+        colors: Optional color per index (default: skyblue).
+        title: Plot title.
+        size: Image size in pixels (width, height).
+    """
+    TreeRenderer.from_heap(heap_array, colors, title=title, size=size).save(path)
+
+def export_tree(tree_root: Optional[Node], path: str, title: str = "", size: Tuple[int, int] = (1200, 700)) -> None:
+    """
+    Renders a linked binary tree to a PNG or SVG file without a display.
+
+    Args:
+        tree_root: The root node of the tree to draw.
+        path: Output file path (.png or .svg).
+        title: Plot title.
+        size: Image size in pixels (width, height).
+    """
+    TreeRenderer.from_tree(tree_root, title=title, size=size).save(path)
+
+class HeapStep(NamedTuple):
+    """One recorded change of a heap array: ("swap", i, j), ("push", i, value=item) or ("pop", i)."""
+    kind: str
+    i: int
+    j: int = -1
+    value: Any = None
+
+def _record_siftdown(heap: List[Any], startpos: int, pos: int, steps: List[HeapStep]) -> None:
+    """heapq's _siftdown, moving the new item up towards startpos by swaps."""
+    while pos > startpos:
+        parentpos = (pos - 1) >> 1
+        if heap[pos] < heap[parentpos]:
+            heap[pos], heap[parentpos] = heap[parentpos], heap[pos]
+            steps.append(HeapStep("swap", parentpos, pos))
+            pos = parentpos
+            continue
+        break
+
+def _record_siftup(heap: List[Any], pos: int, steps: List[HeapStep]) -> None:
+    """heapq's _siftup: swap the item down along smaller children to a leaf, then back up."""
+    endpos = len(heap)
+    startpos = pos
+    childpos = 2 * pos + 1
+    while childpos < endpos:
+        rightpos = childpos + 1
+        if rightpos < endpos and not heap[childpos] < heap[rightpos]:
+            childpos = rightpos
+        heap[pos], heap[childpos] = heap[childpos], heap[pos]
+        steps.append(HeapStep("swap", pos, childpos))
+        pos = childpos
+        childpos = 2 * pos + 1
+    _record_siftdown(heap, startpos, pos, steps)
+
+def record_heappush(heap: List[Any], item: Any) -> List[HeapStep]:
+    """
+    heapq.heappush that also records every change it makes.
+
+    Args:
+        heap: The heap list, modified in place.
+        item: Item to push.
+
+    Returns:
+        The recorded steps.
+    """
+    heap.append(item)
+    steps = [HeapStep("push", len(heap) - 1, value=item)]
+    _record_siftdown(heap, 0, len(heap) - 1, steps)
+    return steps
+
+def record_heappop(heap: List[Any]) -> Tuple[Any, List[HeapStep]]:
+    """
+    heapq.heappop that also records every change it makes.
+
+    The last item is swapped into the root and removed before sifting,
+    which leaves the list exactly as heapq.heappop does.
+
+    Args:
+        heap: The heap list, modified in place.
+
+    Returns:
+        The smallest item and the recorded steps.
+
+    Raises:
+        IndexError: If the heap is empty.
+    """
+    if not heap:
+        raise IndexError("pop from empty heap")
+    last = len(heap) - 1
+    steps = [HeapStep("swap", 0, last)] if last else []
+    heap[0], heap[last] = heap[last], heap[0]
+    item = heap.pop()
+    steps.append(HeapStep("pop", last))
+    if heap:
+        _record_siftup(heap, 0, steps)
+    return item, steps
+
+def record_heapify(heap: List[Any]) -> List[HeapStep]:
+    """
+    heapq.heapify that also records every change it makes.
+
+    Args:
+        heap: The list to turn into a heap in place.
+
+    Returns:
+        The recorded steps.
+    """
+    steps: List[HeapStep] = []
+    for i in reversed(range(len(heap) // 2)):
+        _record_siftup(heap, i, steps)
+    return steps
+
+class HeapAnimator:
+    """
+    Replays recorded heap steps as animation frames.
+
+    The whole tree is drawn once. Each step then redraws only the nodes it
+    touched (and the edge of a node that appears or disappears) onto the
+    persistent canvas with draw_artist, and highlights them on a patch that
+    is restored before the next step, blitting-style. The drawing work per
+    frame therefore depends on the number of swaps, not on the heap size.
+    Nodes hidden by the renderer's level of detail are not drawn.
+    """
+
+    def __init__(self, heap_array: Sequence[Any], capacity: Optional[int] = None, size: Tuple[int, int] = (900, 600),
+                 dpi: int = 100, title: str = "Heap operations", color: str = "skyblue", highlight: str = "orange",
+                 pushed: Iterable[Any] = ()):
+        """
+        Args:
+            heap_array: Heap contents before the first step (copied).
+            capacity: Largest size the heap reaches, so that the canvas has room for pushed nodes.
+            size: Frame size in pixels (width, height).
+            dpi: Frame resolution.
+            title: Plot title.
+            color: Node color.
+            highlight: Ring color of the nodes changed by the current step.
+            pushed: Values the steps will push, so that label widths account for them.
+        """
+        self.values = list(heap_array)
+        self.color = color
+        self.highlight = highlight
+        capacity = max(capacity or 0, len(self.values), 1)
+        levels = int(np.frexp(capacity)[1])
+        self.renderer = TreeRenderer.from_heap(self.values, default_color=color, size=size, dpi=dpi,
+                                               title=title, levels=levels)
+        self.positions = heap_layout(capacity)
+        self.canvas = self.renderer.figure.canvas
+        self.axes = self.renderer.axes
+        # Labels are on or off for the whole animation, judged on the capacity-sized tree
+        shown = int(np.count_nonzero(self.positions[:, 1] >= -self.renderer.cutoff))
+        self.labels = self.renderer.labels_fit(shown, [str(value) for value in (*self.values, *pushed)])
+        if not self.labels:
+            for text in self.renderer.texts:
+                text.remove()
+            self.renderer.texts = []
+        self.node_size = float(self.renderer.nodes.get_sizes()[0])
+        self.radius_px = np.sqrt(self.node_size) / 2 * dpi / 72 + 4
+
+        self.patch_edges = LineCollection([], colors="gray", linewidths=1.0, animated=True)
+        self.erase_edges = LineCollection([], colors="white", linewidths=4.0, animated=True)
+        self.patch_nodes = self.axes.scatter([], [], s=self.node_size, animated=True)
+        self.erase_nodes = self.axes.scatter([], [], s=self.node_size * 1.3, c="white", animated=True)
+        self.rings = self.axes.scatter([], [], s=self.node_size, facecolors="none", edgecolors=highlight,
+                                       linewidths=3, animated=True)
+        self.text = self.axes.text(0, 0, "", ha="center", va="center", animated=True)
+        for artist in (self.patch_edges, self.erase_edges):
+            self.axes.add_collection(artist)
+        self.canvas.draw()
+
+    def _shown(self, indices: List[int]) -> List[int]:
+        return [i for i in indices if self.positions[i, 1] >= -self.renderer.cutoff]
+
+    def _draw_nodes(self, indices: List[int]) -> None:
+        indices = self._shown(indices)
+        if not indices:
+            return
+        self.patch_nodes.set_offsets(self.positions[indices])
+        self.patch_nodes.set_facecolors([self.color] * len(indices))
+        self.axes.draw_artist(self.patch_nodes)
+        if self.labels:
+            for i in indices:
+                self.text.set_position(self.positions[i])
+                self.text.set_text(str(self.values[i]))
+                self.axes.draw_artist(self.text)
+
+    def _edge(self, child: int) -> np.ndarray:
+        return self.positions[[(child - 1) // 2, child]]
+
+    def _bbox(self, indices: List[int]) -> Bbox:
+        points = self.axes.transData.transform(self.positions[indices])
+        return Bbox([points.min(axis=0) - self.radius_px, points.max(axis=0) + self.radius_px])
+
+    def apply(self, step: HeapStep) -> List[int]:
+        """
+        Applies one step to the values and the canvas.
+
+        Returns:
+            The indices to highlight.
+        """
+        if step.kind == "swap":
+            self.values[step.i], self.values[step.j] = self.values[step.j], self.values[step.i]
+            self._draw_nodes([step.i, step.j])
+            return [step.i, step.j]
+        if step.kind == "push":
+            if step.i != len(self.values):
+                raise ValueError(f"Push at index {step.i} does not extend a heap of size {len(self.values)}.")
+            self.values.append(step.value)
+            if step.i and self._shown([step.i]):
+                self.patch_edges.set_segments([self._edge(step.i)])
+                self.axes.draw_artist(self.patch_edges)
+            self._draw_nodes([step.i, (step.i - 1) // 2] if step.i else [step.i])
+            return [step.i]
+        if step.kind == "pop":
+            if step.i != len(self.values) - 1:
+                raise ValueError(f"Pop at index {step.i} is not the last node of a heap of size {len(self.values)}.")
+            self.values.pop()
+            if self._shown([step.i]):
+                self.erase_nodes.set_offsets(self.positions[[step.i]])
+                self.axes.draw_artist(self.erase_nodes)
+                if step.i:
+                    self.erase_edges.set_segments([self._edge(step.i)])
+                    self.axes.draw_artist(self.erase_edges)
+                    self._draw_nodes([(step.i - 1) // 2])
+            return []
+        raise ValueError(f"Unknown heap step '{step.kind}'.")
+
+    def frames(self, steps: Iterable[HeapStep]) -> Iterator[np.ndarray]:
+        """
+        Yields the initial frame and one RGBA frame per step.
+
+        Args:
+            steps: Recorded steps, in order.
+        """
+        yield np.asarray(self.canvas.buffer_rgba()).copy()
+        for step in steps:
+            changed = self._shown(self.apply(step))
+            if not changed:
+                yield np.asarray(self.canvas.buffer_rgba()).copy()
+                continue
+            clean = self.canvas.copy_from_bbox(self._bbox(changed))
+            self.rings.set_offsets(self.positions[changed])
+            self.axes.draw_artist(self.rings)
+            yield np.asarray(self.canvas.buffer_rgba()).copy()
+            self.canvas.restore_region(clean)
+
+def record_operations(heap: List[Any], operations: Iterable[Tuple[Any, ...]]) -> List[HeapStep]:
+    """
+    Runs heap operations on a list and records their steps.
+
+    Args:
+        heap: The list to operate on, modified in place.
+        operations: ("heapify",), ("push", item) or ("pop",) tuples.
+
+    Returns:
+        The recorded steps.
+    """
+    steps: List[HeapStep] = []
+    for operation in operations:
+        if operation[0] == "heapify":
+            steps.extend(record_heapify(heap))
+        elif operation[0] == "push":
+            steps.extend(record_heappush(heap, operation[1]))
+        elif operation[0] == "pop":
+            steps.extend(record_heappop(heap)[1])
+        else:
+            raise ValueError(f"Unknown heap operation '{operation[0]}'.")
+    return steps
+
+# Frames sampled to build the shared palette of a GIF
+# GIF frames share one palette: the main colors of the first frame plus a
+# fixed GIF_CUBE_LEVELS^3 color cube for colors that only appear later
+GIF_CUBE_LEVELS = 5
+# Palette entries reserved for colors the caller announces (node colors, gradients)
+GIF_RESERVED_COLORS = 64
+
+def _gif_palette(image: Any, reserved: Optional[Sequence[Any]] = None) -> Any:
+    """
+    Builds the shared GIF palette as a Pillow "P" image.
+
+    Args:
+        image: First frame, in RGB mode.
+        reserved: Matplotlib colors that get exact entries; beyond
+                  GIF_RESERVED_COLORS, an even sample of them does.
+    """
+    from PIL import Image
+
+    levels = np.linspace(0, 255, GIF_CUBE_LEVELS).round().astype(np.uint8)
+    cube = np.stack(np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1).reshape(-1, 3)
+    exact = np.empty((0, 3), dtype=np.uint8)
+    if reserved is not None and len(reserved):
+        exact = np.unique((to_rgba_array(reserved)[:, :3] * 255).round().astype(np.uint8), axis=0)
+        if len(exact) > GIF_RESERVED_COLORS:
+            exact = exact[np.linspace(0, len(exact) - 1, GIF_RESERVED_COLORS).round().astype(np.int64)]
+    free = 256 - len(cube) - len(exact)
+    first = image.quantize(colors=free, method=Image.Quantize.MEDIANCUT)
+    colors = np.asarray(first.getpalette()[:3 * free], dtype=np.uint8).reshape(-1, 3)
+    palette = Image.new("P", (1, 1))
+    palette.putpalette(np.concatenate([colors, exact, cube]).ravel().tolist())
+    return palette
+
+def _write_gif(frames: Iterable[np.ndarray], path: str, fps: int, colors: Optional[Sequence[Any]] = None) -> int:
+    """
+    Encodes frames into a GIF one at a time, holding only the previous frame.
+
+    All frames share a palette built from the first one and the announced
+    colors (see _gif_palette), so Pillow's encoder never builds a palette
+    per frame. Each later frame is written as the rectangle that changed
+    since the previous one, and unchanged frames extend the previous
+    frame's duration.
+    """
+    from PIL import Image, GifImagePlugin
+
+    duration = int(1000 / fps)
+    palette = None
+    previous = None
+    # Frame waiting to be written: (image, offset, duration)
+    pending = None
+    count = 0
+    with open(path, "wb") as file:
+        for frame in frames:
+            image = Image.fromarray(frame).convert("RGB")
+            if palette is None:
+                palette = _gif_palette(image, colors)
+            indexed = image.quantize(palette=palette, dither=Image.Dither.NONE)
+            pixels = np.asarray(indexed)
+            count += 1
+            if previous is None:
+                file.write(b"".join(GifImagePlugin.getheader(indexed, info={"loop": 0})[0]))
+                pending = (indexed, (0, 0), duration)
+            else:
+                changed = np.argwhere(pixels != previous)
+                if changed.size == 0:
+                    pending = (pending[0], pending[1], pending[2] + duration)
+                else:
+                    file.write(b"".join(GifImagePlugin.getdata(pending[0], pending[1], duration=pending[2])))
+                    (top, left), (bottom, right) = changed.min(axis=0), changed.max(axis=0) + 1
+                    pending = (indexed.crop((left, top, right, bottom)), (int(left), int(top)), duration)
+            previous = pixels
+        if pending is not None:
+            file.write(b"".join(GifImagePlugin.getdata(pending[0], pending[1], duration=pending[2])))
+            file.write(b";")
+    if not count:
+        Path(path).unlink()
+    return count
+
+def export_animation(frames: Iterable[np.ndarray], path: str, fps: int = 4,
+                     colors: Optional[Sequence[Any]] = None) -> int:
+    """
+    Writes RGBA frames to a GIF (with Pillow) or an MP4 (with ffmpeg).
+
+    Frames are encoded as they are produced, so a generator of frames is
+    never held in memory as a whole.
+
+    Args:
+        frames: Frames of equal size.
+        path: Output file path (.gif or .mp4).
+        fps: Frames per second.
+        colors: Colors the frames will show, so that GIF frames after the
+                first keep them exactly (ignored for MP4).
+
+    Returns:
+        The number of frames written.
+
+    Raises:
+        ValueError: If the file extension is neither .gif nor .mp4.
+        RuntimeError: If ffmpeg is needed but not installed.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".gif":
+        return _write_gif(frames, path, fps, colors)
+    if suffix != ".mp4":
+        raise ValueError(f"Unsupported output format '{suffix}', expected .gif or .mp4.")
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("ffmpeg was not found on PATH; it is needed for MP4 export.")
+    count = 0
+    process = None
+    try:
+        for frame in frames:
+            if process is None:
+                height, width = frame.shape[:2]
+                process = subprocess.Popen(
+                    [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                     "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                     "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", path],
+                    stdin=subprocess.PIPE)
+            process.stdin.write(np.ascontiguousarray(frame).tobytes())
+            count += 1
+    finally:
+        if process is not None:
+            process.stdin.close()
+            if process.wait():
+                raise RuntimeError(f"ffmpeg exited with status {process.returncode}.")
+    return count
+
+def animate_heap(heap_array: List[Any], operations: Iterable[Tuple[Any, ...]], path: str, fps: int = 4,
+                 size: Tuple[int, int] = (900, 600)) -> int:
+    """
+    Records heap operations on a copy of heap_array and exports them as an animation.
+
+    Args:
+        heap_array: Initial list.
+        operations: ("heapify",), ("push", item) or ("pop",) tuples.
+        path: Output file path (.gif or .mp4).
+        fps: Frames per second.
+        size: Frame size in pixels (width, height).
+
+    Returns:
+        The number of frames written.
+    """
+    heap = list(heap_array)
+    capacity = len(heap)
+    operations = list(operations)
+    # Largest size the heap reaches along the way
+    running = capacity
+    for operation in operations:
+        running += {"push": 1, "pop": -1}.get(operation[0], 0)
+        capacity = max(capacity, running)
+    steps = record_operations(heap, operations)
+    animator = HeapAnimator(heap_array, capacity, size=size,
+                            pushed=[step.value for step in steps if step.kind == "push"])
+    return export_animation(animator.frames(steps), path, fps, colors=[animator.color, animator.highlight])
 
 def draw_tree(tree_root: Node) -> None:
     """
-    Visualizes a binary tree using networkx and matplotlib.
+    Visualizes a binary tree with matplotlib.
 
     Args:
         tree_root: The root node of the tree to draw.
     """
-    tree = nx.DiGraph()
-    pos = {tree_root.id: (0, 0)}
-    add_edges(tree, tree_root, pos)
+    plt.figure(figsize=(8, 5))
+    TreeRenderer.from_tree(tree_root, axes=plt.gca(), title="Binary Heap Tree Visualization")
+    plt.show()
+
+def draw_heap(heap_array: Sequence[Any], colors: Optional[Sequence[str]] = None,
+              title: str = "Binary Heap Tree Visualization") -> None:
+    """
+    Visualizes a heap array directly, without building a Node tree.
 
-    node_colors = [data['color'] for _, data in tree.nodes(data=True)]
-    node_labels = {node: data['label'] for node, data in tree.nodes(data=True)}
+    Zooming in re-renders the view with more levels and labels.
 
+    Args:
+        heap_array: List representation of the heap.
+        colors: Optional color per index (default: skyblue).
+        title: Plot title.
+    """
     plt.figure(figsize=(8, 5))
-    nx.draw(tree, pos=pos, labels=node_labels, arrows=False, node_size=2500, node_color=node_colors)
-    plt.title("Binary Heap Tree Visualization")
+    TreeRenderer.from_heap(heap_array, colors, axes=plt.gca(), title=title)
     plt.show()
 
-def build_heap_tree(heap_array: List[Any], i: int = 0) -> Optional[Node]:
+def build_heap_tree(heap_array: List[Any], i: int = 0, node_class: type = Node) -> Optional[Node]:
     """
-    Recursively builds a binary tree representation from a heap array.
+    Builds a binary tree representation from a heap array.
+
+    Nodes are created in one pass over the array and linked by index
+    arithmetic, without recursion.
 
     Args:
         heap_array: List representation of the heap.
-        i: Current index in the array (default is 0, the root).
+        i: Index of the subtree root (default is 0, the root).
+        node_class: Node type to create.
 
     Returns:
         The root node of the resulting binary tree.
     """
-    if i < len(heap_array):
-        node = Node(heap_array[i])
-        left_index = 2 * i + 1
-        right_index = 2 * i + 2
-        node.left = build_heap_tree(heap_array, left_index)
-        node.right = build_heap_tree(heap_array, right_index)
-        return node
-    return None
+    if i >= len(heap_array):
+        return None
+    nodes: Dict[int, Node] = {}
+    level = [i]
+    while level:
+        next_level = []
+        for index in level:
+            nodes[index] = node_class(heap_array[index])
+            if index:
+                parent = nodes.get((index - 1) // 2)
+                if parent is not None:
+                    if index % 2:
+                        parent.left = nodes[index]
+                    else:
+                        parent.right = nodes[index]
+            next_level.extend(child for child in (2 * index + 1, 2 * index + 2) if child < len(heap_array))
+        level = next_level
+    return nodes[i]
+
+def parse_args():
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description="Binary heap visualization.")
+    parser.add_argument("--size", type=int, help="visualize a heap of this many random values instead of the example")
+    parser.add_argument("--output", help="write the picture to a .png or .svg file instead of showing it")
+    parser.add_argument("--animate", help="write heapify, push and pop steps to a .gif or .mp4 file")
+    parser.add_argument("--fps", type=int, default=4, help="animation frames per second")
+    return parser.parse_args()
 
 # Usage
 if __name__ == "__main__":
+    args = parse_args()
     print("Visualizing Binary Heap...")
 
     # Example:
     raw_values = [1, 3, 2, 7, 5, 4, 6, 15, 14, 13, 12, 11, 10, 9, 8]
+    if args.size is not None:
+        raw_values = [random.randint(0, 10 * args.size) for _ in range(args.size)]
 
-    # Convert to min-heap
-    heapq.heapify(raw_values)
-
-    # Build binary tree from heap
-    heap_tree = build_heap_tree(raw_values)
-
-    # Draw the heap tree
-    if heap_tree:
-        draw_tree(heap_tree)
-    else:
+    if args.animate:
+        # Animate heapify followed by a few pushes and pops
+        operations = [("heapify",)] + [("push", value) for value in (0, 4, 9)] + [("pop",)] * 3
+        try:
+            frames = animate_heap(raw_values, operations, args.animate, args.fps)
+            print(f"Saved {frames} frames to {args.animate}")
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+    elif not raw_values:
         print("Heap is empty. Nothing to visualize.")
+    else:
+        # Convert to min-heap
+        heapq.heapify(raw_values)
+
+        # Draw the heap tree straight from the array
+        if args.output:
+            export_heap(raw_values, args.output)
+            print(f"Saved to {args.output}")
+        else:
+            draw_heap(raw_values)
@@ -1,51 +1,27 @@
-import uuid
 import heapq
-import networkx as nx
+import argparse
+import numpy as np
 import matplotlib.pyplot as plt
 from collections import deque
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Callable, Iterator, Sequence
+
+import task4
+from task4 import TreeRenderer, export_animation, heap_layout
 
 """
 Task 5: Binary Tree Traversal Visualization
 """
 
-class Node:
+class Node(task4.Node):
     """Class representing a node in a binary tree."""
+    __slots__ = ()
+
     def __init__(self, key, color="#D3D3D3"):  # light gray default
-        self.left: Optional['Node'] = None
-        self.right: Optional['Node'] = None
-        self.val = key
-        self.color = color
-        self.id = str(uuid.uuid4())  # Unique ID for drawing
-
-def add_edges(
-    graph: nx.DiGraph,
-    node: Optional[Node],
-    pos: Dict[str, Tuple[float, float]],
-    x: float = 0,
-    y: float = 0,
-    layer: int = 1
-) -> None:
-    """
-    Recursively adds nodes and edges to the graph
-    and positions them in a tree layout.
-    """
-    if node is not None:
-        graph.add_node(node.id, color=node.color, label=node.val)
-        if node.left:
-            graph.add_edge(node.id, node.left.id)
-            left_x = x - 1 / 2 ** layer
-            pos[node.left.id] = (left_x, y - 1)
-            add_edges(graph, node.left, pos, x=left_x, y=y - 1, layer=layer + 1)
-        if node.right:
-            graph.add_edge(node.id, node.right.id)
-            right_x = x + 1 / 2 ** layer
-            pos[node.right.id] = (right_x, y - 1)
-            add_edges(graph, node.right, pos, x=right_x, y=y - 1, layer=layer + 1)
+        super().__init__(key, color)
 
 def draw_tree(tree_root: Node, title: str = "") -> None:
     """
-    Draws a binary tree using NetworkX and matplotlib.
+    Draws a binary tree with matplotlib.
 
     Args:
         tree_root: Root of the binary tree.
@@ -53,24 +29,12 @@ def draw_tree(tree_root: Node, title: str = "") -> None:
     """
     plt.clf()
     plt.gcf().set_size_inches(12, 7)
-    plt.title(title)
-
-    tree = nx.DiGraph()
-    pos = {tree_root.id: (0, 0)}
-    add_edges(tree, tree_root, pos)
-
-    node_colors = [data['color'] for _, data in tree.nodes(data=True)]
-    node_labels = {node: data['label'] for node, data in tree.nodes(data=True)}
-
-    nx.draw(
-        tree, pos=pos, labels=node_labels, arrows=False,
-        node_size=2500, node_color=node_colors
-    )
+    TreeRenderer.from_tree(tree_root, axes=plt.gca(), title=title)
     plt.show()
 
 def build_heap_tree(heap_array: List[Any], i: int = 0) -> Optional[Node]:
     """
-    Builds a binary tree from a heap array recursively.
+    Builds a binary tree from a heap array without recursion.
 
     Args:
         heap_array: List representing the heap.
@@ -79,12 +43,28 @@ def build_heap_tree(heap_array: List[Any], i: int = 0) -> Optional[Node]:
     Returns:
         Root node of the binary tree.
     """
-    if i < len(heap_array):
-        node = Node(heap_array[i])
-        node.left = build_heap_tree(heap_array, 2 * i + 1)
-        node.right = build_heap_tree(heap_array, 2 * i + 2)
-        return node
-    return None
+    return task4.build_heap_tree(heap_array, i, node_class=Node)
+
+# Gradient endpoints: dark blue to light blue
+GRADIENT_START = (0, 0, 139)
+GRADIENT_END = (173, 216, 230)
+
+def gradient_array(n: int) -> np.ndarray:
+    """
+    Computes a gradient of n colors from dark blue to light blue.
+
+    Args:
+        n: Number of colors.
+
+    Returns:
+        (n, 3) array of 8-bit RGB values; a single color is the start color.
+    """
+    i = np.arange(n)[:, None]
+    start, end = np.array(GRADIENT_START), np.array(GRADIENT_END)
+    if n == 1:
+        return start[None, :]
+    # Integer arithmetic reproduces the truncation of the original per-color formula
+    return (start * (n - 1 - i) + end * i) // (n - 1)
 
 def generate_gradient(n: int) -> List[str]:
     """
@@ -96,13 +76,7 @@ def generate_gradient(n: int) -> List[str]:
     Returns:
         List of hex color strings.
     """
-    colors = []
-    for i in range(n):
-        r = int((0   * (n - 1 - i) + 173 * i) / (n - 1))
-        g = int((0   * (n - 1 - i) + 216 * i) / (n - 1))
-        b = int((139 * (n - 1 - i) + 230 * i) / (n - 1))
-        colors.append(f'#{r:02x}{g:02x}{b:02x}')
-    return colors
+    return [f'#{r:02x}{g:02x}{b:02x}' for r, g, b in gradient_array(n).tolist()]
 
 def bfs_traversal(root: Node) -> List[Node]:
     """
@@ -150,6 +124,227 @@ def dfs_traversal(root: Node) -> List[Node]:
             stack.append(node.left)
     return visited
 
+def heap_bfs(size: int) -> Iterator[int]:
+    """
+    Yields the indices of a heap-shaped tree in breadth-first order.
+
+    In the array layout level order is index order.
+
+    Args:
+        size: Number of elements in the heap.
+    """
+    yield from range(size)
+
+def _leftmost(i: int, size: int) -> int:
+    """Index of the leftmost descendant of i (i itself when it has no children)."""
+    while 2 * i + 1 < size:
+        i = 2 * i + 1
+    return i
+
+def heap_preorder(size: int) -> Iterator[int]:
+    """
+    Yields the indices of a heap-shaped tree in preorder (node, left, right),
+    the order dfs_traversal visits.
+
+    Each step follows from index arithmetic alone: go to the left child if
+    there is one, otherwise climb to the first ancestor whose right sibling
+    exists. No stack is kept.
+
+    Args:
+        size: Number of elements in the heap.
+    """
+    i = 0 if size else -1
+    while i >= 0:
+        yield i
+        if 2 * i + 1 < size:
+            i = 2 * i + 1
+            continue
+        while i > 0 and not (i % 2 and i + 1 < size):
+            i = (i - 1) // 2
+        i = i + 1 if i > 0 else -1
+
+def heap_inorder(size: int) -> Iterator[int]:
+    """
+    Yields the indices of a heap-shaped tree in inorder (left, node, right).
+
+    Args:
+        size: Number of elements in the heap.
+    """
+    i = _leftmost(0, size) if size else -1
+    while i >= 0:
+        yield i
+        if 2 * i + 2 < size:
+            i = _leftmost(2 * i + 2, size)
+            continue
+        # Climb out of right subtrees; the parent of a left child comes next
+        while i > 0 and i % 2 == 0:
+            i = (i - 1) // 2
+        i = (i - 1) // 2 if i > 0 else -1
+
+def heap_postorder(size: int) -> Iterator[int]:
+    """
+    Yields the indices of a heap-shaped tree in postorder (left, right, node).
+
+    Args:
+        size: Number of elements in the heap.
+    """
+    i = _leftmost(0, size) if size else -1
+    while i >= 0:
+        yield i
+        if i == 0:
+            break
+        if i % 2 and i + 1 < size:
+            i = _leftmost(i + 1, size)
+        else:
+            i = (i - 1) // 2
+
+HEAP_TRAVERSALS: Dict[str, Callable[[int], Iterator[int]]] = {
+    "bfs": heap_bfs,
+    "preorder": heap_preorder,
+    "inorder": heap_inorder,
+    "postorder": heap_postorder,
+}
+
+def traverse_heap(heap_array: Sequence[Any], order: str = "bfs") -> Iterator[Any]:
+    """
+    Lazily yields the values of a heap array in the given traversal order.
+
+    Args:
+        heap_array: List representing the heap.
+        order: One of HEAP_TRAVERSALS.
+
+    Raises:
+        ValueError: If the order is unknown.
+    """
+    if order not in HEAP_TRAVERSALS:
+        raise ValueError(f"Unknown traversal order '{order}', expected one of {', '.join(HEAP_TRAVERSALS)}.")
+    return (heap_array[i] for i in HEAP_TRAVERSALS[order](len(heap_array)))
+
+def _predecessor(node: Node) -> Node:
+    """Rightmost node of the left subtree, stopping at a thread back to node."""
+    predecessor = node.left
+    while predecessor.right is not None and predecessor.right is not node:
+        predecessor = predecessor.right
+    return predecessor
+
+def morris_inorder(root: Optional[Node]) -> Iterator[Node]:
+    """
+    Inorder traversal of a linked tree in O(1) extra memory.
+
+    Morris traversal temporarily threads the rightmost node of each left
+    subtree back to its ancestor instead of keeping a stack. Every thread
+    is removed again, also when the generator is closed early.
+
+    Args:
+        root: Root of the tree.
+    """
+    current = root
+    stopped = False
+    while current is not None:
+        if current.left is None:
+            if not stopped:
+                try:
+                    yield current
+                except GeneratorExit:
+                    stopped = True
+            current = current.right
+            continue
+        predecessor = _predecessor(current)
+        if predecessor.right is None:
+            predecessor.right = current
+            current = current.left
+        else:
+            predecessor.right = None
+            if not stopped:
+                try:
+                    yield current
+                except GeneratorExit:
+                    stopped = True
+            current = current.right
+
+def morris_preorder(root: Optional[Node]) -> Iterator[Node]:
+    """
+    Preorder traversal of a linked tree in O(1) extra memory (see morris_inorder).
+
+    Args:
+        root: Root of the tree.
+    """
+    current = root
+    stopped = False
+    while current is not None:
+        if current.left is None:
+            if not stopped:
+                try:
+                    yield current
+                except GeneratorExit:
+                    stopped = True
+            current = current.right
+            continue
+        predecessor = _predecessor(current)
+        if predecessor.right is None:
+            if not stopped:
+                try:
+                    yield current
+                except GeneratorExit:
+                    stopped = True
+            predecessor.right = current
+            current = current.left
+        else:
+            predecessor.right = None
+            current = current.right
+
+def _reverse_right_chain(start: Node, end: Node) -> None:
+    """Reverses the right pointers on the chain from start to end."""
+    previous, node = start, start.right
+    while previous is not end:
+        following = node.right
+        node.right = previous
+        previous, node = node, following
+
+def morris_postorder(root: Optional[Node]) -> Iterator[Node]:
+    """
+    Postorder traversal of a linked tree in O(1) extra memory.
+
+    Works like morris_inorder on a temporary parent of the root; when a
+    thread is removed, the right chain of the finished left subtree is
+    visited bottom-up by reversing its right pointers in place and
+    restoring them afterwards.
+
+    Args:
+        root: Root of the tree.
+    """
+    if root is None:
+        return
+    dummy = Node(None)
+    dummy.left = root
+    current = dummy
+    stopped = False
+    while current is not None:
+        if current.left is None:
+            current = current.right
+            continue
+        predecessor = _predecessor(current)
+        if predecessor.right is None:
+            predecessor.right = current
+            current = current.left
+            continue
+        # Visit the chain current.left -> ... -> predecessor in reverse
+        _reverse_right_chain(current.left, predecessor)
+        node = predecessor
+        while True:
+            if not stopped:
+                try:
+                    yield node
+                except GeneratorExit:
+                    stopped = True
+            if node is current.left:
+                break
+            node = node.right
+        _reverse_right_chain(predecessor, current.left)
+        # Restoring the chain leaves the thread pointing backwards
+        predecessor.right = None
+        current = current.right
+
 def apply_traversal_and_color(root: Node, traversal_func, title: str):
     """
     Applies a traversal to the tree and updates node colors
@@ -166,18 +361,160 @@ def apply_traversal_and_color(root: Node, traversal_func, title: str):
         node.color = color
     draw_tree(root, title=title)
 
+def traversal_colors(size: int, order: str = "bfs") -> np.ndarray:
+    """
+    Colors the nodes of a heap-shaped tree by their position in a traversal.
+
+    Args:
+        size: Number of elements in the heap.
+        order: One of HEAP_TRAVERSALS.
+
+    Returns:
+        (size, 3) array of RGB values in [0, 1], indexed by heap index.
+
+    Raises:
+        ValueError: If the order is unknown.
+    """
+    if order not in HEAP_TRAVERSALS:
+        raise ValueError(f"Unknown traversal order '{order}', expected one of {', '.join(HEAP_TRAVERSALS)}.")
+    visits = np.fromiter(HEAP_TRAVERSALS[order](size), dtype=np.int64, count=size)
+    colors = np.empty((size, 3))
+    colors[visits] = gradient_array(size) / 255
+    return colors
+
+class TraversalAnimator:
+    """
+    Animates a traversal of a heap array by coloring the nodes in visit order.
+
+    The tree is drawn once in gray. Each frame then draws only the nodes
+    visited since the previous frame onto the persistent canvas, so the
+    drawing cost of a frame depends on the visits it shows, not on the
+    tree size. Nodes in levels collapsed by the renderer's level of detail
+    are visited but not drawn.
+    """
+
+    def __init__(self, heap_array: Sequence[Any], order: str = "bfs", size: Tuple[int, int] = (1200, 700),
+                 dpi: int = 100, title: Optional[str] = None, color: str = "#D3D3D3"):
+        """
+        Args:
+            heap_array: List representing the heap.
+            order: One of HEAP_TRAVERSALS.
+            size: Frame size in pixels (width, height).
+            dpi: Frame resolution.
+            title: Plot title (default: the traversal order).
+            color: Color of nodes not visited yet.
+        """
+        self.values = heap_array
+        self.order = order
+        self.colors = traversal_colors(len(heap_array), order)
+        self.renderer = TreeRenderer.from_heap(heap_array, default_color=color, size=size, dpi=dpi,
+                                               title=title if title is not None else f"{order} traversal")
+        self.positions = heap_layout(len(heap_array))
+        self.canvas = self.renderer.figure.canvas
+        self.axes = self.renderer.axes
+        self.labels = bool(self.renderer.texts)
+        node_size = self.renderer.nodes.get_sizes()[0]
+        self.patch = self.axes.scatter([], [], s=node_size, animated=True)
+        self.text = self.axes.text(0, 0, "", ha="center", va="center", animated=True)
+        self.canvas.draw()
+
+    def _draw(self, indices: List[int]) -> None:
+        if not indices:
+            return
+        self.patch.set_offsets(self.positions[indices])
+        self.patch.set_facecolors(self.colors[indices])
+        self.axes.draw_artist(self.patch)
+        if self.labels:
+            for i in indices:
+                self.text.set_position(self.positions[i])
+                self.text.set_text(str(self.values[i]))
+                self.axes.draw_artist(self.text)
+
+    def frames(self, visits_per_frame: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Yields the initial frame and then RGBA frames as the traversal advances.
+
+        Args:
+            visits_per_frame: Visits shown per frame (default: about 100 frames in total).
+        """
+        size = len(self.values)
+        if visits_per_frame is None:
+            visits_per_frame = max(1, size // 100)
+        cutoff = self.renderer.cutoff
+        yield np.asarray(self.canvas.buffer_rgba()).copy()
+        batch: List[int] = []
+        for count, i in enumerate(HEAP_TRAVERSALS[self.order](size), 1):
+            if -self.positions[i, 1] <= cutoff:
+                batch.append(i)
+            if count % visits_per_frame == 0 or count == size:
+                self._draw(batch)
+                batch = []
+                yield np.asarray(self.canvas.buffer_rgba()).copy()
+
+def draw_heap_traversal(heap_array: Sequence[Any], order: str = "bfs", title: str = "") -> None:
+    """
+    Draws a heap array with nodes colored by their traversal order.
+
+    Args:
+        heap_array: List representing the heap.
+        order: One of HEAP_TRAVERSALS.
+        title: Plot title.
+    """
+    plt.clf()
+    plt.gcf().set_size_inches(12, 7)
+    TreeRenderer.from_heap(heap_array, traversal_colors(len(heap_array), order), axes=plt.gca(), title=title)
+    plt.show()
+
+def export_traversal_animation(heap_array: Sequence[Any], path: str, order: str = "bfs",
+                               visits_per_frame: Optional[int] = None, fps: int = 10,
+                               size: Tuple[int, int] = (1200, 700)) -> int:
+    """
+    Writes a traversal animation of a heap array to a GIF or MP4 file without a display.
+
+    Args:
+        heap_array: List representing the heap.
+        path: Output file path (.gif or .mp4).
+        order: One of HEAP_TRAVERSALS.
+        visits_per_frame: Visits shown per frame (default: about 100 frames in total).
+        fps: Frames per second.
+        size: Frame size in pixels (width, height).
+
+    Returns:
+        The number of frames written.
+    """
+    animator = TraversalAnimator(heap_array, order, size=size)
+    return export_animation(animator.frames(visits_per_frame), path, fps, colors=animator.colors)
+
+def parse_args():
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description="Binary tree traversal visualization.")
+    parser.add_argument("--size", type=int, help="use a heap of this many random values instead of the example")
+    parser.add_argument("--order", choices=list(HEAP_TRAVERSALS), default="bfs", help="traversal to animate")
+    parser.add_argument("--animate", help="write the traversal animation to a .gif or .mp4 file")
+    parser.add_argument("--fps", type=int, default=10, help="animation frames per second")
+    return parser.parse_args()
+
 # Usage
 if __name__ == "__main__":
+    args = parse_args()
     print("Binary Heap BFS and DFS Traversal Visualization...")
 
     # Array of values to build a balanced heap
     raw_values = [1, 3, 2, 7, 5, 4, 6, 15, 14, 13, 12, 11, 10, 9, 8]
+    if args.size is not None:
+        raw_values = np.random.randint(0, 10 * max(args.size, 1), args.size).tolist()
     heapq.heapify(raw_values)  # Convert to min-heap
 
-    # Build binary tree from heap
-    tree_root = build_heap_tree(raw_values)
+    if args.animate:
+        try:
+            frames = export_traversal_animation(raw_values, args.animate, args.order, fps=args.fps)
+            print(f"Saved {frames} frames to {args.animate}")
+        except (RuntimeError, ValueError) as e:
+            print(f"Error: {e}")
+    elif raw_values:
+        # Build binary tree from heap
+        tree_root = build_heap_tree(raw_values)
 
-    if tree_root:
         # BFS visualization
         apply_traversal_and_color(tree_root, bfs_traversal, "Breadth-First Traversal Visualization")
 
@@ -2,7 +2,33 @@
 Task 6: Greedy Algorithms and Dynamic Programming
 """
 
-from typing import Dict, List, Tuple
+import math
+import time
+import hashlib
+import random
+import argparse
+import tracemalloc
+from fractions import Fraction
+from functools import reduce
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Bit-packed choice matrices up to this size are kept whole; larger ones are
+# recomputed block by block from checkpointed DP rows, which share the same limit
+CHOICE_MEMORY_LIMIT = 256 * 2 ** 20
+
+# Fractional costs are made integral when their denominators are at most this
+MAX_COST_DENOMINATOR = 10 ** 6
+
+# Meet-in-the-middle enumerates 2^(n/2) subsets per half, so it is limited to small menus
+MITM_MAX_DISHES = 40
+
+# Relative cost of one sparse DP state and one meet-in-the-middle subset,
+# against one dense DP cell, for choose_solver
+SPARSE_STATE_COST = 8
+MITM_SUBSET_COST = 2
 
 
 def solve_with_greedy_strategy(menu: Dict[str, Dict[str, int]], max_budget: int) -> Tuple[List[str], int, int]:
@@ -36,11 +62,551 @@ def solve_with_greedy_strategy(menu: Dict[str, Dict[str, int]], max_budget: int)
     return selected_dishes, total_calories, max_budget - budget_left
 
 
-def solve_with_dynamic_programming(menu: Dict[str, Dict[str, int]], max_budget: int) -> Tuple[List[str], int, int]:
+def _as_fraction(value: float) -> Optional[Fraction]:
+    """The fraction with denominator up to MAX_COST_DENOMINATOR that value stands for, if any."""
+    fraction = Fraction(value).limit_denominator(MAX_COST_DENOMINATOR)
+    return fraction if fraction == value or float(fraction) == value else None
+
+
+def scale_costs(costs: List[float]) -> Optional[Tuple[List[int], Fraction]]:
+    """
+    Expresses costs as integer multiples of the largest common unit.
+
+    Costs are converted to exact fractions (decimal prices such as 12.5
+    included), brought to a common denominator and divided by their GCD,
+    so that a DP over budgets in that unit has as few columns as possible.
+    Every sum of costs is a multiple of the unit, so budget b behaves like
+    floor(b / unit) units.
+
+    Args:
+        costs: Non-negative dish costs.
+
+    Returns:
+        The integer costs and the unit, or None when a cost is not a fraction
+        with denominator up to MAX_COST_DENOMINATOR.
+
+    Raises:
+        ValueError: If a cost is negative.
+    """
+    fractions = []
+    for cost in costs:
+        if cost < 0:
+            raise ValueError(f"Costs must be non-negative, got {cost}.")
+        fraction = _as_fraction(cost)
+        if fraction is None:
+            return None
+        fractions.append(fraction)
+    denominator = reduce(math.lcm, (fraction.denominator for fraction in fractions), 1)
+    numerators = [int(fraction * denominator) for fraction in fractions]
+    divisor = reduce(math.gcd, numerators, 0) or 1
+    return [numerator // divisor for numerator in numerators], Fraction(divisor, denominator)
+
+
+def _budget_units(budget: float, unit: Fraction) -> int:
+    """The largest whole number of cost units within the budget."""
+    # A decimal budget such as 0.3 means 3/10, not the float just below it
+    return math.floor((_as_fraction(budget) or Fraction(budget)) / unit)
+
+
+def _menu_arrays(menu: Dict[str, Dict[str, int]]) -> Tuple[List[str], np.ndarray, np.ndarray, Fraction]:
+    """
+    Splits a menu into dish names, an int64 array of costs in scaled units
+    (see scale_costs), a calorie array and the cost unit.
+
+    Raises:
+        ValueError: If the costs cannot be scaled to integers.
+    """
+    names = list(menu)
+    scaled = scale_costs([menu[name]['cost'] for name in names])
+    if scaled is None:
+        raise ValueError("Costs must be fractions with small denominators for the dense DP; "
+                         "use solve_with_sparse_dp instead.")
+    costs, unit = scaled
+    calories = [menu[name]['calories'] for name in names]
+    # Integer calories stay exact; anything else is summed as float64 in the same order as the table
+    dtype = np.int64 if all(isinstance(value, (int, np.integer)) for value in calories) else np.float64
+    return names, np.array(costs, dtype=np.int64), np.array(calories, dtype=dtype), unit
+
+
+def _dp_step(row: np.ndarray, cost: int, calories) -> np.ndarray:
+    """
+    Applies one dish to a DP row in place, as a shifted max over the whole budget axis.
+
+    Returns:
+        Boolean mask of the budgets at which taking the dish is strictly
+        better, which is exactly where the table version's rows differ.
+    """
+    take = np.zeros(row.size, dtype=bool)
+    if cost < row.size:
+        candidate = row[:row.size - cost] + calories
+        take[cost:] = candidate > row[cost:]
+        row[cost:] = np.where(take[cost:], candidate, row[cost:])
+    return take
+
+
+def _choice_bit(choices: np.ndarray, item: int, budget: int) -> bool:
+    return bool(choices[item, budget >> 3] >> (7 - (budget & 7)) & 1)
+
+
+class BudgetSweep:
+    """
+    Optimal dish selections for every budget up to max_budget from a single DP run.
+
+    Column b of the knapsack table depends only on columns <= b, so the
+    last DP row holds the best calories for every budget at once, and the
+    choice bits recorded for max_budget backtrack from any smaller budget
+    as well. selection(b) therefore equals solve_with_dynamic_programming(menu, b).
+
+    A single NumPy row of best calories per budget is kept, and, per dish,
+    the budgets at which the dish was taken as one bit each (np.packbits).
+    When that choice matrix would exceed choice_memory_limit bytes, the
+    dishes are split into blocks and only the DP rows at block starts are
+    kept (every s-th of them when even that would not fit), so that one
+    block of choice bits plus the stored rows stay within the limit. The
+    choice bits are then recomputed one block at a time while
+    backtracking, from the nearest stored row, which costs another DP pass
+    per selection (s passes with sparser checkpoints).
+
+    Costs are first divided by their common unit (see scale_costs). All
+    sums of costs are multiples of it, so the table over budgets in units
+    holds the same values and choices as the one over the raw budgets.
+    """
+
+    def __init__(self, menu: Dict[str, Dict[str, int]], max_budget: int,
+                 choice_memory_limit: int = CHOICE_MEMORY_LIMIT):
+        """
+        Args:
+            menu: Dictionary where each key is a dish name and value is a dictionary with 'cost' and 'calories'.
+            max_budget: Largest budget to solve for.
+            choice_memory_limit: Bytes available for choice bits and checkpoint rows.
+
+        Raises:
+            ValueError: If max_budget is negative.
+        """
+        if max_budget < 0:
+            raise ValueError(f"Budget must be non-negative, got {max_budget}.")
+        self.names, self.costs, self.calories, self.unit = _menu_arrays(menu)
+        self.dish_costs = [menu[name]['cost'] for name in self.names]
+        self.max_budget = max_budget
+        num_dishes = len(self.names)
+        budget_units = _budget_units(max_budget, self.unit)
+        row = np.zeros(budget_units + 1, dtype=self.calories.dtype)
+
+        # Dishes whose choice bits are held at once, and blocks per stored DP row
+        self.block_size, self.stride = self._plan_blocks(num_dishes, (budget_units + 8) // 8, row.nbytes,
+                                                         choice_memory_limit)
+        self.checkpoints: List[np.ndarray] = []
+        self.choices: Optional[np.ndarray] = None
+        if self.block_size < num_dishes:
+            for block, start in enumerate(range(0, num_dishes, self.block_size)):
+                # The row before the first block is all zeros and is not stored
+                if block and block % self.stride == 0:
+                    self.checkpoints.append(row.copy())
+                self._advance(row, start, min(start + self.block_size, num_dishes))
+        else:
+            self.choices = self._run_block(row, 0)
+        row.flags.writeable = False
+        self.best_calories = row
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the sweep's arrays: best calories, choice bits and checkpoint rows."""
+        held = self.best_calories.nbytes + sum(row.nbytes for row in self.checkpoints)
+        return held + (self.choices.nbytes if self.choices is not None else 0)
+
+    @staticmethod
+    def _plan_blocks(num_dishes: int, bit_row_bytes: int, row_bytes: int, memory_limit: int) -> Tuple[int, int]:
+        """
+        Picks the block size and the checkpoint stride (in blocks) so that one
+        block of choice bits and the stored DP rows fit in memory_limit.
+        """
+        if num_dishes * bit_row_bytes <= memory_limit:
+            return max(num_dishes, 1), 1
+        # One checkpoint per block: block size minimizing bits plus checkpoints
+        block_size = min(num_dishes, max(1, math.isqrt(num_dishes * row_bytes // bit_row_bytes)))
+        if block_size * bit_row_bytes + (-(-num_dishes // block_size) - 1) * row_bytes <= memory_limit:
+            return block_size, 1
+        # Half the memory for a block of bits, the rest for as many checkpoints as fit
+        block_size = min(num_dishes, max(1, memory_limit // 2 // bit_row_bytes))
+        num_blocks = -(-num_dishes // block_size)
+        stored = max(0, memory_limit - block_size * bit_row_bytes) // row_bytes
+        return block_size, -(-num_blocks // (stored + 1))
+
+    def _advance(self, row: np.ndarray, start: int, end: int) -> None:
+        """Applies dishes start..end-1 to row in place without recording choices."""
+        for i in range(start, end):
+            _dp_step(row, int(self.costs[i]), self.calories[i])
+
+    def _block_start(self, block: int) -> np.ndarray:
+        """The DP row before a block of dishes, recomputed from the nearest stored row."""
+        stored = block // self.stride
+        row = self.checkpoints[stored - 1].copy() if stored else np.zeros_like(self.best_calories)
+        self._advance(row, stored * self.stride * self.block_size, block * self.block_size)
+        return row
+
+    def _run_block(self, row: np.ndarray, start: int) -> np.ndarray:
+        """Applies one block of dishes to row in place and returns their packed choice bits."""
+        end = min(start + self.block_size, len(self.names))
+        choices = np.empty((end - start, (row.size + 7) // 8), dtype=np.uint8)
+        for i in range(start, end):
+            choices[i - start] = np.packbits(_dp_step(row, int(self.costs[i]), self.calories[i]))
+        return choices
+
+    def _check_budget(self, budget: int) -> None:
+        if not 0 <= budget <= self.max_budget:
+            raise ValueError(f"Budget must be between 0 and {self.max_budget}, got {budget}.")
+
+    def calories_for(self, budget: int):
+        """Maximum total calories achievable within the budget."""
+        self._check_budget(budget)
+        return self.best_calories[_budget_units(budget, self.unit)].item()
+
+    def selection(self, budget: int) -> Tuple[List[str], int, int]:
+        """
+        Reconstructs the optimal selection for a budget.
+
+        Returns:
+            A tuple with:
+            - List of selected dish names
+            - Maximum total calories achievable
+            - Total cost spent
+
+        Raises:
+            ValueError: If the budget is outside 0..max_budget.
+        """
+        self._check_budget(budget)
+        num_dishes = len(self.names)
+        selected_dishes = []
+        remaining_budget = _budget_units(budget, self.unit)
+        total_spent = 0
+        # Backtrack one block of choice bits at a time
+        for start in reversed(range(0, num_dishes, self.block_size)):
+            if self.choices is not None:
+                choices = self.choices
+            else:
+                choices = self._run_block(self._block_start(start // self.block_size), start)
+            for i in range(min(start + self.block_size, num_dishes) - 1, start - 1, -1):
+                if _choice_bit(choices, i - start, remaining_budget):
+                    selected_dishes.append(self.names[i])
+                    remaining_budget -= int(self.costs[i])
+                    total_spent += self.dish_costs[i]
+
+        selected_dishes.reverse()
+        return selected_dishes, self.calories_for(budget), total_spent
+
+    def pareto_frontier(self) -> List[Tuple[int, int]]:
+        """
+        Lists the (cost, calories) pairs not dominated by a cheaper or equally
+        cheap selection with at least as many calories.
+
+        The best calories never decrease with the budget, and a budget where
+        they increase is spent in full by its optimal selection, so those
+        budgets are exactly the frontier.
+
+        Returns:
+            Frontier points in increasing order of cost, starting at (0, best calories for free).
+        """
+        increases = np.flatnonzero(np.diff(self.best_calories) > 0) + 1
+        budgets = np.concatenate(([0], increases))
+        costs = [units * self.unit for units in budgets.tolist()]
+        costs = [int(cost) if cost.denominator == 1 else float(cost) for cost in costs]
+        return list(zip(costs, self.best_calories[budgets].tolist()))
+
+
+def menu_fingerprint(menu: Dict[str, Dict[str, int]]) -> str:
+    """
+    Hashes the dishes of a menu, in order (the order decides between equally good selections).
+
+    Returns:
+        Hex digest identifying the menu.
+    """
+    items = tuple((name, values['cost'], values['calories']) for name, values in menu.items())
+    return hashlib.sha256(repr(items).encode("utf-8")).hexdigest()
+
+
+# Sweeps of recently used menus, most recently used last, holding at most
+# SWEEP_CACHE_BYTES of arrays in total (see BudgetSweep.nbytes)
+SWEEP_CACHE_BYTES = 512 * 2 ** 20
+_sweep_cache: "OrderedDict[str, BudgetSweep]" = OrderedDict()
+
+
+def get_budget_sweep(menu: Dict[str, Dict[str, int]], max_budget: int) -> BudgetSweep:
+    """
+    Returns a BudgetSweep covering max_budget, reusing a cached sweep of the same menu.
+
+    A cached sweep serves every budget up to its own maximum; a request for
+    a larger budget replaces it. The least recently used menus are evicted
+    while the cached sweeps hold more than SWEEP_CACHE_BYTES; a sweep larger
+    than that on its own is returned without being cached.
+    """
+    key = menu_fingerprint(menu)
+    sweep = _sweep_cache.get(key)
+    if sweep is None or sweep.max_budget < max_budget:
+        _sweep_cache.pop(key, None)
+        sweep = BudgetSweep(menu, max_budget)
+        if sweep.nbytes > SWEEP_CACHE_BYTES:
+            return sweep
+        _sweep_cache[key] = sweep
+    _sweep_cache.move_to_end(key)
+    cached_bytes = sum(cached.nbytes for cached in _sweep_cache.values())
+    while cached_bytes > SWEEP_CACHE_BYTES:
+        cached_bytes -= _sweep_cache.popitem(last=False)[1].nbytes
+    return sweep
+
+
+def solve_for_budgets(menu: Dict[str, Dict[str, int]], budgets: List[int]) -> Dict[int, Tuple[List[str], int, int]]:
+    """
+    Solves the menu for several budget tiers with a single DP run.
+
+    Returns:
+        Dictionary mapping each budget to the result solve_with_dynamic_programming gives for it.
+    """
+    if not budgets:
+        return {}
+    sweep = get_budget_sweep(menu, max(budgets))
+    return {budget: sweep.selection(budget) for budget in budgets}
+
+
+def solve_with_dynamic_programming(menu: Dict[str, Dict[str, int]], max_budget: int,
+                                   choice_memory_limit: int = CHOICE_MEMORY_LIMIT) -> Tuple[List[str], int, int]:
+    """
+    Selects dishes using dynamic programming to maximize total calories
+    within a fixed budget. Guarantees an optimal solution.
+
+    Runs a BudgetSweep up to max_budget, with a rolling NumPy row and
+    bit-packed choices, and selects exactly the dishes
+    solve_with_dynamic_programming_table selects.
+
+    Args:
+        menu: Dictionary where each key is a dish name and value is a dictionary with 'cost' and 'calories'.
+        max_budget: Maximum budget allowed for selecting dishes.
+        choice_memory_limit: Bytes available for choice bits and checkpoint rows.
+
+    Returns:
+        A tuple with:
+        - List of selected dish names
+        - Maximum total calories achievable
+        - Total cost spent
+
+    Raises:
+        ValueError: If max_budget is negative.
+    """
+    return BudgetSweep(menu, max_budget, choice_memory_limit).selection(max_budget)
+
+
+def _solver_inputs(menu: Dict[str, Dict[str, int]], max_budget: float) -> Tuple[List[str], np.ndarray, np.ndarray, float]:
+    """
+    Dish names, costs, calories and budget for the sparse solvers.
+
+    Costs are scaled to integer units when possible (exact sums), and left
+    as float64 otherwise.
+    """
+    if max_budget < 0:
+        raise ValueError(f"Budget must be non-negative, got {max_budget}.")
+    names = list(menu)
+    costs = [menu[name]['cost'] for name in names]
+    calories = [menu[name]['calories'] for name in names]
+    scaled = scale_costs(costs)
+    if scaled is not None:
+        costs, unit = scaled
+        max_budget = _budget_units(max_budget, unit)
+    dtype = np.int64 if all(isinstance(value, (int, np.integer)) for value in calories) else np.float64
+    cost_dtype = np.int64 if scaled is not None else np.float64
+    return names, np.array(costs, dtype=cost_dtype), np.array(calories, dtype=dtype), max_budget
+
+
+def solve_with_sparse_dp(menu: Dict[str, Dict[str, int]], max_budget: float) -> Tuple[List[str], int, int]:
+    """
+    Selects dishes with a knapsack DP over non-dominated (cost, calories) states.
+
+    Instead of a column per budget unit, only the states that no cheaper
+    state matches in calories are kept, sorted by cost. Each dish merges
+    the states with their shifted copies (one vectorized sort) and prunes
+    the dominated ones. The work depends on the number of distinct useful
+    costs, not on the size of the budget, so large budgets, prices in
+    cents and non-integer costs are cheap.
+
+    Among equally good selections it returns the cheapest, which may differ
+    from the one solve_with_dynamic_programming picks.
+
+    Args:
+        menu: Dictionary where each key is a dish name and value is a dictionary with 'cost' and 'calories'.
+        max_budget: Maximum budget allowed for selecting dishes.
+
+    Returns:
+        A tuple with:
+        - List of selected dish names
+        - Maximum total calories achievable
+        - Total cost spent
+
+    Raises:
+        ValueError: If the budget or a cost is negative.
+    """
+    names, costs, calories, budget = _solver_inputs(menu, max_budget)
+    state_costs = np.zeros(1, dtype=costs.dtype)
+    state_calories = np.zeros(1, dtype=calories.dtype)
+    # Per dish: for every state, the state it came from and whether the dish was taken
+    history = []
+    for cost, dish_calories in zip(costs, calories):
+        taken = np.flatnonzero(state_costs + cost <= budget)
+        all_costs = np.concatenate((state_costs, state_costs[taken] + cost))
+        all_calories = np.concatenate((state_calories, state_calories[taken] + dish_calories))
+        parents = np.concatenate((np.arange(state_costs.size), taken))
+        # By cost, then by calories descending; a state survives only if it beats every cheaper one
+        order = np.lexsort((-all_calories, all_costs))
+        sorted_calories = all_calories[order]
+        keep = np.ones(order.size, dtype=bool)
+        keep[1:] = sorted_calories[1:] > np.maximum.accumulate(sorted_calories)[:-1]
+        order = order[keep]
+        history.append((parents[order], order >= state_costs.size))
+        state_costs, state_calories = all_costs[order], all_calories[order]
+
+    # Calories increase along the states, so the last one is the cheapest optimum
+    state = state_costs.size - 1
+    total_calories = state_calories[state].item()
+    selected = []
+    for i in range(len(names) - 1, -1, -1):
+        parents, took = history[i]
+        if took[state]:
+            selected.append(i)
+        state = parents[state]
+    selected.reverse()
+    return [names[i] for i in selected], total_calories, sum(menu[names[i]]['cost'] for i in selected)
+
+
+def _subset_sums(costs: np.ndarray, calories: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Costs and calories of all 2^k subsets; bit j of a subset's index selects dish j."""
+    subset_costs = np.zeros(1, dtype=costs.dtype)
+    subset_calories = np.zeros(1, dtype=calories.dtype)
+    for cost, dish_calories in zip(costs, calories):
+        subset_costs = np.concatenate((subset_costs, subset_costs + cost))
+        subset_calories = np.concatenate((subset_calories, subset_calories + dish_calories))
+    return subset_costs, subset_calories
+
+
+def solve_with_meet_in_the_middle(menu: Dict[str, Dict[str, int]], max_budget: float) -> Tuple[List[str], int, int]:
+    """
+    Selects dishes by meet-in-the-middle, for small menus with huge budgets.
+
+    The subsets of each half of the menu are enumerated with NumPy. The
+    second half is sorted by cost with a running best, and every subset of
+    the first half is paired with the best affordable subset of the second
+    by binary search. Time and memory grow as 2^(n/2), independent of the
+    budget.
+
+    Among equally good selections it returns the cheapest, which may differ
+    from the one solve_with_dynamic_programming picks.
+
+    Args:
+        menu: Dictionary where each key is a dish name and value is a dictionary with 'cost' and 'calories'.
+        max_budget: Maximum budget allowed for selecting dishes.
+
+    Returns:
+        A tuple with:
+        - List of selected dish names
+        - Maximum total calories achievable
+        - Total cost spent
+
+    Raises:
+        ValueError: If the budget or a cost is negative, or the menu has more than MITM_MAX_DISHES dishes.
+    """
+    if len(menu) > MITM_MAX_DISHES:
+        raise ValueError(f"Meet-in-the-middle supports up to {MITM_MAX_DISHES} dishes, got {len(menu)}.")
+    names, costs, calories, budget = _solver_inputs(menu, max_budget)
+    half = len(names) // 2
+    first_costs, first_calories = _subset_sums(costs[:half], calories[:half])
+    second_costs, second_calories = _subset_sums(costs[half:], calories[half:])
+
+    order = np.argsort(second_costs, kind="stable")
+    second_costs, second_calories = second_costs[order], second_calories[order]
+    # Best subset of the second half costing at most each sorted cost; ties keep the cheapest
+    improves = np.ones(order.size, dtype=bool)
+    improves[1:] = second_calories[1:] > np.maximum.accumulate(second_calories)[:-1]
+    best = np.maximum.accumulate(np.where(improves, np.arange(order.size), 0))
+
+    affordable = np.flatnonzero(first_costs <= budget)
+    partner = best[np.searchsorted(second_costs, budget - first_costs[affordable], side="right") - 1]
+    totals = first_calories[affordable] + second_calories[partner]
+    spent = first_costs[affordable] + second_costs[partner]
+    choice = np.lexsort((spent, -totals))[0]
+
+    first_mask, second_mask = int(affordable[choice]), int(order[partner[choice]])
+    selected = [i for i in range(half) if first_mask >> i & 1] + \
+               [half + i for i in range(len(names) - half) if second_mask >> i & 1]
+    return ([names[i] for i in selected], totals[choice].item(),
+            sum(menu[names[i]]['cost'] for i in selected))
+
+
+SOLVERS = {
+    "dense": solve_with_dynamic_programming,
+    "sparse": solve_with_sparse_dp,
+    "meet-in-the-middle": solve_with_meet_in_the_middle,
+}
+
+
+def choose_solver(menu: Dict[str, Dict[str, int]], max_budget: float) -> str:
+    """
+    Picks the knapsack solver expected to be fastest for a menu and budget.
+
+    Rough work estimates, in dense DP cells:
+    - dense: dishes x budget units (only for costs scale_costs can make integral)
+    - sparse: SPARSE_STATE_COST x dishes x states, where the states are bounded
+      by 2^dishes, by the budget units and, for integer calories, by the total calories
+    - meet-in-the-middle: MITM_SUBSET_COST x dishes x 2^(dishes / 2), up to MITM_MAX_DISHES dishes
+
+    Returns:
+        A key of SOLVERS.
+    """
+    num_dishes = len(menu)
+    scaled = scale_costs([values['cost'] for values in menu.values()])
+    states = 2 ** min(num_dishes, 64)
+    work = {}
+    if scaled is not None:
+        budget_units = _budget_units(max(max_budget, 0), scaled[1]) + 1
+        work["dense"] = num_dishes * budget_units
+        states = min(states, budget_units)
+    calories = [values['calories'] for values in menu.values()]
+    if all(isinstance(value, (int, np.integer)) and value >= 0 for value in calories):
+        states = min(states, sum(calories) + 1)
+    work["sparse"] = SPARSE_STATE_COST * num_dishes * states
+    if num_dishes <= MITM_MAX_DISHES:
+        work["meet-in-the-middle"] = MITM_SUBSET_COST * num_dishes * 2 ** ((num_dishes + 1) // 2)
+    # Prefer the dense DP on ties, as it matches solve_with_dynamic_programming exactly
+    return min(work, key=lambda method: (work[method], method != "dense"))
+
+
+def solve_menu(menu: Dict[str, Dict[str, int]], max_budget: float, method: str = "auto") -> Tuple[List[str], int, int]:
+    """
+    Selects dishes maximizing total calories within the budget with the given
+    or automatically chosen solver (see choose_solver).
+
+    All solvers find the same maximum; they may pick different selections
+    when several are equally good.
+
+    Returns:
+        A tuple with:
+        - List of selected dish names
+        - Maximum total calories achievable
+        - Total cost spent
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    if method == "auto":
+        method = choose_solver(menu, max_budget)
+    if method not in SOLVERS:
+        raise ValueError(f"Unknown method '{method}', expected 'auto' or one of {', '.join(SOLVERS)}.")
+    return SOLVERS[method](menu, max_budget)
+
+
+def solve_with_dynamic_programming_table(menu: Dict[str, Dict[str, int]], max_budget: int) -> Tuple[List[str], int, int]:
     """
     Selects dishes using dynamic programming to maximize total calories
     within a fixed budget. Guarantees an optimal solution.
 
+    Reference version of solve_with_dynamic_programming that keeps the
+    whole (dishes + 1) x (budget + 1) table of Python ints.
+
     Args:
         menu: Dictionary where each key is a dish name and value is a dictionary with 'cost' and 'calories'.
         max_budget: Maximum budget allowed for selecting dishes.
@@ -83,29 +649,148 @@ def solve_with_dynamic_programming(menu: Dict[str, Dict[str, int]], max_budget:
     return selected_dishes, total_calories, total_spent
 
 
+def make_random_menu(num_dishes: int, max_cost: int = 1000, max_calories: int = 1000,
+                     seed: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+    """Generates a random menu for benchmarks."""
+    rng = random.Random(seed)
+    return {f"dish-{i}": {"cost": rng.randint(1, max_cost), "calories": rng.randint(1, max_calories)}
+            for i in range(num_dishes)}
+
+
+def _measure(solver, *args) -> Tuple[Tuple[List[str], int, int], float, int]:
+    """Runs a solver once for time and once under tracemalloc for peak memory."""
+    started = time.perf_counter()
+    result = solver(*args)
+    seconds = time.perf_counter() - started
+    tracemalloc.start()
+    solver(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def benchmark_dynamic_programming(num_dishes: int = 2000, max_budget: int = 20000, seed: Optional[int] = None,
+                                  table_cells_limit: int = 5 * 10 ** 6) -> List[Dict[str, float]]:
+    """
+    Compares time and peak memory of the table, rolling-row and checkpointed
+    versions of the knapsack DP, checking that they select the same dishes.
+
+    The table version is skipped when it would exceed table_cells_limit cells.
+
+    Returns:
+        List of dictionaries with the version name, seconds and peak bytes.
+    """
+    menu = make_random_menu(num_dishes, seed=seed)
+    choice_bytes = num_dishes * ((max_budget + 8) // 8)
+    versions = [
+        ("rolling row + choice bits", solve_with_dynamic_programming, (menu, max_budget)),
+        ("checkpointed blocks", solve_with_dynamic_programming, (menu, max_budget, max(choice_bytes // 16, 1))),
+    ]
+    if (num_dishes + 1) * (max_budget + 1) <= table_cells_limit:
+        versions.insert(0, ("table (reference)", solve_with_dynamic_programming_table, (menu, max_budget)))
+
+    rows = []
+    expected = None
+    for name, solver, args in versions:
+        result, seconds, peak = _measure(solver, *args)
+        if expected is None:
+            expected = result
+        elif result != expected:
+            raise AssertionError(f"{name} selected different dishes.")
+        rows.append({"version": name, "seconds": seconds, "peak_bytes": peak})
+
+    print(f"{num_dishes} dishes, budget {max_budget}, best {expected[1]} calories")
+    print(f"{'Version':<28}{'Time (s)':>10}{'Peak memory (MB)':>20}")
+    for row in rows:
+        print(f"{row['version']:<28}{row['seconds']:>10.3f}{row['peak_bytes'] / 2 ** 20:>20.1f}")
+    return rows
+
+
+def benchmark_solvers(cases: List[Tuple[int, int, int]] = ((30, 10 ** 6, 5 * 10 ** 6), (200, 10 ** 5, 10 ** 6),
+                                                       (2000, 1000, 20000)),
+                      seed: Optional[int] = None, dense_max_cells: int = 10 ** 9) -> List[Dict[str, float]]:
+    """
+    Times every solver and the automatic choice on random menus, checking
+    that they agree on the maximum calories.
+
+    Args:
+        cases: (dishes, max cost, budget) triples.
+        seed: Random seed for the menus.
+        dense_max_cells: The dense DP is skipped above this many table cells.
+
+    Returns:
+        List of dictionaries with the case, solver and seconds.
+    """
+    rows = []
+    print(f"{'Dishes':>8}{'Max cost':>12}{'Budget':>12}  {'Solver':<28}{'Time (s)':>10}")
+    for num_dishes, max_cost, max_budget in cases:
+        menu = make_random_menu(num_dishes, max_cost=max_cost, seed=seed)
+        auto = choose_solver(menu, max_budget)
+        expected = None
+        for method in SOLVERS:
+            if method == "dense" and num_dishes * (max_budget + 1) > dense_max_cells:
+                continue
+            if method == "meet-in-the-middle" and num_dishes > MITM_MAX_DISHES:
+                continue
+            started = time.perf_counter()
+            calories = solve_menu(menu, max_budget, method)[1]
+            seconds = time.perf_counter() - started
+            if expected is None:
+                expected = calories
+            elif calories != expected:
+                raise AssertionError(f"{method} found {calories} calories instead of {expected}.")
+            rows.append({"dishes": num_dishes, "budget": max_budget, "solver": method, "seconds": seconds})
+            label = f"{method} (auto)" if method == auto else method
+            print(f"{num_dishes:>8}{max_cost:>12}{max_budget:>12}  {label:<28}{seconds:>10.3f}")
+    return rows
+
+
+def parse_args():
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description="Greedy algorithms and dynamic programming.")
+    parser.add_argument("--benchmark", action="store_true", help="benchmark the DP versions on a random menu")
+    parser.add_argument("--solvers", action="store_true", help="compare the dense, sparse and meet-in-the-middle solvers")
+    parser.add_argument("--dishes", type=int, default=2000, help="dishes in the benchmark menu")
+    parser.add_argument("--budget", type=int, default=20000, help="benchmark budget")
+    parser.add_argument("--seed", type=int, default=1)
+    return parser.parse_args()
+
+
 # Usage
 if __name__ == "__main__":
-    menu_items = {
-        "pizza": {"cost": 50, "calories": 300},
-        "hamburger": {"cost": 40, "calories": 250},
-        "hot-dog": {"cost": 30, "calories": 200},
-        "pepsi": {"cost": 10, "calories": 100},
-        "cola": {"cost": 15, "calories": 220},
-        "potato": {"cost": 25, "calories": 350}
-    }
-
-    budget = 100
-
-    # Greedy approach
-    greedy_selection, greedy_total_calories, greedy_spent = solve_with_greedy_strategy(menu_items, budget)
-    print("--- Greedy Algorithm ---")
-    print(f"Selected dishes: {greedy_selection}")
-    print(f"Total calories: {greedy_total_calories}")
-    print(f"Total cost: {greedy_spent}\n")
-
-    # Dynamic programming approach
-    dp_selection, dp_total_calories, dp_spent = solve_with_dynamic_programming(menu_items, budget)
-    print("--- Dynamic Programming ---")
-    print(f"Selected dishes: {dp_selection}")
-    print(f"Total calories: {dp_total_calories}")
-    print(f"Total cost: {dp_spent}")
+    args = parse_args()
+    if args.benchmark:
+        benchmark_dynamic_programming(args.dishes, args.budget, args.seed)
+    elif args.solvers:
+        benchmark_solvers(seed=args.seed)
+    else:
+        menu_items = {
+            "pizza": {"cost": 50, "calories": 300},
+            "hamburger": {"cost": 40, "calories": 250},
+            "hot-dog": {"cost": 30, "calories": 200},
+            "pepsi": {"cost": 10, "calories": 100},
+            "cola": {"cost": 15, "calories": 220},
+            "potato": {"cost": 25, "calories": 350}
+        }
+
+        budget = 100
+
+        # Greedy approach
+        greedy_selection, greedy_total_calories, greedy_spent = solve_with_greedy_strategy(menu_items, budget)
+        print("--- Greedy Algorithm ---")
+        print(f"Selected dishes: {greedy_selection}")
+        print(f"Total calories: {greedy_total_calories}")
+        print(f"Total cost: {greedy_spent}\n")
+
+        # Dynamic programming approach
+        dp_selection, dp_total_calories, dp_spent = solve_with_dynamic_programming(menu_items, budget)
+        print("--- Dynamic Programming ---")
+        print(f"Selected dishes: {dp_selection}")
+        print(f"Total calories: {dp_total_calories}")
+        print(f"Total cost: {dp_spent}")
+
+        # All budget tiers from a single DP run
+        print("\n--- Budget Tiers ---")
+        for tier, (selection, calories, spent) in solve_for_budgets(menu_items, [25, 50, 75, 100]).items():
+            print(f"Budget {tier}: {selection}, {calories} calories, cost {spent}")
+        print(f"Pareto frontier (cost, calories): {get_budget_sweep(menu_items, budget).pareto_frontier()}")